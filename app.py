@@ -5,6 +5,9 @@ from src.managers.configManager import ConfigManager
 from src.managers.sensorManager import SensorManager
 from src.managers.testManager import TestManager
 from src.managers.dataManager import DataManager
+from src.managers.liveManager import LiveManager
+from src.handlers.recordingFile import findUnfinishedRecordings
+from src.enums.configPaths import ConfigPaths
 
 
 def main():
@@ -19,11 +22,19 @@ def main():
         st.session_state.test_mngr = TestManager()
     if "data_mngr" not in st.session_state:
         st.session_state.data_mngr = DataManager()
+    if "live_mngr" not in st.session_state:
+        st.session_state.live_mngr = LiveManager()
     # - Status
     if "test_available" not in st.session_state:
         st.session_state.test_available = False
     if "test_recording" not in st.session_state:
         st.session_state.test_recording = False
+    if "unfinished_recordings" not in st.session_state:
+        st.session_state.unfinished_recordings = findUnfinishedRecordings(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_DIRECTORY.value, "recordings"
+            )
+        )
 
     # Page configuration
     st.set_page_config(
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+# Measures throughput, tick jitter, CPU and memory of TestManager with simulated
+# sensors, over a matrix of sensor amounts, record intervals, engines and capture modes.
+# Results are written as JSON, and compared to a previous results file if provided.
+# Only simulated drivers are imported, so it runs without the hardware SDKs.
+# Usage: python -m benchmarks.acquisition_benchmark [--sensors 8 32 128 512]
+#   [--interval-ms 1 10 100] [--engines BARRIER SAMPLER PROCESS DEADLINE HIGH_RATE]
+#   [--capture off on]
+#   [--duration-s 3] [--device-rate-hz 125] [--burst-ms 0]
+#   [--output results.json] [--baseline previous.json]
+# High-rate ticks are built on the interval grid, so their rate and intervals are
+# exact by construction. Its measured quantities are reported instead: the batch lag
+# against the arrival delay, the age of the newest events when they are read, the
+# events received against the device rate, and the late events, read after their
+# tick was built.
+
+import argparse
+import json
+import os
+import platform
+import resource
+import time
+import numpy as np
+
+from benchmarks.engine_benchmark import childrenCPUTime
+from src.managers.sensorManager import SensorManager
+from src.managers.testManager import TestManager
+from src.handlers.sensorGroup import SensorGroup
+from src.enums.engineTypes import EngineTypes
+from src.enums.sensorParams import SParams, SGParams
+
+from loguru import logger
+
+# Compared metrics and if higher values are better
+compared_metrics = {
+    "rate_hz": True,
+    "p99_ms": False,
+    "dropped": False,
+    "lag_p99_ms": False,
+    "events_percent": True,
+    "late_events": False,
+    "cpu_percent": False,
+}
+
+
+def buildGroup(amount: int, device_rate_hz: float, burst_ms: float = 0) -> SensorGroup:
+    sensor_manager = SensorManager()
+    sensor_manager.config_sensors = {
+        f"sim_{i}": {
+            SParams.NAME.value: f"Sim_{i}",
+            SParams.TYPE.value: "SENSOR_SIM",
+            SParams.READ.value: True,
+            SParams.CONNECTION_SECTION.value: {SParams.SERIAL.value: i},
+            SParams.SIMULATION_SECTION.value: {
+                SParams.WAVEFORM.value: "sine",
+                SParams.NOISE.value: 0.01,
+                SParams.RATE.value: device_rate_hz,
+                SParams.BURST.value: burst_ms,
+            },
+            SParams.CALIBRATION_SECTION.value: {
+                SParams.SLOPE.value: 1,
+                SParams.INTERCEPT.value: 0,
+            },
+        }
+        for i in range(amount)
+    }
+    return sensor_manager.loadSensorGroup(
+        "benchmark",
+        {
+            SGParams.NAME.value: "Benchmark",
+            SGParams.TYPE.value: "GROUP_DEFAULT",
+            SGParams.READ.value: True,
+            SGParams.SENSOR_LIST.value: list(sensor_manager.config_sensors),
+        },
+    )
+
+
+def getRSS() -> float:
+    # Current resident memory (MB), or the peak one if /proc is not available
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stopTest(test_mngr: TestManager, engine: EngineTypes) -> None:
+    test_mngr.test_running = False
+    test_mngr.main_thread.join()
+    if test_mngr.capture_events and engine != EngineTypes.PROCESS:
+        test_mngr._stopCapture()
+    [sensor.disconnect() for sensor in test_mngr.available_sensors.values()]
+
+
+def runBenchmark(
+    engine: EngineTypes,
+    sensors_amount: int,
+    interval_ms: int,
+    capture_events: bool,
+    duration_s: float,
+    device_rate_hz: float,
+    burst_ms: float = 0,
+) -> dict:
+    group = buildGroup(sensors_amount, device_rate_hz, burst_ms)
+    test_mngr = TestManager()
+    test_mngr.checkConnection([group])
+    cpu_start = time.process_time() + childrenCPUTime()
+    wall_start = time.perf_counter()
+    test_mngr.testStart(interval_ms, engine, capture_events)
+    time.sleep(duration_s)
+    rss = getRSS()
+    stopTest(test_mngr, engine)
+    cpu_time = time.process_time() + childrenCPUTime() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+    tick_times_ns = test_mngr.getTestTimes()
+    ticks_ms = np.diff(tick_times_ns) / 1e6
+    if len(ticks_ms) == 0:
+        ticks_ms = np.array([np.nan])
+    # Achieved rate and ticks missing from the timeline, between the first and last ticks
+    rate_hz = 0.0
+    expected = 1
+    if len(tick_times_ns) > 1:
+        span_ns = int(tick_times_ns[-1] - tick_times_ns[0])
+        rate_hz = (len(tick_times_ns) - 1) * 1e9 / span_ns
+        expected += round(span_ns / (interval_ms * 1e6))
+    events = sum(
+        len(sensor.getEvents()[0]) for sensor in test_mngr.available_sensors.values()
+    )
+    result = {
+        "engine": engine.name,
+        "sensors": sensors_amount,
+        "interval_ms": interval_ms,
+        "capture": capture_events,
+        "ticks": len(tick_times_ns),
+        "rate_hz": rate_hz,
+        "samples_per_s": rate_hz * sensors_amount,
+        "events_per_s": events / wall_time,
+        "p50_ms": float(np.percentile(ticks_ms, 50)),
+        "p99_ms": float(np.percentile(ticks_ms, 99)),
+        "max_ms": float(np.max(ticks_ms)),
+        "dropped": max(expected - len(tick_times_ns), 0),
+        # Values missed by the deadline sampler or held by the high-rate capture
+        "dropouts": sum(
+            sensor.getDropouts() for sensor in test_mngr.available_sensors.values()
+        ),
+        "cpu_percent": 100 * cpu_time / wall_time,
+        "rss_mb": rss,
+    }
+    high_rate = test_mngr.getHighRateStats()
+    if high_rate:
+        for metric in ["rate_hz", "samples_per_s", "p50_ms", "p99_ms", "max_ms"]:
+            result[metric] = None
+        result["dropped"] = None
+        # Events of the slowest sensor against the device rate, up to the last read
+        span_s = (tick_times_ns[-1] - tick_times_ns[0]) / 1e9 if len(ticks_ms) else 0
+        expected_events = (span_s + high_rate["delay_ms"] / 1000) * device_rate_hz
+        result["events_percent"] = (
+            100 * min(high_rate["events"].values()) / max(expected_events, 1)
+        )
+        result["late_events"] = sum(high_rate["late_events"].values())
+        for metric in [
+            "delay_ms",
+            "lag_p50_ms",
+            "lag_p99_ms",
+            "lag_max_ms",
+            "event_age_p99_ms",
+            "event_age_max_ms",
+        ]:
+            result[metric] = high_rate[metric]
+    return result
+
+
+def compareResults(results: list[dict], baseline_path: str) -> None:
+    with open(baseline_path) as file:
+        baseline = {
+            (r["engine"], r["sensors"], r["interval_ms"], r["capture"]): r
+            for r in json.load(file)["results"]
+        }
+    print(f"\nChanges against {baseline_path}:")
+    for r in results:
+        previous = baseline.get(
+            (r["engine"], r["sensors"], r["interval_ms"], r["capture"])
+        )
+        if previous is None:
+            continue
+        changes = []
+        for metric, higher_better in compared_metrics.items():
+            if r.get(metric) is None or previous.get(metric) is None:
+                continue
+            change = r[metric] - previous[metric]
+            worse = change < 0 if higher_better else change > 0
+            changes.append(f"{metric} {change:+.2f}{' (worse)' if worse else ''}")
+        print(
+            f"{r['engine']:<8} {r['sensors']:>7} {r['interval_ms']:>8} {str(r['capture']):>7}: "
+            + ", ".join(changes)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acquisition benchmark suite")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[8, 32, 128, 512])
+    parser.add_argument("--interval-ms", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=EngineTypes._member_names_,
+        default=EngineTypes._member_names_,
+    )
+    parser.add_argument(
+        "--capture", nargs="+", choices=["off", "on"], default=["off", "on"]
+    )
+    parser.add_argument("--duration-s", type=float, default=3)
+    parser.add_argument("--device-rate-hz", type=float, default=125)
+    parser.add_argument("--burst-ms", type=float, default=0)
+    parser.add_argument("--output", default="acquisition_benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    args = parser.parse_args()
+
+    logger.remove()
+    results = []
+    header = f"{'engine':<8} {'sensors':>7} {'interval':>8} {'capture':>7} {'rate Hz':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'dropped':>7} {'cpu %':>6} {'rss MB':>7}"
+    print(header)
+    for sensors_amount in args.sensors:
+        for interval_ms in args.interval_ms:
+            for engine in args.engines:
+                for capture in args.capture:
+                    r = runBenchmark(
+                        EngineTypes[engine],
+                        sensors_amount,
+                        interval_ms,
+                        capture == "on",
+                        args.duration_s,
+                        args.device_rate_hz,
+                        args.burst_ms,
+                    )
+                    results.append(r)
+                    if r["rate_hz"] is None:
+                        print(
+                            f"{r['engine']:<8} {r['sensors']:>7} {r['interval_ms']:>8} {capture:>7}"
+                            + f" lag p50/p99/max {r['lag_p50_ms']:.1f}/{r['lag_p99_ms']:.1f}/{r['lag_max_ms']:.1f} ms"
+                            + f" (delay {r['delay_ms']:.0f} ms), event age p99/max"
+                            + f" {r['event_age_p99_ms']:.1f}/{r['event_age_max_ms']:.1f} ms,"
+                            + f" events {r['events_percent']:.1f}%, late {r['late_events']},"
+                            + f" dropouts {r['dropouts']}"
+                            + f" {r['cpu_percent']:>6.1f} {r['rss_mb']:>7.1f}"
+                        )
+                        continue
+                    print(
+                        f"{r['engine']:<8} {r['sensors']:>7} {r['interval_ms']:>8} {capture:>7} {r['rate_hz']:>8.1f}"
+                        + f" {r['p50_ms']:>7.3f} {r['p99_ms']:>7.3f} {r['max_ms']:>7.3f} {r['dropped']:>7}"
+                        + f" {r['cpu_percent']:>6.1f} {r['rss_mb']:>7.1f}"
+                    )
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "duration_s": args.duration_s,
+                "device_rate_hz": args.device_rate_hz,
+                "burst_ms": args.burst_ms,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"\nResults saved to {args.output}")
+    if args.baseline is not None:
+        compareResults(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+# Compares tick jitter and CPU use of the acquisition engines with simulated sensors.
+# Usage: python -m benchmarks.engine_benchmark [--sensors 16 64 256] [--interval-ms 10]
+
+import argparse
+import random
+import resource
+import threading
+import time
+import numpy as np
+
+from src.managers.testManager import TestManager
+from src.handlers.sensor import Sensor
+from src.enums.engineTypes import EngineTypes
+from src.enums.sensorParams import SParams
+from src.enums.sensorStatus import SStatus
+
+from loguru import logger
+
+
+# Driver with the same read cost as the Phidget drivers: a mutex-protected field.
+class BenchmarkDriver:
+    def __init__(self, serial: int, channel: int) -> None:
+        self.mutex = threading.Lock()
+        self.value = random.random()
+
+    def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def getValue(self):
+        self.mutex.acquire()
+        value = self.value
+        self.mutex.release()
+        return value
+
+
+def buildSensors(amount: int) -> dict[str, Sensor]:
+    sensors = {}
+    for i in range(amount):
+        sensor = Sensor()
+        sensor.setup(
+            f"bench_{i}",
+            {
+                SParams.NAME.value: f"Bench_{i}",
+                SParams.TYPE.value: "SENSOR_LOADCELL",
+                SParams.READ.value: True,
+                SParams.CONNECTION_SECTION.value: {
+                    SParams.SERIAL.value: 0,
+                    SParams.CHANNEL.value: i,
+                },
+            },
+            BenchmarkDriver,
+        )
+        sensor.status = SStatus.AVAILABLE
+        sensors[sensor.getID()] = sensor
+    return sensors
+
+
+def childrenCPUTime() -> float:
+    # CPU time of the finished sampler processes
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def runBenchmark(
+    engine: EngineTypes, sensors_amount: int, interval_ms: int, duration_s: float
+) -> dict:
+    test_mngr = TestManager()
+    test_mngr.available_sensors = buildSensors(sensors_amount)
+    cpu_start = time.process_time() + childrenCPUTime()
+    wall_start = time.perf_counter()
+    test_mngr.testStart(interval_ms, engine)
+    time.sleep(duration_s)
+    test_mngr.test_running = False
+    test_mngr.main_thread.join()
+    cpu_time = time.process_time() + childrenCPUTime() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+    tick_times_ns = test_mngr.getTestTimes()
+    ticks_ms = np.diff(tick_times_ns) / 1e6
+    return {
+        "engine": engine.name,
+        "sensors": sensors_amount,
+        "ticks": len(tick_times_ns),
+        "mean_ms": float(np.mean(ticks_ms)),
+        "std_ms": float(np.std(ticks_ms)),
+        "p99_ms": float(np.percentile(ticks_ms, 99)),
+        "max_ms": float(np.max(ticks_ms)),
+        "cpu_percent": 100 * cpu_time / wall_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acquisition engine benchmark")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--interval-ms", type=int, default=10)
+    parser.add_argument("--duration-s", type=float, default=5)
+    args = parser.parse_args()
+
+    logger.remove()
+    header = f"{'engine':<8} {'sensors':>7} {'ticks':>6} {'mean ms':>8} {'std ms':>7} {'p99 ms':>7} {'max ms':>7} {'cpu %':>6}"
+    print(header)
+    for sensors_amount in args.sensors:
+        for engine in EngineTypes:
+            r = runBenchmark(engine, sensors_amount, args.interval_ms, args.duration_s)
+            print(
+                f"{r['engine']:<8} {r['sensors']:>7} {r['ticks']:>6} {r['mean_ms']:>8.3f} {r['std_ms']:>7.3f}"
+                + f" {r['p99_ms']:>7.3f} {r['max_ms']:>7.3f} {r['cpu_percent']:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+# Alignment of the streams recorded at different times or rates to a common time grid
+class AlignmentTypes(Enum):
+    NONE = "Own timelines"
+    LINEAR = "Linear"
+    NEAREST = "Nearest"
+    ZOH = "Zero-order hold"
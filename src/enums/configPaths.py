@@ -10,9 +10,25 @@ class ConfigPaths(Enum):
 
     RECORD_INTERVAL_MS = "settings.recording.data_interval_ms"
     RECORD_TARE_AMOUNT = "settings.recording.tare_data_amount"
+    RECORD_DTYPE = "settings.recording.dtype"
+    RECORD_ENGINE = "settings.recording.engine"
+    RECORD_CAPTURE_EVENTS = "settings.recording.capture_events"
+    RECORD_STREAM = "settings.recording.stream_to_disk"
+    RECORD_STREAM_CHUNK = "settings.recording.stream_chunk_size"
+    RECORD_CHECKPOINT_S = "settings.recording.checkpoint_s"
+    RECORD_DIRECTORY = "settings.recording.directory"
+    RECORD_KEEP_CONNECTIONS = "settings.recording.keep_connections"
+    RECORD_IDLE_TIMEOUT_S = "settings.recording.idle_timeout_s"
+    RECORD_TRACE_READS = "settings.recording.trace_reads"
+    RECORD_DEADLINE_MS = "settings.recording.deadline_ms"
+    RECORD_OVERSAMPLING = "settings.recording.oversampling"
+    RECORD_TRIGGER_FORCE_N = "settings.recording.trigger_force_n"
+    RECORD_TRIGGER_PRE_MS = "settings.recording.trigger_pre_ms"
+    RECORD_TRIGGER_POST_MS = "settings.recording.trigger_post_ms"
 
     FILTER_FC = "settings.filter.fc_hz"
     FILTER_ORDER = "settings.filter.order"
+    FILTER_ALIGNMENT = "settings.filter.alignment"
 
     # Sensors
     SENSOR_GROUPS_SECTION = "sensor_groups"
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+# Acquisition engines
+class EngineTypes(Enum):
+    BARRIER = "Thread per sensor"
+    SAMPLER = "Single thread sampler"
+    PROCESS = "Separate process sampler"
+    DEADLINE = "Deadline sampler"
+    HIGH_RATE = "High-rate capture"
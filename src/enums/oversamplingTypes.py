@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+# Reduction of the driver values captured within each record interval
+class OversamplingTypes(Enum):
+    NONE = "Latest value"
+    MEAN = "Bin average"
+    FIR = "Anti-alias FIR"
@@ -7,6 +7,7 @@ class SParams(Enum):
     CONNECTION_SECTION = "connection"
     CALIBRATION_SECTION = "calibration"
     PROPERTIES_SECTION = "properties"
+    SIMULATION_SECTION = "simulation"
 
     # Config params paths
     NAME = "name"
@@ -17,6 +18,14 @@ class SParams(Enum):
     SLOPE = "slope"
     INTERCEPT = "intercept"
     INITIAL_POS = "initial_position"
+    WAVEFORM = "waveform"
+    AMPLITUDE = "amplitude"
+    FREQUENCY = "frequency_hz"
+    OFFSET = "offset"
+    NOISE = "noise"
+    RATE = "rate_hz"
+    LATENCY = "latency_ms"
+    BURST = "burst_ms"
 
     # Handler additional params
     STATUS = "status"
@@ -31,3 +40,4 @@ class SGParams(Enum):
     READ = "read"
     SENSOR_LIST = "sensor_list"
     G_MATRIX = "g_matrix"
+    INTERVAL = "data_interval_ms"
@@ -6,6 +6,7 @@ class STypes(Enum):
     SENSOR_LOADCELL = "Load Cell"
     SENSOR_ENCODER = "Encoder"
     SENSOR_IMU = "IMU"
+    SENSOR_SIM = "Simulated"
 
 
 # Sensor group types
@@ -1,5 +1,20 @@
-__all__ = ["phidgetLoadCell", "phidgetEncoder", "taoboticsIMU"]
-# Deprecated for older python versions
-from src.handlers.drivers.phidgetLoadCell import PhidgetLoadCell
-from src.handlers.drivers.phidgetEncoder import PhidgetEncoder
-from src.handlers.drivers.taoboticsIMU import TaoboticsIMU
+__all__ = ["phidgetLoadCell", "phidgetEncoder", "taoboticsIMU", "simulatedSensor"]
+
+import importlib
+
+# Drivers are imported on first use, so each one only requires its own SDK
+driver_modules = {
+    "PhidgetLoadCell": "phidgetLoadCell",
+    "PhidgetEncoder": "phidgetEncoder",
+    "TaoboticsIMU": "taoboticsIMU",
+    "SimulatedSensor": "simulatedSensor",
+}
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in driver_modules:
+        module = importlib.import_module(f"{__name__}.{driver_modules[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
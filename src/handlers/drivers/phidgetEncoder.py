@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import time
 import threading
+import numpy as np
 from loguru import logger
 from Phidget22.Phidget import *
 from Phidget22.Devices.Encoder import *
+from src.handlers.eventBuffer import EventBuffer
 
 
 class PhidgetEncoder:
@@ -14,18 +17,36 @@ class PhidgetEncoder:
         self.handler.setOnPositionChangeHandler(self.onPositionChange)
         self.mutex = threading.Lock()
         self.value: float = 0
+        # Event capture at the device data rate
+        self.capture: bool = False
+        self.capture_time: int = None
+        self.events = EventBuffer()
 
     def onPositionChange(
         self, handler: Encoder, positionChange, timeChange, indexTriggered
     ):
         self.mutex.acquire()
         self.value += positionChange
+        value = self.value
         self.mutex.release()
+        if self.capture:
+            # Device time between events (ms), anchored to the first captured event
+            if self.capture_time is None:
+                self.capture_time = time.perf_counter_ns()
+            else:
+                self.capture_time += round(timeChange * 1e6)
+            self.events.push(self.capture_time, value)
 
     def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
         try:
             self.handler.openWaitForAttachment(wait_ms)
-            self.handler.setDataInterval(interval_ms)
+            # Clamped to the device range, 0 selects the fastest data interval
+            self.handler.setDataInterval(
+                min(
+                    max(interval_ms, self.handler.getMinDataInterval()),
+                    self.handler.getMaxDataInterval(),
+                )
+            )
         except PhidgetException:
             logger.warning(
                 f"Could not connect to serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
@@ -41,8 +62,22 @@ class PhidgetEncoder:
                 f"Could not disconnect serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
             )
 
+    def isAttached(self) -> bool:
+        try:
+            return self.handler.getAttached()
+        except PhidgetException:
+            return False
+
     def getValue(self):
         self.mutex.acquire()
         value = self.value
         self.mutex.release()
         return value
+
+    def setCapture(self, capture: bool) -> None:
+        self.events.clear()
+        self.capture_time = None
+        self.capture = capture
+
+    def readBatch(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.events.drain()
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import time
 import threading
+import numpy as np
 from loguru import logger
 from Phidget22.Phidget import *
 from Phidget22.Devices.VoltageRatioInput import *
+from src.handlers.eventBuffer import EventBuffer, gridTimestamp
+
+# Delay of the events delivered in a USB burst
+BURST_NS = 16000000
 
 
 class PhidgetLoadCell:
@@ -14,16 +20,41 @@ class PhidgetLoadCell:
         self.handler.setOnVoltageRatioChangeHandler(self.onVoltageRatioChange)
         self.mutex = threading.Lock()
         self.value = None
+        # Event capture at the device data rate
+        self.capture: bool = False
+        self.capture_time: int = None
+        self.interval_ns: int = 8000000
+        # Lag of the event grid after which lost events are assumed
+        self.tolerance_ns: int = max(self.interval_ns, BURST_NS)
+        self.events = EventBuffer()
 
     def onVoltageRatioChange(self, handler: VoltageRatioInput, voltageRatio):
         self.mutex.acquire()
         self.value = voltageRatio
         self.mutex.release()
+        if self.capture:
+            # Voltage ratio events do not include a device timestamp, and USB delivers
+            # them in bursts. They are placed on the data interval grid.
+            self.capture_time = gridTimestamp(
+                self.capture_time,
+                time.perf_counter_ns(),
+                self.interval_ns,
+                self.tolerance_ns,
+            )
+            self.events.push(self.capture_time, voltageRatio)
 
     def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
         try:
             self.handler.openWaitForAttachment(wait_ms)
-            self.handler.setDataInterval(interval_ms)
+            # Clamped to the device range, 0 selects the fastest data interval
+            self.handler.setDataInterval(
+                min(
+                    max(interval_ms, self.handler.getMinDataInterval()),
+                    self.handler.getMaxDataInterval(),
+                )
+            )
+            self.interval_ns = self.handler.getDataInterval() * 1000000
+            self.tolerance_ns = max(self.interval_ns, BURST_NS)
         except PhidgetException:
             logger.warning(
                 f"Could not connect to serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
@@ -39,8 +70,22 @@ class PhidgetLoadCell:
                 f"Could not disconnect serial {self.handler.getDeviceSerialNumber()}, channel {self.handler.getChannel()}"
             )
 
+    def isAttached(self) -> bool:
+        try:
+            return self.handler.getAttached()
+        except PhidgetException:
+            return False
+
     def getValue(self):
         self.mutex.acquire()
         value = self.value
         self.mutex.release()
         return value
+
+    def setCapture(self, capture: bool) -> None:
+        self.events.clear()
+        self.capture_time = None
+        self.capture = capture
+
+    def readBatch(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.events.drain()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import numpy as np
+
+# Simulated waveforms, as functions of the time (s) and frequency (Hz)
+waveforms = {
+    "constant": lambda t, f: np.ones_like(t),
+    "sine": lambda t, f: np.sin(2 * np.pi * f * t),
+    "square": lambda t, f: np.where(np.sin(2 * np.pi * f * t) < 0, -1.0, 1.0),
+    "triangle": lambda t, f: 1 - 2 * np.abs(2 * ((f * t) % 1) - 1),
+    "sawtooth": lambda t, f: 2 * ((f * t) % 1) - 1,
+}
+
+
+# Hardware free driver. Values are generated on the device data rate timeline from
+# the connection time, so no thread per sensor is needed to produce them.
+class SimulatedSensor:
+    def __init__(
+        self,
+        serial: int,
+        channel: int = None,
+        waveform: str = "sine",
+        amplitude: float = 1.0,
+        frequency_hz: float = 1.0,
+        offset: float = 0.0,
+        noise: float = 0.0,
+        rate_hz: float = None,
+        latency_ms: float = 0.0,
+        burst_ms: float = 0.0,
+    ) -> None:
+        self.serial = serial
+        self.channel = channel
+        self.waveform = waveforms[waveform]
+        self.amplitude: float = amplitude
+        self.frequency_hz: float = frequency_hz
+        self.offset: float = offset
+        self.noise: float = noise
+        # Device data rate, the connection data interval if not provided
+        self.rate_hz: float = rate_hz
+        # Time spent by each reading, as a blocking device read
+        self.latency_ms: float = latency_ms
+        # Samples are delivered in bursts of this period, as USB devices do
+        self.burst_ns: int = round(burst_ms * 1e6)
+        self.rng = np.random.default_rng()
+        self.mutex = threading.Lock()
+        # Connection time and device sample period
+        self.start_time: int = None
+        self.period_ns: int = None
+        # Event capture at the device data rate
+        self.capture: bool = False
+        self.next_sample: int = 0
+
+    def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
+        # The fastest simulated data interval (0) is 1 ms
+        rate_hz = self.rate_hz if self.rate_hz else 1000 / max(interval_ms, 1)
+        self.period_ns = max(round(1e9 / rate_hz), 1)
+        self.start_time = time.perf_counter_ns()
+        return True
+
+    def disconnect(self) -> None:
+        self.start_time = None
+        self.capture = False
+
+    def isAttached(self) -> bool:
+        return self.start_time is not None
+
+    def _getSample(self) -> int:
+        # Last device sample delivered until now
+        elapsed = time.perf_counter_ns() - self.start_time
+        if self.burst_ns:
+            elapsed -= elapsed % self.burst_ns
+        return elapsed // self.period_ns
+
+    def _getValues(self, samples: np.ndarray) -> np.ndarray:
+        values = self.offset + self.amplitude * self.waveform(
+            samples * self.period_ns / 1e9, self.frequency_hz
+        )
+        if self.noise:
+            with self.mutex:
+                values = values + self.rng.normal(0, self.noise, len(samples))
+        return values
+
+    def getValue(self):
+        if self.start_time is None:
+            return None
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return float(self._getValues(np.array([self._getSample()]))[0])
+
+    def setCapture(self, capture: bool) -> None:
+        if self.start_time is not None:
+            self.next_sample = self._getSample() + 1
+        self.capture = capture
+
+    def readBatch(self) -> tuple[np.ndarray, np.ndarray]:
+        if not self.capture or self.start_time is None:
+            return np.empty(0, dtype=np.int64), np.empty((0, 1))
+        last_sample = self._getSample()
+        samples = np.arange(self.next_sample, last_sample + 1, dtype=np.int64)
+        self.next_sample = last_sample + 1
+        timestamps = self.start_time + samples * self.period_ns
+        return timestamps, self._getValues(samples).reshape(-1, 1)
@@ -1,13 +1,51 @@
 # -*- coding: utf-8 -*-
 
+import time
+import threading
+import numpy as np
 from loguru import logger
 from mrpt.pymrpt import mrpt
+from src.handlers.eventBuffer import EventBuffer
+
+
+def getObservationTime(timestamp) -> int:
+    # MRPT timestamps are on the wall clock. They are moved to the perf counter of
+    # the other driver events with the current offset between both clocks.
+    wall_ns = round(mrpt.Clock.toDouble(timestamp) * 1e9)
+    return wall_ns - time.time_ns() + time.perf_counter_ns()
+
+
+def getObservationValues(obs) -> list[float]:
+    return [
+        # Quaternions
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_X),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_Y),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_Z),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_W),
+        # Angular velocities
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_WX),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_WY),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_WZ),
+        # Accelerations
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_X_ACC),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_Y_ACC),
+        obs.get(mrpt.obs.TIMUDataIndex.IMU_Z_ACC),
+    ]
 
 
 class TaoboticsIMU:
     def __init__(self, serial: int, channel: int = None) -> None:
         self.serial = serial
         self.value_list = []
+        self.mutex = threading.Lock()
+        # Observation pump, reading the serial port in the background
+        self.pumping: bool = False
+        self.pump_thread: threading.Thread = None
+        self.pump_sleep_s: float = 0.001
+        self.pump_failed: bool = False
+        # Event capture of every observation, with its MRPT timestamp
+        self.capture: bool = False
+        self.events = EventBuffer(width=10)
 
         self.setHandler()
 
@@ -23,45 +61,76 @@ class TaoboticsIMU:
         except Exception:
             logger.warning(f"Could not connect to serial {self.serial}")
             return False
-        return (
+        if (
             self.handler.getState()
-            == mrpt.hwdrivers.CGenericSensor.TSensorState.ssWorking
-        )
+            != mrpt.hwdrivers.CGenericSensor.TSensorState.ssWorking
+        ):
+            return False
+        self.pumping = True
+        self.pump_failed = False
+        self.pump_thread = threading.Thread(target=self._pumpProcess, daemon=True)
+        self.pump_thread.start()
+        return True
 
     def disconnect(self) -> None:
+        self.pumping = False
+        if self.pump_thread is not None:
+            self.pump_thread.join()
+            self.pump_thread = None
         self.setHandler()
 
+    def _pumpProcess(self) -> None:
+        # Processes the serial port continuously, so reading a value never waits for it
+        while self.pumping:
+            if (
+                self.handler.getState()
+                != mrpt.hwdrivers.CGenericSensor.TSensorState.ssWorking
+            ):
+                time.sleep(self.pump_sleep_s)
+                continue
+            try:
+                self.handler.doProcess()
+                obs_list = self.handler.getObservations()
+            except Exception as error:
+                # The last observation is not kept as the latest value, and the
+                # driver is reported as not attached until it connects again
+                logger.error(f"IMU serial {self.serial} stopped reading: {error}")
+                self.mutex.acquire()
+                self.value_list = []
+                self.mutex.release()
+                self.pump_failed = True
+                return
+            if obs_list.empty():
+                time.sleep(self.pump_sleep_s)
+                continue
+            for t, obs in obs_list:
+                value_list = getObservationValues(obs)
+                if self.capture:
+                    self.events.push(getObservationTime(t), value_list)
+            self.mutex.acquire()
+            self.value_list = value_list
+            self.mutex.release()
+
+    def isAttached(self) -> bool:
+        return (
+            self.pump_thread is not None
+            and not self.pump_failed
+            and self.pump_thread.is_alive()
+            and self.handler.getState()
+            == mrpt.hwdrivers.CGenericSensor.TSensorState.ssWorking
+        )
+
     def getValue(self):
-        if (
-            self.handler.getState()
-            != mrpt.hwdrivers.CGenericSensor.TSensorState.ssWorking
-        ):
-            return self.value_list
-
-        self.handler.doProcess()
-        obs_list = self.handler.getObservations()
-
-        if obs_list.empty():
-            return self.value_list
-
-        q_x = q_y = q_z = q_w = -1
-        w_x = w_y = w_z = -1
-        x_acc = y_acc = z_acc = -1
-        for t, obs in obs_list:
-            # Quaternions
-            q_x = obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_X)
-            q_y = obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_Y)
-            q_z = obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_Z)
-            q_w = obs.get(mrpt.obs.TIMUDataIndex.IMU_ORI_QUAT_W)
-            # Angular velocities
-            w_x = obs.get(mrpt.obs.TIMUDataIndex.IMU_WX)
-            w_y = obs.get(mrpt.obs.TIMUDataIndex.IMU_WY)
-            w_z = obs.get(mrpt.obs.TIMUDataIndex.IMU_WZ)
-            # Accelerations
-            x_acc = obs.get(mrpt.obs.TIMUDataIndex.IMU_X_ACC)
-            y_acc = obs.get(mrpt.obs.TIMUDataIndex.IMU_Y_ACC)
-            z_acc = obs.get(mrpt.obs.TIMUDataIndex.IMU_Z_ACC)
-
-        self.value_list = [q_x, q_y, q_z, q_w, w_x, w_y, w_z, x_acc, y_acc, z_acc]
-
-        return self.value_list
+        # Latest observation of the pump
+        self.mutex.acquire()
+        value_list = self.value_list
+        self.mutex.release()
+        return value_list
+
+    def setCapture(self, capture: bool) -> None:
+        self.events.clear()
+        self.capture = capture
+
+    def readBatch(self) -> tuple[np.ndarray, np.ndarray]:
+        # Every observation since the previous call, as timestamps and (n, 10) values
+        return self.events.drain()
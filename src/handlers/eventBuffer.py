@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from collections import deque
+
+
+# Timestamped driver events. Appends and pops on a deque are atomic, so driver
+# callbacks never wait for a lock while the recording thread drains the buffer.
+class EventBuffer:
+    def __init__(self, width: int = 1) -> None:
+        self.width: int = width
+        self.events: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def push(self, timestamp: int, value) -> None:
+        self.events.append((timestamp, value))
+
+    def drain(self) -> tuple[np.ndarray, np.ndarray]:
+        # Only take the events available now, new ones are kept for the next drain
+        amount = len(self.events)
+        events = [self.events.popleft() for _ in range(amount)]
+        timestamps = np.fromiter(
+            (event[0] for event in events), dtype=np.int64, count=amount
+        )
+        values = np.array([event[1] for event in events], dtype=np.float64).reshape(
+            amount, self.width
+        )
+        return timestamps, values
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+# Timestamp of an event without a device timestamp, on the data interval grid of the
+# previous one. Events delivered in bursts keep the grid and are never later than
+# their arrival. The grid lags the arrivals when events are lost, and is resynced
+# to the arrival once the lag is over the tolerance.
+def gridTimestamp(previous: int, now: int, interval_ns: int, tolerance_ns: int) -> int:
+    if previous is None or now - (previous + interval_ns) > tolerance_ns:
+        return now
+    return min(now, previous + interval_ns)
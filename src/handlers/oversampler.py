@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from src.enums.oversamplingTypes import OversamplingTypes
+
+# Anti-alias filter taps per decimation factor
+FIR_TAPS_PER_FACTOR = 4
+# The FIR filter is linear phase, so its values are delayed by half of its taps:
+# this amount of record intervals, within a device sample
+FIR_DELAY_INTERVALS = FIR_TAPS_PER_FACTOR / 2
+
+
+# Reduces the driver values captured since the previous record tick to one value.
+# Bin averages weight every captured value equally. The FIR filter is a low pass at
+# the record Nyquist frequency over the captured stream, designed once the device
+# rate is known, and keeps its history between bins.
+class Oversampler:
+    def __init__(
+        self, mode: OversamplingTypes, interval_ms: float, width: int = 1
+    ) -> None:
+        self.mode: OversamplingTypes = mode
+        self.interval_ns: float = interval_ms * 1e6
+        self.width: int = width
+        self.taps: np.ndarray = None
+        self.history: np.ndarray = np.empty((0, width))
+
+    def reduce(self, times: np.ndarray, values: np.ndarray):
+        # None when nothing was captured in the bin
+        if len(values) == 0:
+            return None
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.width)
+        if self.mode == OversamplingTypes.MEAN:
+            value = values.mean(axis=0)
+        elif self.mode == OversamplingTypes.FIR:
+            value = self._filter(times, values)
+        else:
+            value = values[-1]
+        return value if self.width > 1 else float(value[0])
+
+    def _filter(self, times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        if self.taps is None:
+            if len(times) < 2:
+                return values[-1]
+            self._design(float(times[-1] - times[0]) / (len(times) - 1))
+        samples = np.concatenate([self.history, values])[-len(self.taps) :]
+        if len(samples) < len(self.taps):
+            # The first values are repeated until the filter is filled
+            padding = np.repeat(samples[:1], len(self.taps) - len(samples), axis=0)
+            samples = np.concatenate([padding, samples])
+        self.history = samples[1:]
+        return self.taps @ samples
+
+    def _design(self, period_ns: float) -> None:
+        # Only the FIR mode requires SciPy, so sensors can be used without it
+        from scipy.signal import firwin
+
+        factor = int(self.interval_ns // period_ns) if period_ns > 0 else 1
+        if factor < 2:
+            # The device is not faster than the record interval
+            self.taps = np.ones(1)
+            return
+        self.taps = firwin(FIR_TAPS_PER_FACTOR * factor + 1, 1 / factor)
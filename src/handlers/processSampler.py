@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+import time
+import queue
+import numpy as np
+import multiprocessing as mp
+
+from src.handlers.sensor import Sensor
+from src.handlers.sharedRingBuffer import SharedRingBuffer
+from src.handlers.tickClock import TickClock
+from src.handlers.oversampler import Oversampler
+from src.enums.oversamplingTypes import OversamplingTypes
+
+from loguru import logger
+
+
+# Sampling loop of a child process. The drivers are created and connected in the
+# child, and each tick is written as a row of the shared ticks ring.
+def _samplerMain(
+    setups: list[tuple[str, dict, type, int]],
+    interval_ms: int,
+    ring_name: str,
+    ring_capacity: int,
+    dtype: str,
+    capture_events: bool,
+    capture_drain_s: float,
+    oversampling: OversamplingTypes,
+    stop_event,
+    events_queue,
+    connection,
+) -> None:
+    sensors: list[Sensor] = []
+    for id, params, driver, data_interval_ms in setups:
+        sensor = Sensor(dtype=dtype)
+        sensor.setup(id, params, driver)
+        sensor.setDataInterval(data_interval_ms)
+        if not sensor.connect(check=True):
+            [connected.disconnect() for connected in sensors]
+            connection.send(f"Sensor {sensor.getName()} of id {id} is not connected!!")
+            return
+        sensors.append(sensor)
+    width = sum(sensor.values.width for sensor in sensors)
+    ring = SharedRingBuffer(width, ring_capacity, dtype, ring_name)
+    columns = []
+    column = 0
+    for sensor in sensors:
+        columns.append(slice(column, column + sensor.values.width))
+        column += sensor.values.width
+    if oversampling != OversamplingTypes.NONE:
+        for sensor in sensors:
+            sensor.setOversampler(
+                Oversampler(oversampling, interval_ms, sensor.values.width)
+            )
+    captured_sensors = []
+    if capture_events:
+        captured_sensors = [sensor for sensor in sensors if sensor.setCapture(True)]
+    connection.send(None)
+
+    clock = TickClock()
+    next_time = time.perf_counter() + interval_ms / 1000.0
+    next_drain = time.perf_counter() + capture_drain_s
+    while not stop_event.is_set():
+        time.sleep(max(0, next_time - time.perf_counter()))
+        next_time += interval_ms / 1000.0
+
+        timestamp = clock.now()
+        row = ring.getRow()
+        for sensor, columns_slice in zip(sensors, columns):
+            try:
+                row[columns_slice] = sensor.readValue()
+            except (TypeError, ValueError):
+                row[columns_slice] = np.nan
+        ring.commit(timestamp)
+
+        if captured_sensors and time.perf_counter() >= next_drain:
+            next_drain += capture_drain_s
+            _sendEvents(captured_sensors, events_queue, clock)
+    _sendEvents(captured_sensors, events_queue, clock)
+    [sensor.setCapture(False) for sensor in sensors]
+    [sensor.disconnect() for sensor in sensors]
+    ring.close()
+    events_queue.put(None)
+
+
+def _sendEvents(sensors: list[Sensor], events_queue, clock: TickClock) -> None:
+    for sensor in sensors:
+        timestamps, values = sensor.readBatch(clock)
+        if len(timestamps):
+            events_queue.put((sensor.getID(), timestamps, values))
+
+
+# Runs the sensor drivers and the sampling loop in a child process, so the work of
+# the UI process can not delay a sample. The UI process only reads the shared ring.
+class ProcessSampler:
+    def __init__(self) -> None:
+        self.process: mp.Process = None
+        self.ticks: SharedRingBuffer = None
+        self.stop_event = None
+        self.events_queue = None
+        self.events: list[tuple[str, np.ndarray, np.ndarray]] = []
+        self.events_finished: bool = True
+        self.columns: dict[str, slice] = {}
+
+    def start(
+        self,
+        sensors: list[Sensor],
+        interval_ms: int,
+        buffer_s: float = 30.0,
+        dtype: str = "float64",
+        capture_events: bool = False,
+        capture_drain_s: float = 1.0,
+        oversampling: OversamplingTypes = OversamplingTypes.NONE,
+        timeout_s: float = 30.0,
+    ) -> bool:
+        # Sensor drivers are recreated in the child from their setup
+        self.columns.clear()
+        column = 0
+        for sensor in sensors:
+            self.columns[sensor.getID()] = slice(column, column + sensor.values.width)
+            column += sensor.values.width
+        capacity = max(1024, int(np.ceil(buffer_s * 1000 / interval_ms)))
+        self.ticks = SharedRingBuffer(column, capacity, dtype)
+        # Spawned, as forking a process with running driver threads is not safe
+        context = mp.get_context("spawn")
+        self.stop_event = context.Event()
+        self.events_queue = context.Queue()
+        self.events.clear()
+        self.events_finished = not capture_events
+        parent_connection, child_connection = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_samplerMain,
+            args=[
+                [
+                    (
+                        sensor.getID(),
+                        sensor.params,
+                        sensor.driver_type,
+                        sensor.data_interval_ms,
+                    )
+                    for sensor in sensors
+                ],
+                interval_ms,
+                self.ticks.getName(),
+                capacity,
+                dtype,
+                capture_events,
+                capture_drain_s,
+                oversampling,
+                self.stop_event,
+                self.events_queue,
+                child_connection,
+            ],
+            daemon=True,
+        )
+        self.process.start()
+        if not parent_connection.poll(timeout_s):
+            logger.error("The sampler process did not start in time.")
+            self.close()
+            return False
+        error = parent_connection.recv()
+        if error is not None:
+            logger.error(error)
+            self.close()
+            return False
+        logger.info(f"Sampler process started with pid {self.process.pid}.")
+        return True
+
+    def readTicks(self) -> tuple[np.ndarray, np.ndarray, int]:
+        # Ticks written since the last read, and the amount of lost ticks
+        return self.ticks.read()
+
+    def getColumns(self, sensor_id: str) -> slice:
+        return self.columns[sensor_id]
+
+    def readEvents(self) -> list[tuple[str, np.ndarray, np.ndarray]]:
+        # Captured events sent since the last read, as (sensor id, times, values)
+        events, self.events = self.events, []
+        while not self.events_finished:
+            try:
+                sensor_events = self.events_queue.get_nowait()
+            except queue.Empty:
+                break
+            if sensor_events is None:
+                self.events_finished = True
+                break
+            events.append(sensor_events)
+        return events
+
+    def stop(self) -> None:
+        # The ticks ring can still be read until close() is called
+        if self.process is None:
+            return
+        self.stop_event.set()
+        # The queue must be emptied before joining the process that fills it
+        while not self.events_finished:
+            try:
+                sensor_events = self.events_queue.get(timeout=0.1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    break
+                continue
+            if sensor_events is None:
+                self.events_finished = True
+                break
+            self.events.append(sensor_events)
+        self.process.join()
+        self.process = None
+
+    def close(self) -> None:
+        self.stop()
+        if self.ticks is not None:
+            self.ticks.close()
+            self.ticks = None
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import json
+import numpy as np
+
+# Sub-bucket bits of the latency histograms. Each power of two range is split into
+# 2^(bits - 1) buckets, so recorded latencies keep 2 significant digits (< 1% error).
+HISTOGRAM_BITS = 7
+# Histogram buckets up to 2^40 ns (about 18 minutes)
+HISTOGRAM_SIZE = (1 << HISTOGRAM_BITS) + (40 - HISTOGRAM_BITS) * (
+    1 << (HISTOGRAM_BITS - 1)
+)
+
+
+def getBuckets(values: np.ndarray) -> np.ndarray:
+    # Log-linear (HDR) bucket of each value: exact below 2^bits, then the first
+    # bits significant bits of each power of two range
+    values = np.clip(np.asarray(values, dtype=np.int64), 0, None)
+    lengths = np.frexp(values.astype(np.float64))[1]
+    shifts = np.maximum(lengths - HISTOGRAM_BITS, 0)
+    half = 1 << (HISTOGRAM_BITS - 1)
+    buckets = np.where(
+        shifts == 0,
+        values,
+        (1 << HISTOGRAM_BITS) + (shifts - 1) * half + (values >> shifts) - half,
+    )
+    return np.minimum(buckets, HISTOGRAM_SIZE - 1)
+
+
+def getBucketValues(buckets: np.ndarray) -> np.ndarray:
+    # Lowest value of each bucket
+    buckets = np.asarray(buckets, dtype=np.int64)
+    half = 1 << (HISTOGRAM_BITS - 1)
+    shifts = np.maximum((buckets - (1 << HISTOGRAM_BITS)) // half + 1, 0)
+    return np.where(
+        shifts == 0,
+        buckets,
+        ((buckets - (1 << HISTOGRAM_BITS) - (shifts - 1) * half) + half) << shifts,
+    )
+
+
+# Driver read timings of one sensor. The latest reads are kept in a ring for trace
+# exports, and every read is folded in blocks into a fixed size latency histogram,
+# so tracing costs two array writes per read and fixed memory for any test duration.
+class ReadTrace:
+    def __init__(self, capacity: int = 65536, fold_size: int = 1024) -> None:
+        self.fold_size: int = fold_size
+        self.capacity: int = -(-max(capacity, fold_size) // fold_size) * fold_size
+        self.starts: np.ndarray = np.zeros(self.capacity, dtype=np.int64)
+        self.durations: np.ndarray = np.zeros(self.capacity, dtype=np.int64)
+        self.histogram: np.ndarray = np.zeros(HISTOGRAM_SIZE, dtype=np.int64)
+        self.count: int = 0
+        self.folded: int = 0
+        self.max: int = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, start: int, duration: int) -> None:
+        index = self.count % self.capacity
+        self.starts[index] = start
+        self.durations[index] = duration
+        self.count += 1
+        if self.count - self.folded >= self.fold_size:
+            self._fold()
+
+    def _fold(self) -> None:
+        count = self.count
+        rows = np.arange(self.folded, count) % self.capacity
+        durations = self.durations[rows]
+        self.histogram += np.bincount(getBuckets(durations), minlength=HISTOGRAM_SIZE)
+        self.max = max(self.max, int(durations.max(initial=0)))
+        self.folded = count
+
+    def getReads(self) -> tuple[np.ndarray, np.ndarray]:
+        # Latest reads kept in the ring, as start times and durations in ns
+        first = max(self.count - self.capacity, 0)
+        rows = np.arange(first, self.count) % self.capacity
+        return self.starts[rows], self.durations[rows]
+
+    def getHistogram(self) -> np.ndarray:
+        self._fold()
+        return self.histogram
+
+    def getSummary(self) -> dict:
+        # Read latency percentiles in ms
+        histogram = self.getHistogram()
+        total = int(histogram.sum())
+        summary = {"reads": total}
+        cumulative = np.cumsum(histogram)
+        for name, quantile in [
+            ("p50_ms", 0.5),
+            ("p90_ms", 0.9),
+            ("p99_ms", 0.99),
+            ("p999_ms", 0.999),
+        ]:
+            bucket = np.searchsorted(cumulative, quantile * total) if total else 0
+            summary[name] = float(getBucketValues(bucket)) / 1e6
+        summary["max_ms"] = self.max / 1e6
+        return summary
+
+
+def getChromeTrace(traces: dict[str, ReadTrace], start_time: int) -> dict:
+    # Chrome trace event format, also opened by Perfetto. Each sensor is a track with
+    # one slice per read, in us since the start time (perf counter ns).
+    events = []
+    for tid, (name, trace) in enumerate(traces.items(), start=1):
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+        starts, durations = trace.getReads()
+        events.extend(
+            {
+                "name": "read",
+                "cat": "sensor",
+                "ph": "X",
+                "pid": 1,
+                "tid": tid,
+                "ts": (start - start_time) / 1000,
+                "dur": duration / 1000,
+            }
+            for start, duration in zip(starts.tolist(), durations.tolist())
+        )
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {name: trace.getSummary() for name, trace in traces.items()},
+    }
+
+
+def exportChromeTrace(traces: dict[str, ReadTrace], start_time: int, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(getChromeTrace(traces, start_time), file)
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import queue
+import struct
+import threading
+import numpy as np
+
+from loguru import logger
+
+# Recording file layout:
+# - Preamble: magic, format version and header size.
+# - JSON header padded to a page boundary: recording metadata (creation time,
+#   record interval, config snapshot, sensor groups) and every stream description
+#   with its channels names and calibration.
+# - Appended blocks of a single stream: block header, int64 timestamps[rows] and
+#   every stream column of dtype[rows], one column after another (little-endian).
+# - Appended metadata blocks with JSON updates, such as calibration changes.
+#   Closed recordings end with a {"finished": true} metadata block.
+# Blocks are only appended, so an interrupted file keeps all its complete blocks.
+RECORDING_MAGIC = b"FPRECORD"
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".fpr"
+PREAMBLE = struct.Struct("<8sII")
+BLOCK_HEADER = struct.Struct("<IIQ")  # Stream index, reserved, rows
+METADATA_BLOCK = 0xFFFFFFFF  # Stream index of metadata blocks, rows are bytes
+PAGE_SIZE = 4096
+
+TICKS_STREAM = "ticks"
+
+
+def eventsStream(sensor_id: str) -> str:
+    return f"events.{sensor_id}"
+
+
+def timelineStream(group_id: str) -> str:
+    # Ticks of a group sampled at its own interval
+    return f"ticks.{group_id}"
+
+
+def findUnfinishedRecordings(directory: str) -> list[str]:
+    # Recordings of interrupted tests, excluding the ones still being written
+    if not os.path.isdir(directory):
+        return []
+    paths = []
+    for file_name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, file_name)
+        if (
+            not file_name.endswith(RECORDING_SUFFIX)
+            or path in RecordingWriter.open_paths
+        ):
+            continue
+        try:
+            reader = RecordingReader(path)
+        except (OSError, ValueError):
+            continue
+        if not reader.isFinished():
+            paths.append(path)
+        reader.close()
+    return paths
+
+
+def finishRecording(path: str, metadata: dict = None) -> bool:
+    # Closes an interrupted recording: the incomplete trailing block is removed
+    # and the finished metadata block is appended
+    try:
+        reader = RecordingReader(path)
+        end = reader.getEnd()
+        reader.close()
+        with open(path, "r+b") as file:
+            file.truncate(end)
+            file.seek(end)
+            metadata_bytes = json.dumps({**(metadata or {}), "finished": True}).encode(
+                "utf-8"
+            )
+            file.write(BLOCK_HEADER.pack(METADATA_BLOCK, 0, len(metadata_bytes)))
+            file.write(metadata_bytes)
+    except (OSError, ValueError) as error:
+        logger.error(f"Could not finish recording {path}: {error}")
+        return False
+    return True
+
+
+class RecordingWriter:
+    # Paths of the recordings being written by this process
+    open_paths: set[str] = set()
+
+    def __init__(self) -> None:
+        self.path: str = ""
+        self.file = None
+        self.header: dict = {}
+        self.dtype: np.dtype = np.dtype("<f8")
+        self.streams: dict[str, int] = {}
+        self.blocks_queue: queue.Queue = queue.Queue()
+        self.write_thread: threading.Thread
+
+    # Streams are described as {name: [{"id", "name", "type", "width", ...}, ...]}
+    def open(
+        self,
+        path: str,
+        streams: dict[str, list[dict]],
+        dtype: str = "float64",
+        metadata: dict = None,
+    ) -> bool:
+        self.path = path
+        self.dtype = np.dtype(dtype).newbyteorder("<")
+        self.streams = {name: i for i, name in enumerate(streams)}
+        self.header = {
+            "dtype": self.dtype.str,
+            "time_unit": "ns",
+            **(metadata or {}),
+            "streams": [
+                {"name": name, "channels": channels}
+                for name, channels in streams.items()
+            ],
+        }
+        header_bytes = json.dumps(self.header).encode("utf-8")
+        header_size = PREAMBLE.size + len(header_bytes)
+        header_size = -(-header_size // PAGE_SIZE) * PAGE_SIZE
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.file = open(path, "wb")
+            self.file.write(
+                PREAMBLE.pack(RECORDING_MAGIC, RECORDING_VERSION, header_size)
+            )
+            self.file.write(header_bytes.ljust(header_size - PREAMBLE.size, b" "))
+            self.file.flush()
+        except OSError as error:
+            logger.error(f"Could not create recording file {path}: {error}")
+            self.file = None
+            return False
+        RecordingWriter.open_paths.add(path)
+        self.write_thread = threading.Thread(target=self._writeProcess)
+        self.write_thread.start()
+        logger.info(f"Recording to {path}")
+        return True
+
+    def isOpen(self) -> bool:
+        return self.file is not None
+
+    def write(
+        self, stream: str, timestamps: np.ndarray, channels: list[np.ndarray]
+    ) -> None:
+        # Writes are queued, so the acquisition threads never wait for the disk
+        if len(timestamps) == 0:
+            return
+        self.blocks_queue.put((self.streams[stream], timestamps, channels))
+
+    def writeMetadata(self, metadata: dict) -> None:
+        self.blocks_queue.put((METADATA_BLOCK, metadata, None))
+
+    def _writeProcess(self) -> None:
+        while True:
+            block = self.blocks_queue.get()
+            if block is None:
+                break
+            if block[0] == METADATA_BLOCK:
+                self._writeMetadataBlock(block[1])
+                continue
+            self._writeBlock(*block)
+
+    def _writeBlock(
+        self, stream_idx: int, timestamps: np.ndarray, channels: list[np.ndarray]
+    ) -> None:
+        rows = len(timestamps)
+        self.file.write(BLOCK_HEADER.pack(stream_idx, 0, rows))
+        self.file.write(np.asarray(timestamps, dtype="<i8").tobytes())
+        for values in channels:
+            # Column-major: each channel column is stored contiguously
+            values = np.asarray(values, dtype=self.dtype).reshape(rows, -1)
+            self.file.write(values.T.tobytes())
+        self.file.flush()
+
+    def _writeMetadataBlock(self, metadata: dict) -> None:
+        metadata_bytes = json.dumps(metadata).encode("utf-8")
+        self.file.write(BLOCK_HEADER.pack(METADATA_BLOCK, 0, len(metadata_bytes)))
+        self.file.write(metadata_bytes)
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self.writeMetadata({"finished": True})
+        self.blocks_queue.put(None)
+        self.write_thread.join()
+        self.file.close()
+        self.file = None
+        RecordingWriter.open_paths.discard(self.path)
+
+
+class RecordingReader:
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.header: dict = {}
+        self.dtype: np.dtype
+        self.data: np.memmap
+        # Per stream: channel column offsets and widths, block offsets and
+        # cumulative block rows
+        self.stream_names: list[str] = []
+        self.channels: dict[str, dict[str, tuple[int, int]]] = {}
+        self.widths: dict[str, int] = {}
+        self.block_offsets: dict[str, np.ndarray] = {}
+        self.block_starts: dict[str, np.ndarray] = {}
+        self.block_times: dict[str, np.ndarray] = {}
+        # Calibration updates and other metadata appended after the header
+        self.calibration: dict[str, dict] = {}
+        self.metadata: dict = {}
+        # Interrupted recordings are not finished. End of their last complete block.
+        self.finished: bool = False
+        self.end: int = 0
+        self.load()
+
+    def load(self) -> None:
+        self.data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if len(self.data) < PREAMBLE.size:
+            raise ValueError(f"{self.path} is not a recording file")
+        magic, version, header_size = PREAMBLE.unpack_from(self.data, 0)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"{self.path} is not a recording file")
+        if version > RECORDING_VERSION:
+            raise ValueError(f"Recording version {version} is not supported")
+        self.header = json.loads(bytes(self.data[PREAMBLE.size : header_size]))
+        self.dtype = np.dtype(self.header["dtype"])
+        for stream in self.header["streams"]:
+            name = stream["name"]
+            self.stream_names.append(name)
+            self.channels[name] = {}
+            column = 0
+            for channel in stream["channels"]:
+                self.channels[name][channel["id"]] = (column, channel["width"])
+                column += channel["width"]
+            self.widths[name] = column
+        self.scanBlocks(header_size)
+
+    def scanBlocks(self, offset: int) -> None:
+        # Only block headers are read, the sample pages are not touched
+        blocks: dict[str, list[tuple[int, int]]] = {
+            name: [] for name in self.stream_names
+        }
+        while offset + BLOCK_HEADER.size <= len(self.data):
+            stream_idx, _, rows = BLOCK_HEADER.unpack_from(self.data, offset)
+            size = BLOCK_HEADER.size + rows
+            if stream_idx != METADATA_BLOCK:
+                if stream_idx >= len(self.stream_names):
+                    logger.warning(f"Invalid block found in {self.path}")
+                    break
+                name = self.stream_names[stream_idx]
+                size = BLOCK_HEADER.size + rows * (
+                    8 + self.widths[name] * self.dtype.itemsize
+                )
+            if offset + size > len(self.data):
+                logger.warning(f"Ignoring incomplete block at the end of {self.path}")
+                break
+            if stream_idx == METADATA_BLOCK:
+                self.loadMetadata(offset + BLOCK_HEADER.size, rows)
+            else:
+                blocks[name].append((offset + BLOCK_HEADER.size, rows))
+            offset += size
+        self.end = offset
+        for name, stream_blocks in blocks.items():
+            self.block_offsets[name] = np.array(
+                [block[0] for block in stream_blocks], dtype=np.int64
+            )
+            self.block_starts[name] = np.concatenate(
+                [[0], np.cumsum([block[1] for block in stream_blocks], dtype=np.int64)]
+            )
+
+    def loadMetadata(self, offset: int, size: int) -> None:
+        metadata = json.loads(bytes(self.data[offset : offset + size]))
+        self.calibration.update(metadata.get("calibration", {}))
+        self.metadata.update(metadata)
+        self.finished = metadata.get("finished", self.finished)
+
+    # Header getters
+
+    def getHeader(self) -> dict:
+        return self.header
+
+    def getConfig(self) -> dict:
+        return self.header.get("config", {})
+
+    def getGroups(self) -> list[dict]:
+        return self.header.get("groups", [])
+
+    def getIntervalMs(self) -> float:
+        return self.header.get("interval_ms", 0)
+
+    def getMetadata(self) -> dict:
+        # Latest value of each key of the appended metadata blocks
+        return self.metadata
+
+    def getStreams(self) -> list[str]:
+        return self.stream_names
+
+    def getChannels(self, stream: str) -> list[dict]:
+        # Channel descriptions with the latest calibration
+        channels = self.header["streams"][self.stream_names.index(stream)]["channels"]
+        return [
+            {**channel, **self.calibration.get(channel["id"], {})}
+            for channel in channels
+        ]
+
+    def isFinished(self) -> bool:
+        return self.finished
+
+    def getEnd(self) -> int:
+        return self.end
+
+    def getSize(self, stream: str) -> int:
+        return int(self.block_starts[stream][-1])
+
+    # Data getters. Only the pages of the selected rows and columns are read.
+
+    def getRange(
+        self, stream: str, start_time: int = None, stop_time: int = None
+    ) -> tuple[int, int]:
+        # Rows with start_time <= timestamp < stop_time
+        start = 0 if start_time is None else self._rowAt(stream, start_time)
+        stop = (
+            self.getSize(stream)
+            if stop_time is None
+            else self._rowAt(stream, stop_time)
+        )
+        return start, stop
+
+    def _rowAt(self, stream: str, timestamp: int) -> int:
+        offsets = self.block_offsets[stream]
+        starts = self.block_starts[stream]
+        if len(offsets) == 0:
+            return 0
+        if stream not in self.block_times:
+            self.block_times[stream] = np.array(
+                [np.frombuffer(self.data, "<i8", 1, offset)[0] for offset in offsets]
+            )
+        i = max(np.searchsorted(self.block_times[stream], timestamp, "right") - 1, 0)
+        times = np.frombuffer(self.data, "<i8", starts[i + 1] - starts[i], offsets[i])
+        return int(starts[i] + np.searchsorted(times, timestamp, "left"))
+
+    def getTimes(self, stream: str, start: int = 0, stop: int = None) -> np.ndarray:
+        segments = []
+        for offset, rows, first, last in self._blocks(stream, start, stop):
+            times = np.frombuffer(self.data, dtype="<i8", count=rows, offset=offset)
+            segments.append(times[first:last])
+        return self._join(segments, np.dtype("<i8"), 1)
+
+    def getChannel(
+        self, stream: str, channel_id: str, start: int = 0, stop: int = None
+    ) -> np.ndarray:
+        column, width = self.channels[stream][channel_id]
+        segments = []
+        for offset, rows, first, last in self._blocks(stream, start, stop):
+            position = offset + rows * 8 + column * rows * self.dtype.itemsize
+            values = np.frombuffer(
+                self.data, dtype=self.dtype, count=rows * width, offset=position
+            )
+            segments.append(values.reshape(width, rows).T[first:last])
+        return self._join(segments, self.dtype, width)
+
+    def _blocks(self, stream: str, start: int, stop: int):
+        # Yields the blocks in the row range, with the rows to take from each one
+        offsets = self.block_offsets[stream]
+        starts = self.block_starts[stream]
+        stop = starts[-1] if stop is None else min(stop, starts[-1])
+        i = max(np.searchsorted(starts, start, "right") - 1, 0)
+        while i < len(offsets) and starts[i] < stop:
+            rows = int(starts[i + 1] - starts[i])
+            first = max(start - starts[i], 0)
+            last = min(stop - starts[i], rows)
+            yield int(offsets[i]), rows, int(first), int(last)
+            i += 1
+
+    def _join(self, segments: list[np.ndarray], dtype: np.dtype, width: int):
+        # A single block is returned as a view of the mapped file
+        if not segments:
+            values = np.empty((0, width), dtype=dtype)
+        elif len(segments) == 1:
+            values = segments[0]
+        else:
+            values = np.concatenate(segments)
+        if width == 1:
+            return values.reshape(-1)
+        return values
+
+    def close(self) -> None:
+        del self.data
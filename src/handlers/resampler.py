@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from src.enums.alignmentTypes import AlignmentTypes
+
+
+# Uniform time grid over the time range covered by every stream, in ns
+def getCommonGrid(time_lists: list[np.ndarray], interval_ns: int) -> np.ndarray:
+    time_lists = [times for times in time_lists if len(times) > 0]
+    if not time_lists or interval_ns <= 0:
+        return np.empty(0, dtype=np.int64)
+    start = max(int(times[0]) for times in time_lists)
+    stop = min(int(times[-1]) for times in time_lists)
+    if stop < start:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(start, stop + 1, interval_ns, dtype=np.int64)
+
+
+# Index of the stream value before each grid time, and the position of the grid
+# time between that value and the next one, from 0 to 1
+def getPositions(times: np.ndarray, grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    times = np.asarray(times, dtype=np.int64)
+    if len(times) < 2:
+        return np.zeros(len(grid), dtype=np.int64), np.zeros(len(grid))
+    index = np.searchsorted(times, grid, side="right") - 1
+    index = np.clip(index, 0, len(times) - 2)
+    elapsed = (grid - times[index]).astype(np.float64)
+    period = (times[index + 1] - times[index]).astype(np.float64)
+    weights = np.divide(elapsed, period, out=np.zeros(len(grid)), where=period > 0)
+    return index, np.clip(weights, 0, 1)
+
+
+# Values of a stream at the grid times, along the first axis. All the columns of a
+# stream are resampled in one pass.
+def resample(
+    times: np.ndarray, values: np.ndarray, grid: np.ndarray, mode: AlignmentTypes
+) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    index, weights = getPositions(times, grid)
+    if len(values) < 2:
+        return values[index]
+    if mode == AlignmentTypes.NEAREST:
+        return values[index + (weights >= 0.5)]
+    if mode == AlignmentTypes.ZOH:
+        return values[index + (weights >= 1)]
+    weights = weights.reshape((-1,) + (1,) * (values.ndim - 1))
+    return values[index] * (1 - weights) + values[index + 1] * weights
+
+
+# Spherical linear interpolation of unit quaternions (x, y, z, w) at the grid times
+def slerp(times: np.ndarray, quaternions: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    quaternions = np.asarray(quaternions, dtype=np.float64)
+    index, weights = getPositions(times, grid)
+    if len(quaternions) < 2:
+        return quaternions[index]
+    q0 = quaternions[index]
+    q1 = quaternions[index + 1]
+    # Shortest path between both rotations
+    dot = np.sum(q0 * q1, axis=1)
+    q1 = np.where((dot < 0)[:, None], -q1, q1)
+    theta = np.arccos(np.clip(np.abs(dot), 0, 1))
+    sin_theta = np.sin(theta)
+    # Close rotations are linearly interpolated
+    close = sin_theta < 1e-6
+    sin_theta[close] = 1
+    s0 = np.where(close, 1 - weights, np.sin((1 - weights) * theta) / sin_theta)
+    s1 = np.where(close, weights, np.sin(weights * theta) / sin_theta)
+    result = s0[:, None] * q0 + s1[:, None] * q1
+    return result / np.linalg.norm(result, axis=1, keepdims=True)
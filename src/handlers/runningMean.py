@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+# Mean of the latest values of a stream, kept in a ring with its running sum, so
+# adding a value and reading the mean take constant time. The sum is recomputed
+# each time the ring wraps, so rounding errors do not accumulate.
+class RunningMean:
+    def __init__(self, size: int = 300) -> None:
+        self.size: int = max(1, size)
+        self.ring: np.ndarray = np.zeros(self.size)
+        self.position: int = 0
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def add(self, value: float) -> None:
+        if value is None or np.isnan(value):
+            return
+        if self.count == self.size:
+            self.sum -= self.ring[self.position]
+        else:
+            self.count += 1
+        self.ring[self.position] = value
+        self.sum += value
+        self.position = (self.position + 1) % self.size
+        if self.position == 0:
+            self.sum = float(self.ring[: self.count].sum())
+
+    def extend(self, values: np.ndarray) -> None:
+        # Vectorized add of many values, missing ones are skipped
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        values = values[~np.isnan(values)][-self.size :]
+        amount = len(values)
+        if amount == 0:
+            return
+        end = self.position + amount
+        if end < self.size:
+            # Only the values overwritten in a full ring leave the sum
+            if self.count == self.size:
+                self.sum -= float(self.ring[self.position : end].sum())
+            self.ring[self.position : end] = values
+            self.sum += float(values.sum())
+        else:
+            split = self.size - self.position
+            self.ring[self.position :] = values[:split]
+            self.ring[: end - self.size] = values[split:]
+        self.position = end % self.size
+        self.count = min(self.count + amount, self.size)
+        if end >= self.size:
+            self.sum = float(self.ring[: self.count].sum())
+
+    def resize(self, size: int) -> None:
+        # Keeps the latest values that fit in the new size
+        values = self.getValues()
+        self.__init__(size)
+        self.extend(values)
+
+    def clear(self) -> None:
+        self.position = self.count = 0
+        self.sum = 0.0
+
+    def getMean(self) -> float:
+        if self.count == 0:
+            return None
+        return self.sum / self.count
+
+    def getCount(self) -> int:
+        return self.count
+
+    def getValues(self) -> np.ndarray:
+        # Values in the order they were added
+        if self.count < self.size:
+            return self.ring[: self.count].copy()
+        return np.roll(self.ring, -self.position)
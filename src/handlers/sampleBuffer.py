@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+
+# Typed sample storage of shape (n, width). Rows are written into a preallocated
+# NumPy array that grows in chunks, so recording does not box every sample.
+class SampleBuffer:
+    def __init__(
+        self, width: int = 1, dtype: np.dtype = np.float64, chunk_size: int = 4096
+    ) -> None:
+        self.width: int = width
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.chunk_size: int = chunk_size
+        self.data: np.ndarray = np.empty((chunk_size, width), dtype=self.dtype)
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, amount: int) -> None:
+        required = self.size + amount
+        if required <= len(self.data):
+            return
+        # Grow geometrically, rounded up to whole chunks
+        capacity = max(required, 2 * len(self.data))
+        capacity = -(-capacity // self.chunk_size) * self.chunk_size
+        data = np.empty((capacity, self.width), dtype=self.dtype)
+        data[: self.size] = self.data[: self.size]
+        self.data = data
+
+    def append(self, value) -> None:
+        if self.size == len(self.data):
+            self._reserve(1)
+        try:
+            self.data[self.size] = value
+        except (TypeError, ValueError):
+            # Missing or malformed readings keep the timeline aligned as NaN
+            self.data[self.size] = np.nan
+        self.size += 1
+
+    def extend(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=self.dtype).reshape(-1, self.width)
+        self._reserve(len(values))
+        self.data[self.size : self.size + len(values)] = values
+        self.size += len(values)
+
+    def discard(self, amount: int) -> None:
+        # Drops the oldest rows, the newest ones are moved to the start
+        amount = min(amount, self.size)
+        self.data[: self.size - amount] = self.data[amount : self.size]
+        self.size -= amount
+
+    def clear(self) -> None:
+        self.data = np.empty((self.chunk_size, self.width), dtype=self.dtype)
+        self.size = 0
+
+    def getValues(self) -> np.ndarray:
+        # Zero-copy view of the recorded rows. Single width buffers are flattened.
+        if self.width == 1:
+            return self.data[: self.size, 0]
+        return self.data[: self.size]
+
+    def getNBytes(self) -> int:
+        return self.size * self.width * self.dtype.itemsize
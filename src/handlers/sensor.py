@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
 
+import time
+import numpy as np
+
+from src.handlers.sampleBuffer import SampleBuffer
+from src.handlers.readTrace import ReadTrace
+from src.handlers.tickClock import TickClock
+from src.handlers.oversampler import Oversampler
 from src.enums.sensorParams import SParams
 from src.enums.sensorTypes import STypes
 from src.enums.sensorStatus import SStatus
 from typing import Protocol
 
+# Amount of values returned by each driver reading. Defaults to a single value.
+values_width = {STypes.SENSOR_IMU: 10}
+
 
 class Driver(Protocol):
     def __init__(self, serial: int, channel: int) -> None: ...
@@ -15,18 +25,50 @@ class Driver(Protocol):
 
     def getValue(self): ...
 
+    # Optional event capture methods:
+    # - setCapture(capture: bool) -> None
+    # - readBatch() -> tuple[np.ndarray, np.ndarray]
+    #   Every value since the previous call, as int64 ns timestamps and (n, width)
+    #   values, copied in one go instead of one locked getValue() per value.
+    #   Timestamps are on the perf counter (time.perf_counter_ns), mapped onto the
+    #   test ticks with TickClock.fromCounter.
+    # Optional health check of an open handle:
+    # - isAttached() -> bool
+
 
 class Sensor:
-    def __init__(self) -> None:
+    def __init__(self, dtype: np.dtype = np.float64) -> None:
         self.id: str
         self.params: dict
         self.status: SStatus = SStatus.IGNORED
         self.driver: Driver
-        self.values: list = []
+        self.driver_type: type[Driver]
+        # Driver handle opened, it may be kept open after a connection check
+        self.connected: bool = False
+        self.values: SampleBuffer = SampleBuffer(dtype=dtype)
+        # Captured driver events and their timestamps
+        self.events_times: SampleBuffer = SampleBuffer(dtype=np.int64)
+        self.events_values: SampleBuffer = SampleBuffer(dtype=dtype)
+        # Optional timing of each driver read
+        self.read_trace: ReadTrace = None
+        # Values missing because the driver read was late, or held by the high-rate
+        # capture as the driver had no new value
+        self.dropouts: int = 0
+        # Driver data interval set on connection, 0 for the fastest of the device
+        self.data_interval_ms: int = 8
+        # Optional reduction of the captured values of each record interval
+        self.oversampler: Oversampler = None
 
     def setup(self, id: str, params: dict, driver: Driver):
         self.id = id
         self.params = params
+        self.values = SampleBuffer(
+            width=values_width.get(self.getType(), 1), dtype=self.values.dtype
+        )
+        self.events_values = SampleBuffer(
+            width=self.values.width, dtype=self.values.dtype
+        )
+        self.driver_type = driver
         self.driver = driver(
             self.params[SParams.CONNECTION_SECTION.value][SParams.SERIAL.value],
             self.params[SParams.CONNECTION_SECTION.value].get(
@@ -37,31 +79,149 @@ class Sensor:
     def connect(self, check: bool = False) -> bool:
         if not self.params[SParams.READ.value]:
             self.status = SStatus.IGNORED
+            self.disconnect()
             return False
         if not check and self.status is not SStatus.AVAILABLE:
             return False
+        if self.connected:
+            self.status = SStatus.AVAILABLE
+            return True
         self.status = SStatus.NOT_FOUND
-        if self.driver.connect():
+        if self.driver.connect(interval_ms=self.data_interval_ms):
             self.status = SStatus.AVAILABLE
+            self.connected = True
             return True
         return False
 
     def disconnect(self) -> None:
+        if not self.connected:
+            return
         self.driver.disconnect()
+        self.connected = False
 
-    def checkConnection(self) -> bool:
+    def checkConnection(self, keep_open: bool = False) -> bool:
+        # Kept open handles make the next connect immediate
         connected = self.connect(check=True)
-        if connected:
+        if connected and not keep_open:
             self.disconnect()
         return connected
 
+    def isHealthy(self) -> bool:
+        if not self.connected:
+            return False
+        if not hasattr(self.driver, "isAttached"):
+            return True
+        return self.driver.isAttached()
+
     def registerValue(self) -> None:
         if self.status is not SStatus.AVAILABLE:
             return
-        self.values.append(self.driver.getValue())
+        self.values.append(self.readValue())
+
+    def readValue(self):
+        if self.read_trace is None:
+            return self._readDriver()
+        start = time.perf_counter_ns()
+        value = self._readDriver()
+        self.read_trace.add(start, time.perf_counter_ns() - start)
+        return value
+
+    def _readDriver(self):
+        oversampler = self.oversampler
+        if oversampler is not None:
+            value = oversampler.reduce(*self.driver.readBatch())
+            if value is not None:
+                return value
+        # Latest value, also used when nothing was captured since the last read
+        return self.driver.getValue()
+
+    def getLatestValue(self):
+        # Current driver value, without recording it. None while disconnected.
+        if not self.connected:
+            return None
+        return self.driver.getValue()
+
+    def addValue(self, value) -> None:
+        self.values.append(value)
+
+    def addDropout(self) -> None:
+        # Keeps the timeline aligned without the late value
+        self.values.append(np.nan)
+        self.dropouts += 1
+
+    def addDropouts(self, amount: int) -> None:
+        self.dropouts += amount
+
+    def canCapture(self) -> bool:
+        return hasattr(self.driver, "setCapture")
+
+    def setCapture(self, capture: bool) -> bool:
+        if not self.canCapture():
+            return False
+        self.driver.setCapture(capture)
+        return True
+
+    def readBatch(self, clock: TickClock = None) -> tuple[np.ndarray, np.ndarray]:
+        # Timestamps are moved from the perf counter to the clock timeline if given
+        if self.status is not SStatus.AVAILABLE:
+            return np.empty(0, dtype=np.int64), np.empty((0, self.values.width))
+        if hasattr(self.driver, "readBatch"):
+            timestamps, values = self.driver.readBatch()
+        else:
+            # Drivers without batches return their current value
+            timestamps = np.array([time.perf_counter_ns()], dtype=np.int64)
+            values = np.full((1, self.values.width), np.nan)
+            try:
+                values[0] = self.driver.getValue()
+            except (TypeError, ValueError):
+                # Missing or malformed readings are returned as NaN
+                pass
+        if clock is not None:
+            timestamps = clock.fromCounter(timestamps)
+        return timestamps, values
+
+    def registerEvents(self, clock: TickClock = None) -> None:
+        self.addEvents(*self.readBatch(clock))
+
+    def addEvents(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        self.events_times.extend(timestamps)
+        self.events_values.extend(values)
+
+    def swapValues(self) -> SampleBuffer:
+        # Hands over the recorded values and continues with an empty buffer.
+        # Must not be called while the sensor is registering values.
+        values = self.values
+        self.values = SampleBuffer(
+            width=values.width, dtype=values.dtype, chunk_size=values.chunk_size
+        )
+        return values
 
     # Setters and getters methods
 
+    def setDataInterval(self, interval_ms: int) -> None:
+        # Open handles are closed, so the next connect applies the new interval
+        if interval_ms != self.data_interval_ms:
+            self.disconnect()
+        self.data_interval_ms = interval_ms
+
+    def canOversample(self) -> bool:
+        # Quaternions are not reduced component-wise, so IMUs keep their latest value
+        return self.canCapture() and self.getType() != STypes.SENSOR_IMU
+
+    def setOversampler(self, oversampler: Oversampler) -> bool:
+        # Values are captured and reduced on each read while an oversampler is set.
+        # Drivers without event capture keep reading their latest value.
+        if not self.canOversample():
+            self.oversampler = None
+            return False
+        self.oversampler = oversampler
+        self.driver.setCapture(oversampler is not None)
+        return True
+
+    def setReadTrace(self, read_trace: ReadTrace) -> None:
+        # Driver reads are timed while a trace is set
+        self.read_trace = read_trace
+
     def setRead(self, read: bool) -> None:
         self.params[SParams.READ.value] = read
 
@@ -74,7 +234,10 @@ class Sensor:
         ] = intercept
 
     def clearValues(self) -> None:
+        self.dropouts = 0
         self.values.clear()
+        self.events_times.clear()
+        self.events_values.clear()
 
     def getID(self) -> str:
         return self.id
@@ -109,5 +272,21 @@ class Sensor:
             SParams.INTERCEPT.value, 0
         )
 
-    def getValues(self) -> list:
-        return self.values
+    def getInfo(self) -> dict:
+        return {
+            "id": self.getID(),
+            "name": self.getName(),
+            "type": self.getType().name,
+            "width": self.values.width,
+            "slope": self.getSlope(),
+            "intercept": self.getIntercept(),
+        }
+
+    def getDropouts(self) -> int:
+        return self.dropouts
+
+    def getValues(self) -> np.ndarray:
+        return self.values.getValues()
+
+    def getEvents(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.events_times.getValues(), self.events_values.getValues()
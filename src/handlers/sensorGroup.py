@@ -18,19 +18,27 @@ class SensorGroup:
         self.sensors: dict[str, Sensor] = {}
         # Geometric matrix (only for force platform types)
         self.g_matrix: list[list[float]] = [[0]]
+        # Own record interval, sampled on a separate timeline. None uses the test one.
+        self.interval_ms: float = None
 
     def addSensor(self, sensor: Sensor):
         self.sensors[sensor.id] = sensor
 
-    def checkConnections(self) -> bool:
+    def checkConnections(self, keep_open: bool = False) -> bool:
         if not self.read:
             self.status = SGStatus.IGNORED
+            [sensor.disconnect() for sensor in self.sensors.values()]
             return False
         results = False
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+        # One thread per sensor, so every attachment wait runs concurrently
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(len(self.sensors), 1)
+        ) as executor:
             sensors_list = list(self.sensors.values())
             results = list(
-                executor.map(lambda sensor: sensor.checkConnection(), sensors_list)
+                executor.map(
+                    lambda sensor: sensor.checkConnection(keep_open), sensors_list
+                )
             )
         self.status = SGStatus.ERROR
         if all(results):
@@ -57,6 +65,9 @@ class SensorGroup:
     def setRead(self, read: bool) -> None:
         self.read = read
 
+    def setInterval(self, interval_ms: float) -> None:
+        self.interval_ms = interval_ms
+
     def clearValues(self) -> None:
         [sensor.clearValues() for sensor in self.sensors.values()]
 
@@ -78,9 +89,22 @@ class SensorGroup:
     def getStatus(self) -> SGStatus:
         return self.status
 
+    def getInterval(self) -> float:
+        return self.interval_ms
+
     def isActive(self) -> bool:
         return self.active
 
+    def getInfo(self, only_available: bool = False) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type.name,
+            "g_matrix": self.g_matrix,
+            "interval_ms": self.interval_ms,
+            "sensors": list(self.getSensors(only_available=only_available).keys()),
+        }
+
     def getSensors(
         self, only_available: bool = False, sensor_type: STypes = None
     ) -> dict[str, Sensor]:
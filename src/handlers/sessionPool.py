@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+from src.handlers.sensor import Sensor
+
+from loguru import logger
+
+
+# Keeps sensor driver sessions attached between tests. Idle sessions are closed
+# after a timeout, and unhealthy ones are closed so the next connect reattaches them.
+class SessionPool:
+    def __init__(self, idle_timeout_s: float = 300.0, check_interval_s: float = 5.0):
+        self.idle_timeout_s: float = idle_timeout_s
+        self.check_interval_s: float = check_interval_s
+        self.mutex = threading.Lock()
+        # Idle sessions and the time they were released
+        self.sessions: dict[Sensor, float] = {}
+        self.check_thread: threading.Thread = None
+        self.check_stop: threading.Event = threading.Event()
+
+    def setIdleTimeout(self, idle_timeout_s: float) -> None:
+        self.idle_timeout_s = idle_timeout_s
+
+    def release(self, sensors: list[Sensor]) -> None:
+        # Connected sensors are kept open, idle from now
+        now = time.monotonic()
+        with self.mutex:
+            for sensor in sensors:
+                if sensor.connected:
+                    self.sessions[sensor] = now
+        if self.check_thread is None or not self.check_thread.is_alive():
+            self.check_stop.clear()
+            self.check_thread = threading.Thread(target=self._checkProcess, daemon=True)
+            self.check_thread.start()
+
+    def acquire(self, sensors: list[Sensor]) -> None:
+        # Takes the sessions out of the pool. Unhealthy ones are closed to reconnect.
+        with self.mutex:
+            for sensor in sensors:
+                if self.sessions.pop(sensor, None) is None:
+                    continue
+                if not sensor.isHealthy():
+                    logger.warning(
+                        f"Sensor {sensor.getName()} session is not healthy. Reconnecting..."
+                    )
+                    sensor.disconnect()
+
+    def checkSessions(self) -> None:
+        now = time.monotonic()
+        with self.mutex:
+            for sensor, released in list(self.sessions.items()):
+                if now - released < self.idle_timeout_s and sensor.isHealthy():
+                    continue
+                logger.debug(f"Closing idle session of sensor {sensor.getName()}")
+                sensor.disconnect()
+                del self.sessions[sensor]
+
+    def _checkProcess(self) -> None:
+        while not self.check_stop.wait(self.check_interval_s):
+            self.checkSessions()
+
+    def close(self) -> None:
+        self.check_stop.set()
+        with self.mutex:
+            [sensor.disconnect() for sensor in self.sessions]
+            self.sessions.clear()
+
+    def getSize(self) -> int:
+        return len(self.sessions)
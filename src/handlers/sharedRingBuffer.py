@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+from multiprocessing import shared_memory
+
+
+# Ring of timestamped rows in shared memory, with one writer and one reader process.
+# Layout: int64 written rows counter, int64 timestamps[capacity] and
+# dtype values[capacity, width]. The counter is increased after each row is written,
+# so the reader only copies complete rows.
+class SharedRingBuffer:
+    def __init__(
+        self,
+        width: int,
+        capacity: int,
+        dtype: np.dtype = np.float64,
+        name: str = None,
+    ) -> None:
+        self.width: int = width
+        self.capacity: int = capacity
+        self.dtype: np.dtype = np.dtype(dtype)
+        size = 8 + capacity * 8 + capacity * width * self.dtype.itemsize
+        # Creates the shared memory block, or attaches to an existing one by name
+        self.owner: bool = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.counter = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self.times = np.ndarray(
+            (capacity,), dtype=np.int64, buffer=self.shm.buf, offset=8
+        )
+        self.values = np.ndarray(
+            (capacity, width),
+            dtype=self.dtype,
+            buffer=self.shm.buf,
+            offset=8 + capacity * 8,
+        )
+        if self.owner:
+            self.counter[0] = 0
+        self.read_count: int = 0
+
+    def getName(self) -> str:
+        return self.shm.name
+
+    # Writer methods
+
+    def getRow(self) -> np.ndarray:
+        # Row to fill before calling commit(), so no temporary row is needed
+        return self.values[self.counter[0] % self.capacity]
+
+    def commit(self, timestamp: int) -> None:
+        self.times[self.counter[0] % self.capacity] = timestamp
+        self.counter[0] += 1
+
+    # Reader methods
+
+    def read(self) -> tuple[np.ndarray, np.ndarray, int]:
+        # Copies the rows written since the last read, with the amount of rows lost
+        # because the reader fell more than the capacity behind the writer
+        written = int(self.counter[0])
+        start = max(self.read_count, written - self.capacity)
+        rows = np.arange(start, written) % self.capacity
+        times = self.times[rows]
+        values = self.values[rows]
+        # Rows overwritten by the writer while they were copied
+        overwritten = min(
+            max(int(self.counter[0]) - self.capacity - start, 0), len(rows)
+        )
+        lost = start - self.read_count + overwritten
+        self.read_count = written
+        return times[overwritten:], values[overwritten:], lost
+
+    def close(self) -> None:
+        del self.counter, self.times, self.values
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import time
+import numpy as np
+
+
+# Tick timestamps in ns since the epoch. The wall clock is only read when the clock
+# starts, then the monotonic perf counter is used, so timestamps keep its resolution
+# and do not jump with wall clock corrections.
+class TickClock:
+    def __init__(self) -> None:
+        self.epoch_ns: int = time.time_ns()
+        self.start_ns: int = time.perf_counter_ns()
+
+    def start(self) -> None:
+        self.epoch_ns = time.time_ns()
+        self.start_ns = time.perf_counter_ns()
+
+    def now(self) -> int:
+        return self.epoch_ns + time.perf_counter_ns() - self.start_ns
+
+    def fromCounter(self, counter_ns):
+        # Perf counter times, as driver events are stamped, on the clock timeline
+        return counter_ns + (self.epoch_ns - self.start_ns)
+
+
+# Running statistics of the tick intervals, updated in O(1) per tick (Welford), so
+# they can be read live during a test of any duration.
+class TickStats:
+    def __init__(self, interval_ns: int = 0) -> None:
+        self.reset(interval_ns)
+
+    def reset(self, interval_ns: int = 0) -> None:
+        self.interval_ns: int = interval_ns
+        self.last_time: int = None
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.max_overrun: int = 0
+
+    def add(self, timestamp: int) -> None:
+        if self.last_time is not None:
+            tick = timestamp - self.last_time
+            self.count += 1
+            delta = tick - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (tick - self.mean)
+            self.max_overrun = max(self.max_overrun, tick - self.interval_ns)
+        self.last_time = timestamp
+
+    def extend(self, timestamps: np.ndarray) -> None:
+        # Merges the statistics of a batch of ticks (Chan et al.)
+        if len(timestamps) == 0:
+            return
+        if self.last_time is not None:
+            timestamps = np.concatenate([[self.last_time], timestamps])
+        self.last_time = int(timestamps[-1])
+        ticks = np.diff(timestamps).astype(np.float64)
+        if len(ticks) == 0:
+            return
+        amount = len(ticks)
+        count = self.count + amount
+        mean = float(ticks.mean())
+        delta = mean - self.mean
+        spread = float(((ticks - mean) ** 2).sum())
+        self.m2 += spread + delta**2 * self.count * amount / count
+        self.mean += delta * amount / count
+        self.count = count
+        self.max_overrun = max(self.max_overrun, int(ticks.max()) - self.interval_ns)
+
+    def getStats(self) -> dict:
+        # Tick intervals in ms: mean, standard deviation and maximum delay over the interval
+        return {
+            "ticks": self.count,
+            "mean_ms": self.mean / 1e6,
+            "std_ms": float(np.sqrt(self.m2 / self.count) / 1e6) if self.count else 0.0,
+            "max_overrun_ms": max(self.max_overrun, 0) / 1e6,
+        }
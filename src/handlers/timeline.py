@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from src.handlers.sensor import Sensor
+from src.handlers.sampleBuffer import SampleBuffer
+from src.handlers.tickClock import TickStats
+from src.handlers.recordingFile import RecordingWriter
+
+
+# Ticks of the sensors of a group sampled at its own interval, separate from the
+# test ticks. Only the thread sampling the timeline registers and flushes it.
+class Timeline:
+    def __init__(self, id: str, interval_ms: float, sensors: dict[str, Sensor]):
+        self.id: str = id
+        self.interval_ms: float = interval_ms
+        self.sensors: dict[str, Sensor] = sensors
+        self.times: SampleBuffer = SampleBuffer(dtype=np.int64)
+        self.tick_stats: TickStats = TickStats(round(interval_ms * 1e6))
+        self.size: int = 0
+        self.checkpoint_time: int = 0
+        # Ticks already flushed, and odd flush sequence while flushing
+        self.flushed_size: int = 0
+        self.flush_seq: int = 0
+
+    def register(self, timestamp: int) -> None:
+        if self.size == 0:
+            self.checkpoint_time = timestamp
+        self.tick_stats.add(timestamp)
+        self.times.append(timestamp)
+        for sensor in self.sensors.values():
+            sensor.registerValue()
+        self.size += 1
+
+    def flush(self, recording: RecordingWriter, stream: str) -> None:
+        if len(self.times) == 0:
+            return
+        self.flush_seq += 1
+        times, self.times = self.times, SampleBuffer(dtype=np.int64)
+        recording.write(
+            stream,
+            times.getValues(),
+            [sensor.swapValues().getValues() for sensor in self.sensors.values()],
+        )
+        self.flushed_size += len(times)
+        self.flush_seq += 1
+
+    def discard(self, amount: int) -> None:
+        # Drops the oldest ticks not flushed, skipped by live readers as flushed ones
+        amount = min(amount, len(self.times))
+        self.flush_seq += 1
+        self.times.discard(amount)
+        for sensor in self.sensors.values():
+            sensor.values.discard(amount)
+        self.flushed_size += amount
+        self.flush_seq += 1
+
+    def getNewValues(self, start: int) -> tuple[int, np.ndarray, dict[str, np.ndarray]]:
+        # Same as the test ticks: values since the start tick, skipping flushed ones
+        flush_seq = self.flush_seq
+        if flush_seq % 2 == 0:
+            flushed_size = self.flushed_size
+            times = self.times
+            buffers = {
+                sensor_id: sensor.values for sensor_id, sensor in self.sensors.items()
+            }
+            first = max(start - flushed_size, 0)
+            size = min([len(times)] + [len(buffer) for buffer in buffers.values()])
+            new_times = times.getValues()[first:size].copy()
+            new_values = {
+                sensor_id: buffer.getValues()[first:size].copy()
+                for sensor_id, buffer in buffers.items()
+            }
+            if flush_seq == self.flush_seq:
+                return flushed_size + first, new_times, new_values
+        return start, np.empty(0, dtype=np.int64), {}
+
+    def getTimes(self) -> np.ndarray:
+        return self.times.getValues()
+
+    def getInfo(self) -> dict:
+        return {
+            "id": self.id,
+            "interval_ms": self.interval_ms,
+            "sensors": list(self.sensors),
+        }
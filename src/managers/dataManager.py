@@ -4,28 +4,147 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from functools import partial
+from typing import Callable
+
 from scipy.spatial.transform import Rotation
 from scipy.signal import butter, filtfilt
 
 from src.figures.generalFigure import GeneralFigure
 from src.figures.platformFigures import PlatformForcesFigure, PlatformCOPFigure
 from src.handlers import SensorGroup, Sensor
+from src.handlers.resampler import getCommonGrid, resample, slerp
+from src.handlers.recordingFile import (
+    RecordingReader,
+    TICKS_STREAM,
+    eventsStream,
+    timelineStream,
+)
 
 from src.enums.sensorTypes import SGTypes, STypes
 from src.enums.sensorStatus import SGStatus
+from src.enums.alignmentTypes import AlignmentTypes
 
 from loguru import logger
 
 
+# Rows of the CSV files built at once
+CSV_CHUNK_ROWS = 100000
+
+
+# Column readers of a row range. Recorded values are read from the mapped file.
+def sliceValues(
+    values: np.ndarray, column: int, start: int, stop: int = None
+) -> np.ndarray:
+    values = values[start:stop]
+    return values if column is None else values[:, column]
+
+
+def readRecording(
+    recording: RecordingReader,
+    stream: str,
+    sensor_id: str,
+    column: int,
+    start: int,
+    stop: int = None,
+) -> np.ndarray:
+    values = recording.getChannel(stream, sensor_id, start, stop)
+    return values if column is None else values[:, column]
+
+
+def calibrateValues(
+    read: Callable, slope: float, intercept: float, start: int, stop: int = None
+) -> np.ndarray:
+    return read(start, stop) * slope + intercept
+
+
+# Values of the sensors recorded on one timeline, with their timestamps. Values are
+# only read for the requested rows, and filtered values are computed on first use.
+class DataBlock:
+    def __init__(
+        self, name: str, time_list: np.ndarray, interval_ms: float = None
+    ) -> None:
+        self.name: str = name
+        self.interval_ms: float = interval_ms
+        # Tick timestamps are in ns, shown in ms
+        self.time_list: np.ndarray = np.asarray(time_list, dtype=np.int64)
+        # Raw and calibrated column readers, and the filtered columns already used
+        self.raw_columns: dict[str, Callable] = {}
+        self.calibrated_columns: dict[str, Callable] = {}
+        self.filtered_columns: dict[str, np.ndarray] = {}
+        # Quaternion columns of each IMU
+        self.quaternions: list[list[str]] = []
+
+    def addColumn(self, name: str, read_raw: Callable, read_calibrated: Callable):
+        self.raw_columns[name] = read_raw
+        self.calibrated_columns[name] = read_calibrated
+
+    def getColumns(self) -> list[str]:
+        return list(self.raw_columns)
+
+    def isEmpty(self) -> bool:
+        return not self.raw_columns
+
+    def getRaw(
+        self, columns: list[str] = None, start: int = 0, stop: int = None
+    ) -> pd.DataFrame:
+        return self._read(self.raw_columns, columns, start, stop)
+
+    def getCalibrated(
+        self, columns: list[str] = None, start: int = 0, stop: int = None
+    ) -> pd.DataFrame:
+        return self._read(self.calibrated_columns, columns, start, stop)
+
+    def _read(
+        self, readers: dict[str, Callable], columns: list[str], start: int, stop: int
+    ) -> pd.DataFrame:
+        stop = self.getSize() if stop is None else min(stop, self.getSize())
+        return pd.DataFrame(
+            {
+                column: readers[column](start, stop)
+                for column in (self.getColumns() if columns is None else columns)
+            },
+            index=pd.RangeIndex(start, max(start, stop)),
+        )
+
+    def getTimestamps(self, start: int = 0, stop: int = None) -> np.ndarray:
+        return self.time_list[start:stop] / 1e6
+
+    def getTimeIncrements(self) -> np.ndarray:
+        return (self.time_list - self.time_list[:1]) / 1e9
+
+    def getSize(self) -> int:
+        return len(self.time_list)
+
+    def getInterval(self) -> float:
+        # Median time between values when the block has no fixed interval
+        if self.interval_ms is not None or len(self.time_list) < 2:
+            return self.interval_ms
+        return float(np.median(np.diff(self.time_list))) / 1e6
+
+
 class DataManager:
     def __init__(self):
-        # Time
-        self.timestamp_list: list = []
-        self.timeincr_list: list = []
-        # Data frames
-        self.df_raw: pd.DataFrame = pd.DataFrame()
-        self.df_calibrated: pd.DataFrame = pd.DataFrame()
-        self.df_filtered: pd.DataFrame = pd.DataFrame()
+        # Data blocks of the test ticks and of each group timeline, by stream name
+        self.blocks: dict[str, DataBlock] = {TICKS_STREAM: DataBlock("", [])}
+        # Data block of each figure option
+        self.figure_blocks: dict[str, str] = {}
+        # Loaded blocks and figure blocks, before being aligned
+        self.source_blocks: dict[str, DataBlock] = dict(self.blocks)
+        self.source_figure_blocks: dict[str, str] = {}
+        # Alignment of every block to a common time grid. Without an interval, the
+        # grid uses the shortest block interval.
+        self.alignment: AlignmentTypes = AlignmentTypes.NONE
+        self.alignment_interval_ms: float = None
+        # Source of the loaded data: a recording file or the sensors in memory
+        self.recording: RecordingReader = None
+        self.sensors: dict[str, Sensor] = {}
+        # Native rate data of sensors with captured events
+        self.native_blocks: dict[str, DataBlock] = {}
+        # Butterworth filter of the filtered values (sampling rate, cutoff and order)
+        self.butter_params: tuple[float, float, int] = (100, 5, 6)
+        # Changes whenever the loaded, aligned or filtered values change
+        self.data_version: int = 0
         # Data structures for figures
         self.sensor_figure_structs: dict[str, tuple[list[str], str]] = {}
         self.platform_figure_structs: dict[
@@ -43,132 +162,327 @@ class DataManager:
         self.platform_g_matrix: dict[str, np.array] = {}
 
     def clearDataFrames(self) -> None:
-        self.df_raw: pd.DataFrame = pd.DataFrame()
-        self.df_calibrated: pd.DataFrame = pd.DataFrame()
-        self.df_filtered: pd.DataFrame = pd.DataFrame()
+        self.blocks = {TICKS_STREAM: DataBlock("", [])}
+        self.figure_blocks = {}
+        self.source_blocks = dict(self.blocks)
+        self.source_figure_blocks = {}
+        self.native_blocks.clear()
+        self.sensor_figure_structs.clear()
+        self.platform_figure_structs.clear()
+        self.platform_g_matrix.clear()
+
+    # Setters
+
+    def setAlignment(self, mode: AlignmentTypes, interval_ms: float = None) -> None:
+        self.alignment = mode
+        self.alignment_interval_ms = interval_ms
+        self.alignBlocks()
 
     # Data load methods
 
-    def loadData(self, time_list: list, sensor_groups: list[SensorGroup]) -> None:
-        self.clearDataFrames()
-        self.timestamp_list = time_list
-        self.timeincr_list = [(t - time_list[0]) / 1000 for t in time_list]
+    # Loads the values recorded in memory by the sensors of each group. Groups with
+    # their own interval are loaded with the times of their timeline.
+    def loadData(
+        self,
+        time_list: np.ndarray,
+        sensor_groups: list[SensorGroup],
+        timeline_times: dict[str, np.ndarray] = None,
+    ) -> None:
+        self.recording = None
+        self.sensors = {}
+        groups_info = []
         for group in sensor_groups:
             # Check group status
             if not group.getRead():
                 continue
             if group.getStatus() == SGStatus.ERROR:
                 continue
+            groups_info.append(group.getInfo(only_available=True))
+            self.sensors.update(group.getSensors(only_available=True))
+        sensors_info = {
+            sensor_id: sensor.getInfo() for sensor_id, sensor in self.sensors.items()
+        }
+        self.loadGroups(time_list, groups_info, sensors_info, timeline_times)
+
+    # Loads a recording file. Sensor values are read from the mapped file on demand.
+    def loadRecording(self, path: str) -> bool:
+        try:
+            recording = RecordingReader(path)
+        except (OSError, ValueError) as error:
+            logger.error(f"Could not load recording {path}: {error}")
+            return False
+        if recording.getSize(TICKS_STREAM) == 0:
+            logger.warning(f"Recording {path} has no values.")
+            return False
+        self.recording = recording
+        self.sensors = {}
+        timeline_times = {
+            group["id"]: recording.getTimes(timelineStream(group["id"]))
+            for group in recording.getGroups()
+            if timelineStream(group["id"]) in recording.getStreams()
+        }
+        sensors_info = {
+            channel["id"]: channel
+            for stream in [TICKS_STREAM]
+            + [timelineStream(group_id) for group_id in timeline_times]
+            for channel in recording.getChannels(stream)
+        }
+        time_list = recording.getTimes(TICKS_STREAM)
+        self.loadGroups(time_list, recording.getGroups(), sensors_info, timeline_times)
+        logger.info(f"Loaded recording {path} with {len(time_list)} values.")
+        return True
+
+    def loadGroups(
+        self,
+        time_list: np.ndarray,
+        groups_info: list[dict],
+        sensors_info: dict[str, dict],
+        timeline_times: dict[str, np.ndarray] = None,
+    ) -> None:
+        self.clearDataFrames()
+        timeline_times = timeline_times or {}
+        self.blocks[TICKS_STREAM] = DataBlock("Record interval", time_list)
+        for group in groups_info:
+            # Groups sampled at their own interval are kept in a separate block
+            block_id = TICKS_STREAM
+            if group["id"] in timeline_times:
+                block_id = timelineStream(group["id"])
+                interval_ms = group.get("interval_ms")
+                self.blocks[block_id] = DataBlock(
+                    f"{group['name']} ({interval_ms} ms)",
+                    timeline_times[group["id"]],
+                    interval_ms,
+                )
+            block = self.blocks[block_id]
+            group_sensors = [
+                sensors_info[sensor_id]
+                for sensor_id in group["sensors"]
+                if sensor_id in sensors_info
+            ]
             # Check if group is a platform for specific plots
-            if group.getType() == SGTypes.GROUP_PLATFORM:
-                valid_sensors = self.getPlatformGroupValidSensors(group)
+            if group["type"] == SGTypes.GROUP_PLATFORM.name:
+                valid_sensors = self.getPlatformGroupValidSensors(group_sensors)
                 if any(len(sensor_forces) > 0 for sensor_forces in valid_sensors):
-                    self.platform_figure_structs[group.getName() + "_FORCES"] = (
+                    self.platform_figure_structs[group["name"] + "_FORCES"] = (
                         valid_sensors
                     )
+                    self.figure_blocks[group["name"] + "_FORCES"] = block_id
                 # Check it at least two sensors in X,Y,Z axis are available for valid COP
                 if (
                     len(valid_sensors[0]) > 1
                     and len(valid_sensors[1]) > 1
                     and len(valid_sensors[2]) > 1
                 ):
-                    self.platform_figure_structs[group.getName() + "_COP"] = (
-                        valid_sensors
-                    )
-                    self.platform_g_matrix[group.getName() + "_COP"] = np.array(
-                        group.g_matrix
+                    self.platform_figure_structs[group["name"] + "_COP"] = valid_sensors
+                    self.figure_blocks[group["name"] + "_COP"] = block_id
+                    self.platform_g_matrix[group["name"] + "_COP"] = np.array(
+                        group["g_matrix"]
                     )
             # Store available sensor data from group
-            for sensor in group.getSensors(only_available=True).values():
-                if sensor.getType() == STypes.SENSOR_IMU:
-                    values_list = self.getListedData(sensor)
+            for sensor in group_sensors:
+                if sensor["type"] == STypes.SENSOR_IMU.name:
                     for i, suffix in enumerate(
                         self.imu_ang_headers
                         + self.imu_vel_headers
                         + self.imu_acc_headers
                     ):
-                        imu_name = sensor.getName() + "_" + suffix
-                        self.df_raw[imu_name] = values_list[i]
+                        read = self.getSensorReader(sensor, block_id, i)
                         # No need to calibrate IMUs
-                        self.df_calibrated[imu_name] = values_list[i]
+                        block.addColumn(sensor["name"] + "_" + suffix, read, read)
                     # Store imu structures for figures. Could be done inside the previous for loop for better performance.
-                    self.sensor_figure_structs[sensor.getName() + "_ANGLES"] = (
+                    self.sensor_figure_structs[sensor["name"] + "_ANGLES"] = (
                         [
-                            sensor.getName() + "_" + suffix
+                            sensor["name"] + "_" + suffix
                             for suffix in self.imu_ang_headers
                         ],
                         "Angle (deg)",
                     )
-                    self.sensor_figure_structs[sensor.getName() + "_VELOCITIES"] = (
+                    self.sensor_figure_structs[sensor["name"] + "_VELOCITIES"] = (
                         [
-                            sensor.getName() + "_" + suffix
+                            sensor["name"] + "_" + suffix
                             for suffix in self.imu_vel_headers
                         ],
                         "Angular velocity (deg/s)",
                     )
-                    self.sensor_figure_structs[sensor.getName() + "_ACCELERATIONS"] = (
+                    self.sensor_figure_structs[sensor["name"] + "_ACCELERATIONS"] = (
                         [
-                            sensor.getName() + "_" + suffix
+                            sensor["name"] + "_" + suffix
                             for suffix in self.imu_acc_headers
                         ],
                         "Linear acceleration (m/s2)",
                     )
+                    for suffix in ["_ANGLES", "_VELOCITIES", "_ACCELERATIONS"]:
+                        self.figure_blocks[sensor["name"] + suffix] = block_id
+                    block.quaternions.append(
+                        self.sensor_figure_structs[sensor["name"] + "_ANGLES"][0]
+                    )
+                    self.loadNativeData(sensor)
                     continue
-                self.df_raw[sensor.getName()] = sensor.getValues()
-                slope = sensor.getSlope()
-                intercept = sensor.getIntercept()
-                self.df_calibrated[sensor.getName()] = [
-                    value * slope + intercept for value in sensor.getValues()
-                ]
+                read = self.getSensorReader(sensor, block_id)
+                block.addColumn(
+                    sensor["name"],
+                    read,
+                    partial(
+                        calibrateValues, read, sensor["slope"], sensor["intercept"]
+                    ),
+                )
+                self.loadNativeData(sensor)
                 # Store into figure option
                 units = "Force (N)"
-                if sensor.getType() == STypes.SENSOR_ENCODER:
+                if sensor["type"] == STypes.SENSOR_ENCODER.name:
                     units = "Displacement (mm)"
-                self.sensor_figure_structs[sensor.getName()] = (
-                    [sensor.getName()],
+                elif sensor["type"] == STypes.SENSOR_SIM.name:
+                    units = "Simulated value"
+                self.sensor_figure_structs[sensor["name"]] = (
+                    [sensor["name"]],
                     units,
                 )
+                self.figure_blocks[sensor["name"]] = block_id
+        self.source_blocks = self.blocks
+        self.source_figure_blocks = self.figure_blocks
+        self.alignBlocks()
+
+    # Resamples every block to a common uniform time grid, so values of different
+    # groups and rates share the same timestamps. Each block is resampled in one
+    # vectorized pass, with SLERP for IMU quaternions when interpolating.
+    def alignBlocks(self) -> None:
+        self.data_version += 1
+        self.blocks = dict(self.source_blocks)
+        self.figure_blocks = dict(self.source_figure_blocks)
+        if self.alignment == AlignmentTypes.NONE:
+            return
+        blocks = [block for block in self.blocks.values() if not block.isEmpty()]
+        if not blocks:
+            return
+        interval_ms = self.alignment_interval_ms or min(
+            block.getInterval() or np.inf for block in blocks
+        )
+        if not np.isfinite(interval_ms):
+            logger.warning("Data can not be aligned without a data interval.")
+            return
+        grid = getCommonGrid(
+            [block.time_list for block in blocks], round(interval_ms * 1e6)
+        )
+        aligned = DataBlock(f"Aligned ({interval_ms:g} ms)", grid, interval_ms)
+        for block in blocks:
+            # Aligned values are computed, so they are kept in memory
+            raw = resample(block.time_list, block.getRaw(), grid, self.alignment)
+            calibrated = resample(
+                block.time_list, block.getCalibrated(), grid, self.alignment
+            )
+            columns = block.getColumns()
+            if self.alignment == AlignmentTypes.LINEAR:
+                for headers in block.quaternions:
+                    indexes = [columns.index(header) for header in headers]
+                    calibrated[:, indexes] = slerp(
+                        block.time_list, block.getCalibrated(headers), grid
+                    )
+                    raw[:, indexes] = calibrated[:, indexes]
+            for i, column in enumerate(columns):
+                aligned.addColumn(
+                    column,
+                    partial(sliceValues, raw, i),
+                    partial(sliceValues, calibrated, i),
+                )
+            aligned.quaternions += block.quaternions
+        self.blocks = {TICKS_STREAM: aligned}
+        self.figure_blocks = dict.fromkeys(self.figure_blocks, TICKS_STREAM)
+        logger.info(f"Aligned {len(blocks)} data blocks to {len(grid)} values.")
+
+    # Reader of the values of a sensor, or of one of their columns, by row range.
+    # Values in memory are views of the sensor buffers, which are not reused.
+    def getSensorReader(
+        self, sensor: dict, stream: str = TICKS_STREAM, column: int = None
+    ) -> Callable:
+        if self.recording is None:
+            return partial(sliceValues, self.sensors[sensor["id"]].getValues(), column)
+        return partial(readRecording, self.recording, stream, sensor["id"], column)
+
+    # Stores calibrated events captured at the driver data rate, with their timestamps in ms
+    def loadNativeData(self, sensor: dict) -> None:
+        stream = eventsStream(sensor["id"])
+        if self.recording is None:
+            timestamps, values = self.sensors[sensor["id"]].getEvents()
+            read = partial(sliceValues, values)
+        elif stream in self.recording.getStreams():
+            timestamps = self.recording.getTimes(stream)
+            read = partial(readRecording, self.recording, stream, sensor["id"])
+        else:
+            return
+        if len(timestamps) == 0:
+            return
+        block = DataBlock(sensor["name"], timestamps)
+        if sensor["type"] == STypes.SENSOR_IMU.name:
+            # Every IMU observation, with its device timestamp. No need to calibrate IMUs.
+            for i, suffix in enumerate(
+                self.imu_ang_headers + self.imu_vel_headers + self.imu_acc_headers
+            ):
+                column_read = partial(self._readColumn, read, i)
+                block.addColumn(sensor["name"] + "_" + suffix, column_read, column_read)
+        else:
+            column_read = partial(self._readColumn, read, None)
+            block.addColumn(
+                sensor["name"],
+                column_read,
+                partial(
+                    calibrateValues, column_read, sensor["slope"], sensor["intercept"]
+                ),
+            )
+        self.native_blocks[sensor["name"]] = block
 
-    # Transforms values lists into separate variable lists.
-    # Ex: [ti [gx, gy, gz]] -> [gx[ti], gy[ti], gz[ti]]
-    def getListedData(self, sensor: Sensor) -> list[list[float]]:
-        main_list = sensor.getValues()
-        new_main_list: list[list[float]] = [[] for _ in range(len(main_list[0]))]
-        for value_list in main_list:
-            for i, value in enumerate(value_list):
-                new_main_list[i].append(value)
-        return new_main_list
-
-    def isRangedPlot(self, idx1: int, idx2: int) -> bool:
+    def _readColumn(
+        self, read: Callable, column: int, start: int, stop: int = None
+    ) -> np.ndarray:
+        values = read(None, start, stop)
+        if column is None:
+            return values.reshape(len(values), -1)[:, 0]
+        return values[:, column]
+
+    def isRangedPlot(self, idx1: int, idx2: int, block: DataBlock) -> bool:
         if idx1 != 0 or idx2 != 0:
-            if idx2 > idx1 and idx1 >= 0 and idx2 <= len(self.df_filtered):
+            if idx2 > idx1 and idx1 >= 0 and idx2 <= block.getSize():
                 return True
         return False
 
     def getPlatformGroupValidSensors(
-        self, group: SensorGroup
+        self, sensors: list[dict]
     ) -> tuple[list[str], list[str], list[str]]:
         fx_sensors = []
         fy_sensors = []
         fz_sensors = []
-        sensors = group.getSensors(
-            only_available=True, sensor_type=STypes.SENSOR_LOADCELL
-        ).values()
+        sensors = [
+            sensor
+            for sensor in sensors
+            if sensor["type"] == STypes.SENSOR_LOADCELL.name
+        ]
         if not sensors:
             return ([], [], [])
         for sensor in sensors:
-            if any(name in sensor.getName() for name in self.platform_fx_names):
-                fx_sensors.append(sensor.getName())
-            elif any(name in sensor.getName() for name in self.platform_fy_names):
-                fy_sensors.append(sensor.getName())
-            elif any(name in sensor.getName() for name in self.platform_fz_names):
-                fz_sensors.append(sensor.getName())
+            if any(name in sensor["name"] for name in self.platform_fx_names):
+                fx_sensors.append(sensor["name"])
+            elif any(name in sensor["name"] for name in self.platform_fy_names):
+                fy_sensors.append(sensor["name"])
+            elif any(name in sensor["name"] for name in self.platform_fz_names):
+                fz_sensors.append(sensor["name"])
         return (fx_sensors, fy_sensors, fz_sensors)
 
     # Getters
 
-    def getDataSize(self) -> int:
-        return len(self.df_raw)
+    def getDataSize(self, block: str = TICKS_STREAM) -> int:
+        if self.blocks[block].isEmpty():
+            return 0
+        return self.blocks[block].getSize()
+
+    def getAlignment(self) -> AlignmentTypes:
+        return self.alignment
+
+    def getBlockOptions(self) -> dict[str, str]:
+        # Data blocks with values, and their names
+        return {
+            block_id: block.name
+            for block_id, block in self.blocks.items()
+            if not block.isEmpty()
+        }
 
     def getSensorFigureOptions(self) -> list[str]:
         return self.sensor_figure_structs.keys()
@@ -176,42 +490,130 @@ class DataManager:
     def getPlatformFigureOptions(self) -> list[str]:
         return self.platform_figure_structs.keys()
 
-    def getRawDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
-        return self.formatDataframe(self.df_raw.copy(deep=True), idx1, idx2)
+    def getNativeDataOptions(self) -> list[str]:
+        return self.native_blocks.keys()
 
-    def getCalibrateDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
-        return self.formatDataframe(self.df_calibrated.copy(deep=True), idx1, idx2)
+    def getNativeDataSize(self, sensor_name: str) -> int:
+        if sensor_name not in self.native_blocks:
+            return 0
+        return self.native_blocks[sensor_name].getSize()
+
+    def getNativeDataframe(
+        self, sensor_name: str, idx1: int = 0, idx2: int = 0
+    ) -> pd.DataFrame:
+        if sensor_name not in self.native_blocks:
+            return pd.DataFrame()
+        block = self.native_blocks[sensor_name]
+        idx1, idx2 = self.getRange(idx1, idx2, block)
+        return self.formatDataframe(block.getCalibrated(None, idx1, idx2), block)
+
+    def getRawDataframe(
+        self, idx1: int = 0, idx2: int = 0, block: str = TICKS_STREAM
+    ) -> pd.DataFrame:
+        block = self.blocks[block]
+        idx1, idx2 = self.getRange(idx1, idx2, block)
+        return self.formatDataframe(block.getRaw(None, idx1, idx2), block)
 
-    def getFilteredDataframe(self, idx1: int = 0, idx2: int = 0) -> pd.DataFrame:
-        return self.formatDataframe(self.df_filtered.copy(deep=True), idx1, idx2)
+    def getCalibrateDataframe(
+        self, idx1: int = 0, idx2: int = 0, block: str = TICKS_STREAM
+    ) -> pd.DataFrame:
+        block = self.blocks[block]
+        idx1, idx2 = self.getRange(idx1, idx2, block)
+        return self.formatDataframe(block.getCalibrated(None, idx1, idx2), block)
 
-    def formatDataframe(
-        self, df: pd.DataFrame, idx1: int = 0, idx2: int = 0
+    def getFilteredDataframe(
+        self, idx1: int = 0, idx2: int = 0, block: str = TICKS_STREAM
     ) -> pd.DataFrame:
-        timestamp = self.timestamp_list.copy()
-        if self.isRangedPlot(idx1, idx2):
-            timestamp = timestamp[idx1:idx2]
-            df = df.iloc[idx1:idx2]
+        block = self.blocks[block]
+        idx1, idx2 = self.getRange(idx1, idx2, block)
+        return self.formatDataframe(self.getFiltered(block, None, idx1, idx2), block)
+
+    # Rows of a range, or every row when the range is not valid
+    def getRange(self, idx1: int, idx2: int, block: DataBlock) -> tuple[int, int]:
+        idx2 = min(idx2, block.getSize())
+        if self.isRangedPlot(idx1, idx2, block):
+            return idx1, idx2
+        return 0, block.getSize()
+
+    def formatDataframe(self, df: pd.DataFrame, block: DataBlock) -> pd.DataFrame:
         # Format dataframe values to 0.000000e+00
         df = df.map("{:.6e}".format)
         # Add timestamp values
-        df.insert(0, "timestamp", timestamp)
+        df.insert(0, "timestamp", block.getTimestamps(df.index.start, df.index.stop))
         return df
 
+    # CSV file of a dataframe getter, built by chunks of rows so only one chunk is
+    # formatted at once
+    def getCSV(
+        self, get_dataframe: Callable, size: int, chunk_size: int = CSV_CHUNK_ROWS
+    ) -> bytes:
+        chunks = []
+        for idx1 in range(0, max(size, 1), chunk_size):
+            df = get_dataframe(idx1, min(idx1 + chunk_size, size))
+            chunks.append(df.to_csv(index=False, header=idx1 == 0).encode())
+        return b"".join(chunks)
+
     # Data process methods
 
-    # ButterWorth filter
+    # ButterWorth filter. Filtered values are computed on first use, see getFiltered
     def applyButterFilter(self, fs: float = 100, fc: float = 5, order: int = 6):
-        b, a = butter(order, fc / (0.5 * fs), btype="low", analog=False)
-        self.df_filtered = pd.DataFrame()
-        for col in self.df_calibrated:
-            self.df_filtered[col] = filtfilt(b, a, self.df_calibrated[col])
+        self.butter_params = (fs, fc, order)
+        self.data_version += 1
+        for block in list(self.blocks.values()) + list(self.source_blocks.values()):
+            block.filtered_columns.clear()
+
+    # Filtered values of a row range. Each column is filtered whole, since the filter
+    # runs forwards and backwards. Group timelines use their own sampling rate, and a
+    # cutoff frequency below their Nyquist frequency.
+    def getFiltered(
+        self,
+        block: DataBlock,
+        columns: list[str] = None,
+        start: int = 0,
+        stop: int = None,
+    ) -> pd.DataFrame:
+        columns = block.getColumns() if columns is None else columns
+        missing = [col for col in columns if col not in block.filtered_columns]
+        if missing:
+            fs, fc, order = self.butter_params
+            block_fs = fs if block.interval_ms is None else 1000 / block.interval_ms
+            block_fc = min(fc, 0.45 * block_fs)
+            b, a = butter(order, block_fc / (0.5 * block_fs), btype="low", analog=False)
+            df = block.getCalibrated(missing)
+            for col in missing:
+                values = df[col].to_numpy(dtype=np.float64)
+                if len(values) <= 3 * max(len(a), len(b)):
+                    # Too short to be filtered
+                    block.filtered_columns[col] = values
+                    continue
+                block.filtered_columns[col] = self.filterValues(b, a, values)
+        stop = block.getSize() if stop is None else min(stop, block.getSize())
+        return pd.DataFrame(
+            {col: block.filtered_columns[col][start:stop] for col in columns},
+            index=pd.RangeIndex(start, max(start, stop)),
+        )
+
+    def filterValues(self, b: np.ndarray, a: np.ndarray, values: np.ndarray):
+        # Missing values (dropouts) are interpolated for the filter, and are missing
+        # again after it, so a single dropout does not spread over the whole column
+        missing = np.isnan(values)
+        if not missing.any():
+            return filtfilt(b, a, values)
+        if missing.all():
+            return values
+        indexes = np.arange(len(values))
+        filled = np.interp(indexes, indexes[~missing], values[~missing])
+        filtered = filtfilt(b, a, filled)
+        filtered[missing] = np.nan
+        return filtered
 
     # - Sensor specific methods
 
-    def getIMUAngles(self, headers: list[str]) -> pd.DataFrame:
+    def getIMUAngles(
+        self, headers: list[str], block: str = TICKS_STREAM
+    ) -> pd.DataFrame:
         # Get dataframe and sensor name
-        df_quat = self.df_filtered[headers]
+        df_quat = self.getFiltered(self.blocks[block], headers)
         sensor_name = ""
         for suffix in self.imu_ang_headers:
             if headers[0].endswith(f"_{suffix}"):
@@ -302,16 +704,20 @@ class DataManager:
             )
 
         # Build dataframe
-        df = self.df_filtered[self.sensor_figure_structs[sensor_name][0]]
+        block = self.blocks[self.figure_blocks[sensor_name]]
+        df = self.getFiltered(block, self.sensor_figure_structs[sensor_name][0])
         if "_ANGLES" in sensor_name:
             # Extra process to get angle values
-            df = self.getIMUAngles(self.sensor_figure_structs[sensor_name][0])
+            df = self.getIMUAngles(
+                self.sensor_figure_structs[sensor_name][0],
+                self.figure_blocks[sensor_name],
+            )
 
         # Build figure
         figure = GeneralFigure(
             f"Figure of {sensor_name}", self.sensor_figure_structs[sensor_name][1]
         )
-        return figure.getFigure(df, pd.Series(self.timeincr_list))
+        return figure.getFigure(df, pd.Series(block.getTimeIncrements()))
 
     def getPlatformFigure(self, platform_name: str = None) -> go.Figure:
         if platform_name is None:
@@ -326,9 +732,10 @@ class DataManager:
                 pd.Series([0]), pd.Series([0])
             )
         keys_tuple = self.platform_figure_structs[platform_name]
-        df_fx = self.df_filtered[keys_tuple[0]]
-        df_fy = self.df_filtered[keys_tuple[1]]
-        df_fz = self.df_filtered[keys_tuple[2]]
+        block = self.blocks[self.figure_blocks[platform_name]]
+        df_fx = self.getFiltered(block, keys_tuple[0])
+        df_fy = self.getFiltered(block, keys_tuple[1])
+        df_fz = self.getFiltered(block, keys_tuple[2])
         if platform_name.endswith("_COP"):
             [copx, copy] = self.getPlatformCOP(
                 df_fx, df_fy, df_fz, self.platform_g_matrix[platform_name]
@@ -338,4 +745,6 @@ class DataManager:
             return figure.getFigure(copx, copy, ellipx, ellipy, area)
         if platform_name.endswith("_FORCES"):
             figure = PlatformForcesFigure(f"Platform figure {platform_name}")
-            return figure.getFigure(df_fx, df_fy, df_fz, pd.Series(self.timeincr_list))
+            return figure.getFigure(
+                df_fx, df_fy, df_fz, pd.Series(block.getTimeIncrements())
+            )
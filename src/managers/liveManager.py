@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.figures.generalFigure import GeneralFigure
+from src.handlers import SensorGroup, Sensor
+from src.enums.sensorTypes import SGTypes, STypes
+
+from loguru import logger
+from typing import Protocol
+
+
+class ValuesProvider(Protocol):
+    def getNewValues(
+        self, start: int
+    ) -> tuple[int, np.ndarray, dict[str, np.ndarray]]: ...
+
+
+# Live view of the values recorded during a test. Each refresh only reads the new
+# values and decimates them to a fixed amount of points, so refreshing does not
+# depend on the test duration.
+class LiveManager:
+    def __init__(self) -> None:
+        self.refresh_points: int = 200
+        self.window_points: int = 5000
+        # Next tick to read and first test timestamp
+        self.next_tick: int = 0
+        self.first_time: int = None
+        # Live traces of sensors and platform total forces
+        self.sensors: dict[str, Sensor] = {}
+        self.platforms: dict[str, list[str]] = {}
+        self.units: dict[str, str] = {}
+        self.times: list[np.ndarray] = []
+        self.window_size: int = 0
+        self.traces: dict[str, list[np.ndarray]] = {}
+        # Platform loadcell required strings for the total force
+        self.platform_fz_names: list[str] = ["Z_1", "Z_2", "Z_3", "Z_4"]
+
+    def setup(self, sensor_groups: list[SensorGroup]) -> None:
+        self.next_tick = 0
+        self.first_time = None
+        self.sensors.clear()
+        self.platforms.clear()
+        self.units.clear()
+        self.times.clear()
+        self.window_size = 0
+        self.traces.clear()
+        for group in sensor_groups:
+            # Groups with their own interval are not in the test ticks
+            if group.getInterval() is not None:
+                continue
+            group_sensors = group.getSensors(only_available=True)
+            if group.getType() == SGTypes.GROUP_PLATFORM:
+                fz_sensors = [
+                    sensor_id
+                    for sensor_id, sensor in group_sensors.items()
+                    if sensor.getType() == STypes.SENSOR_LOADCELL
+                    and any(name in sensor.getName() for name in self.platform_fz_names)
+                ]
+                if fz_sensors:
+                    platform_name = group.getName() + "_TOTAL_FZ"
+                    self.platforms[platform_name] = fz_sensors
+                    self.units[platform_name] = "Force (N)"
+            for sensor in group_sensors.values():
+                # Only single value sensors have live traces
+                if sensor.getType() == STypes.SENSOR_LOADCELL:
+                    self.units[sensor.getName()] = "Force (N)"
+                elif sensor.getType() == STypes.SENSOR_ENCODER:
+                    self.units[sensor.getName()] = "Displacement (mm)"
+                elif sensor.getType() == STypes.SENSOR_SIM:
+                    self.units[sensor.getName()] = "Simulated value"
+                else:
+                    continue
+                self.sensors[sensor.getID()] = sensor
+        self.traces = {name: [] for name in self.units}
+
+    def update(self, values_provider: ValuesProvider) -> None:
+        start, times, values = values_provider.getNewValues(self.next_tick)
+        if len(times) == 0:
+            return
+        if start > self.next_tick:
+            logger.debug(f"Live view skipped {start - self.next_tick} values.")
+        self.next_tick = start + len(times)
+        if self.first_time is None:
+            self.first_time = int(times[0])
+        # Bucket edges of the decimated values
+        edges = np.arange(len(times))
+        if len(times) > self.refresh_points:
+            edges = np.linspace(0, len(times), self.refresh_points // 2, endpoint=False)
+            edges = edges.astype(np.int64)
+        calibrated = {}
+        missing_values = np.full(len(times), np.nan)
+        for sensor_id, sensor in self.sensors.items():
+            calibrated[sensor_id] = (
+                values.get(sensor_id, missing_values) * sensor.getSlope()
+                + sensor.getIntercept()
+            )
+            self._addValues(sensor.getName(), calibrated[sensor_id], edges)
+        for platform_name, fz_sensors in self.platforms.items():
+            total_fz = np.sum(
+                [calibrated[sensor_id] for sensor_id in fz_sensors], axis=0
+            )
+            self._addValues(platform_name, total_fz, edges)
+        times_s = (times - self.first_time) / 1e9
+        if len(edges) < len(times):
+            # Minimum and maximum values of each bucket, at its first and last times
+            last = np.append(edges[1:], len(times)) - 1
+            times_s = np.column_stack([times_s[edges], times_s[last]]).reshape(-1)
+        self.times.append(times_s)
+        self.window_size += len(times_s)
+        # Drop the oldest values out of the window
+        while self.window_size - len(self.times[0]) >= self.window_points:
+            self.window_size -= len(self.times.pop(0))
+            [trace.pop(0) for trace in self.traces.values()]
+
+    def _addValues(self, name: str, values: np.ndarray, edges: np.ndarray) -> None:
+        if len(edges) < len(values):
+            values = np.column_stack(
+                [np.minimum.reduceat(values, edges), np.maximum.reduceat(values, edges)]
+            ).reshape(-1)
+        self.traces[name].append(values)
+
+    # Getters
+
+    def getOptions(self) -> list[str]:
+        return list(self.traces.keys())
+
+    def getSize(self) -> int:
+        return self.next_tick
+
+    def getFigure(self, name: str = None) -> go.Figure:
+        if name not in self.traces or not self.times:
+            return GeneralFigure("Live figure", "Not specified").getFigure(
+                pd.Series([0]), pd.Series([0])
+            )
+        figure = GeneralFigure(f"Live figure of {name}", self.units[name])
+        return figure.getFigure(
+            pd.Series(np.concatenate(self.traces[name]), name=name),
+            pd.Series(np.concatenate(self.times)),
+        )
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from loguru import logger
+from functools import partial
 from src.handlers.sensorGroup import SensorGroup
 from src.handlers.sensor import Sensor
 from src.handlers import drivers
@@ -16,6 +17,20 @@ sensor_keys = [SParams.NAME, SParams.TYPE, SParams.READ, SParams.CONNECTION_SECT
 loadcell_conn_keys = [SParams.SERIAL, SParams.CHANNEL]
 encoder_conn_keys = [SParams.SERIAL, SParams.CHANNEL]
 taobotics_conn_keys = [SParams.SERIAL]
+simulated_conn_keys = [SParams.SERIAL]
+# Optional simulation section keys of simulated sensors
+simulated_keys = [
+    SParams.WAVEFORM,
+    SParams.AMPLITUDE,
+    SParams.FREQUENCY,
+    SParams.OFFSET,
+    SParams.NOISE,
+    SParams.RATE,
+    SParams.LATENCY,
+    SParams.BURST,
+]
+# Supported sample storage types
+values_dtypes = ["float64", "float32"]
 
 
 class ConfigYAMLHandler(Protocol):
@@ -28,6 +43,7 @@ class SensorManager:
     def __init__(self) -> None:
         self.config_mngr: ConfigYAMLHandler
         self.config_sensors: dict = {}
+        self.values_dtype: str = "float64"
 
         self.sensor_groups: list[SensorGroup] = []
 
@@ -39,6 +55,14 @@ class SensorManager:
         config_groups = self.config_mngr.getConfigValue(
             CfgPaths.SENSOR_GROUPS_SECTION.value, {}
         )
+        self.values_dtype = self.config_mngr.getConfigValue(
+            CfgPaths.RECORD_DTYPE.value, "float64"
+        )
+        if self.values_dtype not in values_dtypes:
+            logger.warning(
+                f"Record dtype {self.values_dtype} is not supported! Using float64."
+            )
+            self.values_dtype = "float64"
         self.clearSensors()
         self.loadSensorGroups(config_groups)
 
@@ -90,6 +114,15 @@ class SensorManager:
         if sensor_group.getSize() == 0:
             logger.error(f"Sensor group {id} is empty. Not loaded.")
             return None
+        # Load the group record interval if provided by config
+        interval_ms = content.get(SGParams.INTERVAL.value)
+        if interval_ms is not None:
+            if isinstance(interval_ms, (int, float)) and interval_ms > 0:
+                sensor_group.setInterval(interval_ms)
+            else:
+                logger.warning(
+                    f"Sensor group {id} data interval is not a positive number! Ignoring"
+                )
         # Load geometric matrix if provided by config
         if content.get(SGParams.G_MATRIX.value) is not None:
             g_matrix: list[list[float]] = content[SGParams.G_MATRIX.value]
@@ -123,7 +156,7 @@ class SensorManager:
             )
             return None
         # Check sensor type required keys and setup
-        sensor = Sensor()
+        sensor = Sensor(dtype=self.values_dtype)
         if content[SParams.TYPE.value] == STypes.SENSOR_LOADCELL.name:
             if not all(
                 key.value in content[SParams.CONNECTION_SECTION.value].keys()
@@ -157,6 +190,31 @@ class SensorManager:
                 return None
             sensor.setup(id, content, drivers.TaoboticsIMU)
             return sensor
+        if content[SParams.TYPE.value] == STypes.SENSOR_SIM.name:
+            if not all(
+                key.value in content[SParams.CONNECTION_SECTION.value].keys()
+                for key in simulated_conn_keys
+            ):
+                logger.warning(
+                    f"Sensor {id} does not have the required simulated connection keys! Not loaded."
+                )
+                return None
+            simulation = content.get(SParams.SIMULATION_SECTION.value) or {}
+            if (
+                simulation.get(SParams.WAVEFORM.value, "sine")
+                not in drivers.simulatedSensor.waveforms
+            ):
+                logger.warning(
+                    f"Sensor {id} does not have a valid simulated waveform! Not loaded."
+                )
+                return None
+            sim_params = {
+                key.value: simulation[key.value]
+                for key in simulated_keys
+                if key.value in simulation
+            }
+            sensor.setup(id, content, partial(drivers.SimulatedSensor, **sim_params))
+            return sensor
         logger.error(
             f"Sensor type {content[SParams.TYPE.value]} is not a sensor type! Not loaded."
         )
@@ -1,59 +1,408 @@
 # -*- coding: utf-8 -*-
 
+import os
+import math
 import time
 import numpy as np
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 
 from src.managers.sensorManager import SensorManager
 from src.handlers.sensorGroup import SensorGroup, Sensor
-from src.enums.sensorTypes import STypes
+from src.handlers.processSampler import ProcessSampler
+from src.handlers.sessionPool import SessionPool
+from src.handlers.sampleBuffer import SampleBuffer
+from src.handlers.timeline import Timeline
+from src.handlers.tickClock import TickClock, TickStats
+from src.handlers.oversampler import Oversampler, FIR_DELAY_INTERVALS
+from src.handlers.readTrace import ReadTrace, getChromeTrace
+from src.handlers.runningMean import RunningMean
+from src.handlers.recordingFile import (
+    RecordingWriter,
+    RECORDING_SUFFIX,
+    TICKS_STREAM,
+    eventsStream,
+    timelineStream,
+)
+from src.enums.sensorTypes import STypes, SGTypes
+from src.enums.sensorStatus import SGStatus
+from src.enums.engineTypes import EngineTypes
+from src.enums.oversamplingTypes import OversamplingTypes
 
 from loguru import logger
 
+# Sensor types tared by the tare service
+TARE_TYPES = [STypes.SENSOR_LOADCELL, STypes.SENSOR_ENCODER, STypes.SENSOR_SIM]
+# Sensor types summed for the platform vertical force of the trigger
+TRIGGER_TYPES = [STypes.SENSOR_LOADCELL, STypes.SENSOR_SIM]
+
 
 class TestManager:
     __test__ = False
 
     def __init__(self) -> None:
         self.available_sensors: dict[str, Sensor] = {}
-        self.test_times: list[int] = []
+        # Sensors sampled on the test ticks. Sensors of groups with their own
+        # interval are sampled on the group timeline instead.
+        self.tick_sensors: dict[str, Sensor] = {}
+        self.timelines: dict[str, Timeline] = {}
+        self.timeline_threads: list[threading.Thread] = []
+        # Tick timestamps in ns since the epoch, from a monotonic clock
+        self.test_times: SampleBuffer = SampleBuffer(dtype=np.int64)
+        self.test_size: int = 0
+        self.test_first_time: int = 0
+        self.test_last_time: int = 0
+        self.tick_clock: TickClock = TickClock()
+        self.tick_stats: TickStats = TickStats()
         self.test_running: bool = False
+        # Auto stop: the engine stops itself at the tick reaching the duration or the
+        # amount of values, 0 for no limit. The test is then finished in the background
+        # and the stop callback runs, so the UI only polls for the finished test.
+        self.stop_duration_ns: int = 0
+        self.stop_size: int = 0
+        self.stop_ticks: int = 0
+        self.stop_callback: Callable[[], None] = None
+        self.stop_reached: bool = False
+        self.finish_thread: threading.Thread = None
+        self.test_finished: threading.Event = threading.Event()
+        # Force trigger: while armed, only the ticks of the pre-trigger period are kept
+        # until the total vertical force of the platforms rises over the threshold.
+        # The test then stops after the post-trigger period, 0 to keep recording.
+        # A threshold of 0 records the whole test.
+        self.trigger_force_n: float = 0
+        self.trigger_pre_ms: float = 500
+        self.trigger_post_ms: float = 2000
+        self.trigger_sensors: list[Sensor] = []
+        self.trigger_indexes: list[int] = []
+        self.trigger_ticks: int = 0
+        self.trigger_post_ticks: int = 0
+        self.trigger_checked: int = 0
+        self.trigger_above: bool = True
+        self.trigger_armed: bool = False
+        self.trigger_time: int = None
+        self.discarded_size: int = 0
+        # Platform loadcells summed for the total vertical force
+        self.platform_fz_names: list[str] = ["Z_1", "Z_2", "Z_3", "Z_4"]
+        self.engine: EngineTypes = EngineTypes.BARRIER
+        self.capture_events: bool = False
+        self.capture_drain_s: float = 1.0
+        self.capture_stop: threading.Event = threading.Event()
+        self.capture_thread: threading.Thread
+        self.captured_sensors: list[Sensor] = []
+        self.sensor_groups: list[SensorGroup] = []
+        # Driver data interval, capped by the record interval. With oversampling the
+        # drivers run at their fastest interval and each record reduces its bin.
+        self.data_interval_ms: int = 8
+        self.oversampling: OversamplingTypes = OversamplingTypes.NONE
+        # Deadline sampler: each tick waits for the sensor reads up to the deadline.
+        # A deadline of 0 uses half of the data interval.
+        self.deadline_ms: float = 0
+        self.deadline_cond: threading.Condition = threading.Condition()
+        self.deadline_run: int = 0
+        self.deadline_tick: int = 0
+        self.deadline_done: int = 0
+        self.deadline_values: list[tuple[int, object]] = []
+        # High-rate capture: ticks are built in batches from the captured events, with
+        # the events that arrived at least the delay before them
+        self.high_rate_drain_s: float = 0.01
+        self.high_rate_delay_s: float = 0.05
+        # Measured by the high-rate capture: lag of each batch after its newest tick,
+        # age of the newest event of each read, events received by each sensor, and
+        # late events, older than the ticks already built when they were read
+        self.high_rate_lags: SampleBuffer = SampleBuffer(dtype=np.int64)
+        self.high_rate_ages: SampleBuffer = SampleBuffer(dtype=np.int64)
+        self.high_rate_events: dict[str, int] = {}
+        self.high_rate_late: dict[str, int] = {}
+        # Optional driver read timings of each sensor
+        self.read_tracing: bool = False
+        self.read_traces: dict[str, ReadTrace] = {}
+        # Sensor sessions kept attached between tests
+        self.keep_connections: bool = False
+        self.session_pool: SessionPool = SessionPool()
+        # Tare service: running mean of the latest values of each tared sensor. It is
+        # fed by the test values, or by the attached sensors when no test is running.
+        self.tare_amount: int = 300
+        self.tare_interval_ms: float = 10
+        self.tare_read_s: float = 0.1
+        # Idle sensors are polled at most this often, whatever the record interval
+        self.tare_idle_s: float = 0.1
+        self.tare_means: dict[str, RunningMean] = {}
+        self.tare_ticks: dict[str, int] = {}
+        self.tare_thread: threading.Thread = None
+        self.tare_stop: threading.Event = threading.Event()
+        self.tare_mutex: threading.Lock = threading.Lock()
+        # Recording file
+        self.recording_directory: str = None
+        self.recording_name: str = ""
+        self.recording_dtype: str = "float64"
+        self.recording_config: dict = {}
+        self.stream_chunk_size: int = 0
+        self.checkpoint_ns: int = 0
+        self.checkpoint_time: int = 0
+        self.recording: RecordingWriter = None
+        self.recording_path: str = None
+        # Ticks already flushed to the recording. The flush sequence is odd while
+        # flushing, so live readers can detect swapped buffers.
+        self.flushed_size: int = 0
+        self.flush_seq: int = 0
+        # Separate process sampler
+        self.process_sampler: ProcessSampler = ProcessSampler()
+        self.process_buffer_s: float = 30.0
+        self.process_read_s: float = 0.1
         self.main_thread: threading.Thread
         self.register_barrier: threading.Barrier
+        self.register_stop: bool = False
         self.threads_executor: ThreadPoolExecutor
 
     # Setters and getters
     def getSensorConnected(self) -> bool:
         return len(self.available_sensors) > 0
 
-    def getTestTimes(self) -> list:
-        return self.test_times
+    def setRecording(
+        self,
+        directory: str = None,
+        name: str = "",
+        stream_chunk_size: int = 0,
+        dtype: str = "float64",
+        config: dict = None,
+        checkpoint_s: float = 0,
+    ) -> None:
+        # Tests are saved as recording files in the directory. None keeps them in memory.
+        # Values are written to disk during the test every stream chunk size values
+        # and every checkpoint interval, so an interrupted test can be recovered.
+        self.recording_directory = directory
+        self.recording_name = name
+        self.stream_chunk_size = max(0, stream_chunk_size)
+        self.checkpoint_ns = max(0, round(checkpoint_s * 1e9))
+        self.recording_dtype = dtype
+        self.recording_config = config or {}
+
+    def setAutoStop(
+        self,
+        duration_s: float = 0,
+        size: int = 0,
+        callback: Callable[[], None] = None,
+    ) -> None:
+        self.stop_duration_ns = max(0, round(duration_s * 1e9))
+        self.stop_size = max(0, size)
+        self.stop_callback = callback
+
+    def setTrigger(
+        self, force_n: float = 0, pre_ms: float = 500, post_ms: float = 2000
+    ) -> None:
+        self.trigger_force_n = max(0, force_n)
+        self.trigger_pre_ms = max(0, pre_ms)
+        self.trigger_post_ms = max(0, post_ms)
+
+    def isTriggerArmed(self) -> bool:
+        return self.trigger_armed
+
+    def setTareWindow(self, tare_amount: int, interval_ms: float) -> None:
+        # Sensors are tared with their latest tare amount values, read every interval
+        # while no test is running
+        self.tare_amount = tare_amount
+        self.tare_interval_ms = interval_ms
+        self._resizeTareMeans(self.tare_means)
+
+    def getTareWindow(self) -> int:
+        # Values of the tare time span: every test value, or the idle reads, which
+        # are polled less often than the interval
+        if self.test_running:
+            return self.tare_amount
+        interval_s = self.tare_interval_ms / 1000
+        period_s = max(interval_s, self.tare_idle_s)
+        return max(1, round(self.tare_amount * interval_s / period_s))
+
+    def getTareReady(self) -> bool:
+        return any(running_mean.getCount() for running_mean in self.tare_means.values())
+
+    def setIdleTimeout(self, idle_timeout_s: float) -> None:
+        # Kept connections are closed after being idle for this time
+        self.session_pool.setIdleTimeout(idle_timeout_s)
+
+    def setOversampling(self, oversampling: OversamplingTypes) -> None:
+        self.oversampling = oversampling
+
+    def setDeadline(self, deadline_ms: float) -> None:
+        self.deadline_ms = max(0, deadline_ms)
+
+    def getDropouts(self) -> dict[str, int]:
+        # Values of each sensor missed by the deadline sampler or the high-rate capture
+        return {
+            sensor.getName(): sensor.getDropouts()
+            for sensor in self.available_sensors.values()
+        }
+
+    def getHighRateStats(self) -> dict:
+        # Measured quantities of the last high-rate test, empty for other engines
+        if self.engine != EngineTypes.HIGH_RATE or len(self.high_rate_lags) == 0:
+            return {}
+        lags_ms = self.high_rate_lags.getValues() / 1e6
+        ages_ms = self.high_rate_ages.getValues() / 1e6
+        if len(ages_ms) == 0:
+            ages_ms = np.array([np.nan])
+        return {
+            "delay_ms": self.high_rate_delay_s * 1000,
+            "batches": len(lags_ms),
+            "lag_p50_ms": float(np.percentile(lags_ms, 50)),
+            "lag_p99_ms": float(np.percentile(lags_ms, 99)),
+            "lag_max_ms": float(np.max(lags_ms)),
+            "event_age_p99_ms": float(np.percentile(ages_ms, 99)),
+            "event_age_max_ms": float(np.max(ages_ms)),
+            "events": dict(self.high_rate_events),
+            "late_events": dict(self.high_rate_late),
+        }
+
+    def setReadTracing(self, read_tracing: bool) -> None:
+        # Times every driver read of the next tests. Not available with the process engine.
+        self.read_tracing = read_tracing
+
+    def getReadLatencies(self) -> dict[str, dict]:
+        return {
+            self.available_sensors[sensor_id].getName(): trace.getSummary()
+            for sensor_id, trace in self.read_traces.items()
+            if sensor_id in self.available_sensors
+        }
+
+    def getReadTrace(self) -> dict:
+        # Chrome trace / Perfetto JSON of the latest driver reads of the last test
+        return getChromeTrace(
+            {
+                self.available_sensors[sensor_id].getName(): trace
+                for sensor_id, trace in self.read_traces.items()
+                if sensor_id in self.available_sensors
+            },
+            self.tick_clock.start_ns,
+        )
+
+    def getTestTimes(self) -> np.ndarray:
+        return self.test_times.getValues()
+
+    def getTestSize(self) -> int:
+        # Ticks kept, without the ones dropped before the trigger
+        return self.test_size - self.discarded_size
+
+    def getTestDuration(self) -> float:
+        return (self.test_last_time - self.test_first_time) / 1e9
+
+    def isTestFinished(self) -> bool:
+        # Auto stopped test finished, with its stop callback done
+        return self.test_finished.is_set()
+
+    def getTickStats(self) -> dict:
+        return self.tick_stats.getStats()
+
+    def getRecordingPath(self) -> str:
+        return self.recording_path
+
+    def getTimelines(self) -> dict[str, Timeline]:
+        return self.timelines
+
+    def getTimelineTimes(self) -> dict[str, np.ndarray]:
+        return {
+            group_id: timeline.getTimes()
+            for group_id, timeline in self.timelines.items()
+        }
+
+    def getNewValues(
+        self, start: int, timeline_id: str = None
+    ) -> tuple[int, np.ndarray, dict[str, np.ndarray]]:
+        # Values registered since the start tick, for live views. Returns the first
+        # tick of the values, as the ticks already flushed to disk are skipped.
+        if timeline_id is not None:
+            return self.timelines[timeline_id].getNewValues(start)
+        flush_seq = self.flush_seq
+        if flush_seq % 2 == 0:
+            flushed_size = self.flushed_size
+            times = self.test_times
+            buffers = {
+                sensor_id: sensor.values
+                for sensor_id, sensor in self.tick_sensors.items()
+            }
+            first = max(start - flushed_size, 0)
+            size = min([len(times)] + [len(buffer) for buffer in buffers.values()])
+            new_times = times.getValues()[first:size].copy()
+            new_values = {
+                sensor_id: buffer.getValues()[first:size].copy()
+                for sensor_id, buffer in buffers.items()
+            }
+            if flush_seq == self.flush_seq:
+                return flushed_size + first, new_times, new_values
+        return start, np.empty(0, dtype=np.int64), {}
 
     # Test methods
-    def checkConnection(self, sensor_groups: list[SensorGroup]) -> None:
+    def checkConnection(
+        self, sensor_groups: list[SensorGroup], keep_open: bool = False
+    ) -> None:
+        # With keep open, sensor handles stay attached until the test starts
         if not sensor_groups:
             return
         self.available_sensors.clear()
-        for group in sensor_groups:
+        self.sensor_groups = sensor_groups
+        self.keep_connections = keep_open
+        self.session_pool.acquire(
+            [
+                sensor
+                for group in sensor_groups
+                for sensor in group.getSensors().values()
+            ]
+        )
+        # Groups are checked concurrently, as each attachment may wait seconds
+        with ThreadPoolExecutor(max_workers=len(sensor_groups)) as executor:
+            results = list(
+                executor.map(
+                    lambda group: group.checkConnections(keep_open), sensor_groups
+                )
+            )
+        for group, available in zip(sensor_groups, results):
             # Only add available sensors to the class
-            if group.checkConnections():
+            if available:
                 self.available_sensors.update(group.getSensors(only_available=True))
+        if keep_open:
+            self.session_pool.release(list(self.available_sensors.values()))
+        self._startTareService()
 
     def _registerData(self, sensor: Sensor) -> None:
-        while self.test_running:
+        # Runs until the last barrier pass, after the value of the last tick
+        while True:
             self.register_barrier.wait()
+            if self.register_stop:
+                return
             sensor.registerValue()
 
+    def _registerBarrierTime(self) -> None:
+        # The last barrier pass only releases the sensor threads, without a tick
+        if not self.register_stop:
+            self._registerTime()
+
     def _registerTime(self) -> None:
-        self.test_times.append(round(time.time() * 1000))
+        # Called when no sensor is reading, so recorded chunks can be flushed here
+        timestamp = self.tick_clock.now()
+        self.tick_stats.add(timestamp)
+        if self.trigger_armed:
+            self._checkTrigger()
+        if self.test_size == 0:
+            self.test_first_time = self.checkpoint_time = timestamp
+        if (
+            self.recording is not None
+            and not self.trigger_armed
+            and self._flushRequired(timestamp)
+        ):
+            self._flushRecording()
+            self.checkpoint_time = timestamp
+        self.test_times.append(timestamp)
+        self.test_last_time = timestamp
+        self.test_size += 1
 
     def _registerProcess(self, interval_ms: int) -> None:
-        next_time = time.time() + interval_ms / 1000.0
+        next_time = time.perf_counter() + interval_ms / 1000.0
         while self.test_running:
             # Adjust sleep to remaining time
-            time.sleep(max(0, next_time - time.time()))
+            time.sleep(max(0, next_time - time.perf_counter()))
             next_time += interval_ms / 1000.0
+            if self._stopReached():
+                break
 
             # Register timestamp and set reading event
             try:
@@ -61,46 +410,792 @@ class TestManager:
             except threading.BrokenBarrierError:
                 # May be triggered if main thread is waiting
                 break
+        # Sensor threads reach the last pass once the last tick value is registered.
+        # Aborting the barrier instead could drop the value of a released thread.
+        self.register_stop = True
+        try:
+            self.register_barrier.wait()
+        except threading.BrokenBarrierError:
+            self.register_barrier.abort()
         self.threads_executor.shutdown()
 
-    def testStart(self, interval_ms: int) -> None:
-        logger.info(f"Starting test...")
+    def _samplerProcess(self, interval_ms: int) -> None:
+        # Single thread that snapshots every driver latest value on each tick
+        sensors = list(self.tick_sensors.values())
+        next_time = time.perf_counter() + interval_ms / 1000.0
+        while self.test_running:
+            time.sleep(max(0, next_time - time.perf_counter()))
+            next_time += interval_ms / 1000.0
+            if self._stopReached():
+                break
+
+            self._registerTime()
+            for sensor in sensors:
+                sensor.registerValue()
+
+    def _deadlineRead(self, run: int, index: int, sensor: Sensor) -> None:
+        # Reads the sensor once per tick. A late read skips the ticks that passed,
+        # and a read still late when its test finished is discarded.
+        tick = 0
+        while True:
+            with self.deadline_cond:
+                while self._isDeadlineRun(run) and self.deadline_tick == tick:
+                    self.deadline_cond.wait()
+                # The last tick is still read if the test stopped after it started
+                if self.deadline_run != run or self.deadline_tick == tick:
+                    return
+                tick = self.deadline_tick
+            value = sensor.readValue()
+            with self.deadline_cond:
+                if self.deadline_run != run:
+                    return
+                self.deadline_values[index] = (tick, value)
+                if tick == self.deadline_tick:
+                    self.deadline_done += 1
+                    if self.deadline_done == len(self.deadline_values):
+                        self.deadline_cond.notify_all()
+
+    def _isDeadlineRun(self, run: int) -> bool:
+        return self.test_running and not self.stop_reached and self.deadline_run == run
+
+    def _deadlineProcess(self, interval_ms: int) -> None:
+        # Ticks never wait for a late sensor, its value is recorded as missing
+        sensors = list(self.tick_sensors.values())
+        deadline_s = (self.deadline_ms or interval_ms / 2) / 1000.0
+        next_time = time.perf_counter() + interval_ms / 1000.0
+        while self.test_running:
+            time.sleep(max(0, next_time - time.perf_counter()))
+            next_time += interval_ms / 1000.0
+            if not self.test_running or self._stopReached():
+                # Sensor threads do not read after the test stops
+                break
+
+            # Values are only added by this thread, so recordings can be flushed here
+            self._registerTime()
+            deadline = time.perf_counter() + deadline_s
+            with self.deadline_cond:
+                self.deadline_tick += 1
+                self.deadline_done = 0
+                self.deadline_cond.notify_all()
+                while self.deadline_done < len(sensors):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.deadline_cond.wait(remaining)
+                tick = self.deadline_tick
+                values = list(self.deadline_values)
+            for sensor, (value_tick, value) in zip(sensors, values):
+                if value_tick == tick:
+                    sensor.addValue(value)
+                else:
+                    sensor.addDropout()
+        with self.deadline_cond:
+            self.deadline_cond.notify_all()
+        # Sensor reads still late are not waited for
+        self.threads_executor.shutdown(wait=False)
+
+    def _highRateProcess(self, interval_ms: int) -> None:
+        # Every drain, the ticks up to the delay are added at once. Each tick takes the
+        # latest event of each sensor, and holds the previous one if none is new.
+        # The ticks of the last delay before the test stops are not recorded.
+        sensors = list(self.tick_sensors.values())
+        interval_ns = round(interval_ms * 1e6)
+        delay_ns = round(self.high_rate_delay_s * 1e9)
+        # Events not used yet, the first one being used by the previous tick
+        pending = [
+            (
+                np.array([np.iinfo(np.int64).min], dtype=np.int64),
+                np.full((1, sensor.values.width), np.nan),
+            )
+            for sensor in sensors
+        ]
+        self.high_rate_lags.clear()
+        self.high_rate_ages.clear()
+        self.high_rate_events = {sensor.getID(): 0 for sensor in sensors}
+        self.high_rate_late = {sensor.getID(): 0 for sensor in sensors}
+        # Events up to the last built tick should have been used by the previous batch
+        built_tick = np.iinfo(np.int64).min
+        next_tick = self.tick_clock.now() + interval_ns
+        while self.test_running and not self.stop_reached:
+            time.sleep(self.high_rate_drain_s)
+            now = self.tick_clock.now()
+            last_tick = now - delay_ns
+            if last_tick < next_tick:
+                continue
+            amount = (last_tick - next_tick) // interval_ns + 1
+            times = next_tick + interval_ns * np.arange(amount, dtype=np.int64)
+            next_tick += amount * interval_ns
+            values = []
+            for index, sensor in enumerate(sensors):
+                event_times, event_values = sensor.readBatch(self.tick_clock)
+                if len(event_times):
+                    self.high_rate_events[sensor.getID()] += len(event_times)
+                    self.high_rate_late[sensor.getID()] += int(
+                        np.count_nonzero(event_times <= built_tick)
+                    )
+                    self.high_rate_ages.append(self.tick_clock.now() - event_times[-1])
+                sensor_values, pending[index] = self._holdEvents(
+                    sensor, times, pending[index], event_times, event_values
+                )
+                values.append(sensor_values)
+            self._extendTicks(times, values)
+            self.high_rate_lags.append(self.tick_clock.now() - times[-1])
+            built_tick = int(times[-1])
+
+    def _holdEvents(
+        self,
+        sensor: Sensor,
+        times: np.ndarray,
+        pending: tuple[np.ndarray, np.ndarray],
+        event_times: np.ndarray,
+        event_values: np.ndarray,
+    ) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+        # Latest event of the sensor at each tick, with the events still pending. Ticks
+        # without a new event hold the previous value and count as dropouts.
+        event_times = np.concatenate([pending[0], event_times])
+        event_values = np.concatenate([pending[1], event_values])
+        events = np.searchsorted(event_times, times, side="right") - 1
+        sensor.addDropouts(int(np.count_nonzero(np.diff(events, prepend=0) == 0)))
+        return event_values[events], (
+            event_times[events[-1] :],
+            event_values[events[-1] :],
+        )
+
+    def _extendTicks(self, times: np.ndarray, values: list[np.ndarray]) -> None:
+        # Adds a batch of ticks, with the values of each sensor. While armed, the
+        # batch is split at the trigger, as it sets the auto stop of the next ticks.
+        if self.trigger_armed:
+            index = self._findTrigger([values[i] for i in self.trigger_indexes])
+            if index >= 0:
+                self._limitTicks(
+                    times[: index + 1],
+                    [sensor_values[: index + 1] for sensor_values in values],
+                )
+                if not self.stop_reached:
+                    self._fireTrigger(len(self.test_times) - 1)
+                times = times[index + 1 :]
+                values = [sensor_values[index + 1 :] for sensor_values in values]
+        self._limitTicks(times, values)
+
+    def _limitTicks(self, times: np.ndarray, values: list[np.ndarray]) -> None:
+        # Adds the ticks up to the auto stop
+        size = self._getStopSize(times)
+        stop = size < len(times) and not self.stop_reached
+        if size > 0:
+            self._addTicks(
+                times[:size], [sensor_values[:size] for sensor_values in values]
+            )
+        if stop:
+            self._autoStop()
+
+    def _addTicks(self, times: np.ndarray, values: list[np.ndarray]) -> None:
+        if self.test_size == 0:
+            self.test_first_time = self.checkpoint_time = int(times[0])
+        if (
+            self.recording is not None
+            and not self.trigger_armed
+            and self._flushRequired(int(times[-1]))
+        ):
+            self._flushRecording()
+            self.checkpoint_time = int(times[-1])
+        for sensor, sensor_values in zip(self.tick_sensors.values(), values):
+            sensor.values.extend(sensor_values)
+        self.test_times.extend(times)
+        self.tick_stats.extend(times)
+        self.test_last_time = int(times[-1])
+        self.test_size += len(times)
+        if self.trigger_armed:
+            self._trimTicks()
+
+    def _getStopTicks(self, interval_ms: float, size: int = 0) -> int:
+        # Ticks recorded before the auto stop, 0 for no limit. Ticks are on the
+        # interval grid, so the duration is a whole amount of intervals.
+        limits = [size] if size else []
+        if self.stop_duration_ns:
+            limits.append(math.ceil(self.stop_duration_ns / (interval_ms * 1e6)))
+        return min(limits, default=0)
+
+    def _getStopSize(self, times: np.ndarray) -> int:
+        # Amount of the new ticks recorded before the auto stop
+        if self.stop_reached:
+            return 0
+        if self.stop_ticks:
+            return min(len(times), max(0, self.stop_ticks - self.test_size))
+        return len(times)
+
+    def _stopReached(self) -> bool:
+        # Checked by single tick engines before each tick
+        if self.stop_ticks and self.test_size >= self.stop_ticks:
+            if not self.stop_reached:
+                self._autoStop()
+        return self.stop_reached
+
+    def _autoStop(self) -> None:
+        # The engine stopped at the limit tick, the test is finished in the background
+        self.stop_reached = True
+        logger.info(f"Auto stop after {self.getTestSize()} values.")
+        self.finish_thread = threading.Thread(target=self._finishProcess)
+        self.finish_thread.start()
+
+    def _finishProcess(self) -> None:
+        self.testStop()
+        if self.stop_callback is not None:
+            self.stop_callback()
+        self.test_finished.set()
+
+    def _setupTrigger(self, interval_ms: float) -> None:
+        # Arms the trigger with the vertical loadcells of the platforms on the ticks
+        self.trigger_armed = False
+        self.trigger_time = None
+        self.trigger_above = True
+        self.trigger_checked = self.discarded_size = 0
+        if not self.trigger_force_n:
+            return
+        self.trigger_sensors = [
+            sensor
+            for group in self.sensor_groups
+            if group.getType() == SGTypes.GROUP_PLATFORM and group.getRead()
+            for sensor_id, sensor in group.getSensors(only_available=True).items()
+            if sensor_id in self.tick_sensors
+            and sensor.getType() in TRIGGER_TYPES
+            and any(name in sensor.getName() for name in self.platform_fz_names)
+        ]
+        if not self.trigger_sensors:
+            logger.warning(
+                "There are no platform vertical loadcells on the test ticks to trigger "
+                + "the recording. The whole test is recorded."
+            )
+            return
+        sensors = list(self.tick_sensors.values())
+        self.trigger_indexes = [
+            sensors.index(sensor) for sensor in self.trigger_sensors
+        ]
+        self.trigger_ticks = max(1, math.ceil(self.trigger_pre_ms / interval_ms))
+        self.trigger_post_ticks = math.ceil(self.trigger_post_ms / interval_ms)
+        self.trigger_armed = True
+        logger.info(f"Waiting for a vertical force over {self.trigger_force_n} N...")
+
+    def _findTrigger(self, values: list[np.ndarray]) -> int:
+        # First tick where the total vertical force rises over the threshold, -1 if
+        # there is none. The force has to be below it first, and ticks with missing
+        # values keep the previous state.
+        force = np.sum(
+            [
+                np.asarray(sensor_values, dtype=np.float64).reshape(-1)
+                * sensor.getSlope()
+                + sensor.getIntercept()
+                for sensor, sensor_values in zip(self.trigger_sensors, values)
+            ],
+            axis=0,
+        )
+        valid = np.flatnonzero(~np.isnan(force))
+        if len(valid) == 0:
+            return -1
+        above = force[valid] >= self.trigger_force_n
+        rising = above & ~np.concatenate([[self.trigger_above], above[:-1]])
+        self.trigger_above = bool(above[-1])
+        crossings = np.flatnonzero(rising)
+        return int(valid[crossings[0]]) if len(crossings) else -1
+
+    def _checkTrigger(self) -> None:
+        # Single tick engines check the complete ticks not checked yet
+        size = min(
+            [len(self.test_times)]
+            + [len(sensor.values) for sensor in self.trigger_sensors]
+        )
+        index = self._findTrigger(
+            [
+                sensor.values.getValues()[self.trigger_checked : size]
+                for sensor in self.trigger_sensors
+            ]
+        )
+        if index >= 0:
+            self._fireTrigger(self.trigger_checked + index)
+            return
+        self.trigger_checked = max(self.trigger_checked, size)
+        self._trimTicks()
+
+    def _fireTrigger(self, index: int) -> None:
+        # Only the pre-trigger ticks are kept before the trigger tick, and the test
+        # stops after the post-trigger period
+        self.trigger_time = int(self.test_times.getValues()[index])
+        trigger_tick = self.flushed_size + index
+        self._discardTicks(index - self.trigger_ticks)
+        self.trigger_armed = False
+        if self.trigger_post_ticks:
+            self.stop_ticks = trigger_tick + 1 + self.trigger_post_ticks
+        logger.info(f"Recording triggered at {self.trigger_force_n} N.")
+        if self.recording is not None:
+            self.recording.writeMetadata({"trigger_time": self.trigger_time})
+
+    def _trimTicks(self) -> None:
+        # Before the trigger, the ticks of the pre-trigger period are kept. They are
+        # dropped in blocks, so the kept ticks are not moved at every tick.
+        if len(self.test_times) >= 2 * self.trigger_ticks:
+            self._discardTicks(len(self.test_times) - self.trigger_ticks)
+
+    def _discardTicks(self, amount: int) -> None:
+        # Drops the oldest ticks, skipped by live readers as flushed ones
+        if amount <= 0:
+            return
+        self.flush_seq += 1
+        self.test_times.discard(amount)
+        for sensor in self.tick_sensors.values():
+            sensor.values.discard(amount)
+        self.flushed_size += amount
+        self.discarded_size += amount
+        self.trigger_checked = max(0, self.trigger_checked - amount)
+        self.test_first_time = self.checkpoint_time = int(
+            self.test_times.getValues()[0]
+        )
+        self.flush_seq += 1
+
+    def _setupTimelines(self) -> None:
+        # Groups with their own interval are sampled on a timeline of their sensors
+        self.timelines.clear()
+        self.tick_sensors = dict(self.available_sensors)
+        for group in self.sensor_groups:
+            if (
+                group.getInterval() is None
+                or not group.getRead()
+                or group.getStatus() == SGStatus.ERROR
+            ):
+                continue
+            sensors = {
+                sensor_id: self.tick_sensors.pop(sensor_id)
+                for sensor_id in group.getSensors(only_available=True)
+                if sensor_id in self.tick_sensors
+            }
+            if sensors:
+                self.timelines[group.getID()] = Timeline(
+                    group.getID(), group.getInterval(), sensors
+                )
+
+    def _getSensorInterval(self, sensor_id: str, interval_ms: float) -> float:
+        for timeline in self.timelines.values():
+            if sensor_id in timeline.sensors:
+                return timeline.interval_ms
+        return interval_ms
+
+    def _startTimelines(self) -> None:
+        self.timeline_threads = [
+            threading.Thread(target=self._timelineProcess, args=[timeline])
+            for timeline in self.timelines.values()
+        ]
+        [thread.start() for thread in self.timeline_threads]
+
+    def _timelineProcess(self, timeline: Timeline) -> None:
+        # Single thread sampler of a group timeline, flushed by itself. It stops at the
+        # auto stop duration, or with the test ticks.
+        stream = timelineStream(timeline.id)
+        stop_ticks = self._getStopTicks(timeline.interval_ms)
+        armed = self.trigger_armed
+        pre_ticks = max(1, math.ceil(self.trigger_pre_ms / timeline.interval_ms))
+        next_time = time.perf_counter() + timeline.interval_ms / 1000.0
+        while self.test_running:
+            time.sleep(max(0, next_time - time.perf_counter()))
+            next_time += timeline.interval_ms / 1000.0
+
+            if self.stop_reached or 0 < stop_ticks <= timeline.size:
+                break
+            timestamp = self.tick_clock.now()
+            if armed and not self.trigger_armed:
+                # Triggered: the ticks before the pre-trigger period are dropped
+                armed = False
+                pre_time = self.trigger_time - round(self.trigger_pre_ms * 1e6)
+                timeline.discard(int(np.searchsorted(timeline.getTimes(), pre_time)))
+            if armed:
+                if len(timeline.times) >= 2 * pre_ticks:
+                    timeline.discard(len(timeline.times) - pre_ticks)
+            elif self.recording is not None and self._flushRequired(
+                timestamp, len(timeline.times), timeline.checkpoint_time
+            ):
+                timeline.flush(self.recording, stream)
+                timeline.checkpoint_time = timestamp
+            timeline.register(timestamp)
+
+    def _collectTicks(self) -> None:
+        # Moves the ticks written by the sampler process into the sensor buffers
+        times, values, lost = self.process_sampler.readTicks()
+        if lost:
+            logger.warning(f"{lost} values of the sampler process have been lost.")
+        if len(times) == 0:
+            return
+        self._extendTicks(
+            times,
+            [
+                values[:, self.process_sampler.getColumns(sensor_id)]
+                for sensor_id in self.tick_sensors
+            ],
+        )
+
+    def _collectEvents(self) -> None:
+        for sensor_id, timestamps, values in self.process_sampler.readEvents():
+            if self.recording is None:
+                self.available_sensors[sensor_id].addEvents(timestamps, values)
+                continue
+            self.recording.write(eventsStream(sensor_id), timestamps, [values])
+
+    def _collectProcess(self) -> None:
+        # Only copies the new samples, the sampling loop runs in the sampler process
+        while self.test_running and not self.stop_reached:
+            time.sleep(self.process_read_s)
+            self._collectTicks()
+            self._collectEvents()
+        self.process_sampler.stop()
+        self._collectTicks()
+        self._collectEvents()
+        self.process_sampler.close()
+
+    def _registerEvents(self) -> None:
+        for sensor in self.captured_sensors:
+            if self.recording is None:
+                sensor.registerEvents(self.tick_clock)
+                continue
+            timestamps, values = sensor.readBatch(self.tick_clock)
+            self.recording.write(eventsStream(sensor.getID()), timestamps, [values])
+
+    def _captureProcess(self) -> None:
+        # Periodically move captured driver events into the sensor buffers
+        while not self.capture_stop.wait(self.capture_drain_s):
+            self._registerEvents()
+
+    def _startOversampling(self, interval_ms: int, sensors: list[Sensor]) -> None:
+        # Each record bin is the interval of the sensor timeline
+        oversampled = [
+            sensor
+            for sensor in sensors
+            if sensor.setOversampler(
+                Oversampler(
+                    self.oversampling,
+                    self._getSensorInterval(sensor.getID(), interval_ms),
+                    sensor.values.width,
+                )
+            )
+        ]
+        logger.info(
+            f"Oversampling {len(oversampled)} sensors ({self.oversampling.value.lower()})."
+        )
+
+    def _startCapture(self) -> None:
+        self.captured_sensors = [
+            sensor
+            for sensor in self.available_sensors.values()
+            if sensor.setCapture(True)
+        ]
+        logger.info(
+            f"Capturing native rate events of {len(self.captured_sensors)} sensors."
+        )
+        self.capture_stop.clear()
+        self.capture_thread = threading.Thread(target=self._captureProcess)
+        self.capture_thread.start()
+
+    def _stopCapture(self) -> None:
+        self.capture_stop.set()
+        self.capture_thread.join()
+        self._registerEvents()
+        [sensor.setCapture(False) for sensor in self.captured_sensors]
+
+    # Recording methods
+
+    def _openRecording(self, interval_ms: int, engine: EngineTypes) -> None:
+        self.recording_path = None
+        if self.recording_directory is None:
+            return
+        streams = {
+            TICKS_STREAM: [sensor.getInfo() for sensor in self.tick_sensors.values()]
+        }
+        for group_id, timeline in self.timelines.items():
+            streams[timelineStream(group_id)] = [
+                sensor.getInfo() for sensor in timeline.sensors.values()
+            ]
+        for sensor in self.available_sensors.values():
+            if self.capture_events and sensor.canCapture():
+                streams[eventsStream(sensor.getID())] = [sensor.getInfo()]
+        metadata = {
+            "name": self.recording_name,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "interval_ms": interval_ms,
+            "engine": engine.name,
+            "oversampling": self.oversampling.name,
+            "config": self.recording_config,
+            "groups": [
+                group.getInfo(only_available=True)
+                for group in self.sensor_groups
+                if group.getRead() and group.getStatus() != SGStatus.ERROR
+            ],
+        }
+        if (
+            self.oversampling == OversamplingTypes.FIR
+            and engine != EngineTypes.HIGH_RATE
+        ):
+            # FIR oversampled values are delayed from their tick timestamps
+            metadata["oversampling_delay_ms"] = {
+                sensor_id: FIR_DELAY_INTERVALS
+                * self._getSensorInterval(sensor_id, interval_ms)
+                for sensor_id, sensor in self.available_sensors.items()
+                if sensor.canOversample()
+            }
+        if self.trigger_armed:
+            metadata["trigger"] = {
+                "force_n": self.trigger_force_n,
+                "pre_ms": self.trigger_pre_ms,
+                "post_ms": self.trigger_post_ms,
+            }
+        file_name = time.strftime("%Y%m%d_%H%M%S") + RECORDING_SUFFIX
+        if self.recording_name:
+            file_name = f"{self.recording_name}_{file_name}"
+        path = os.path.join(self.recording_directory, file_name)
+        copy = 1
+        while os.path.exists(path):
+            # Tests started in the same second
+            root, suffix = os.path.splitext(file_name)
+            path = os.path.join(self.recording_directory, f"{root}_{copy}{suffix}")
+            copy += 1
+        self.recording = RecordingWriter()
+        if not self.recording.open(path, streams, self.recording_dtype, metadata):
+            logger.warning("Recording values in memory instead.")
+            self.recording = None
+            return
+        self.recording_path = path
+
+    def _flushRequired(
+        self, timestamp: int, size: int = None, checkpoint_time: int = None
+    ) -> bool:
+        # Defaults to the test ticks not flushed yet and their checkpoint
+        size = len(self.test_times) if size is None else size
+        if checkpoint_time is None:
+            checkpoint_time = self.checkpoint_time
+        if self.stream_chunk_size and size >= self.stream_chunk_size:
+            return True
+        return (
+            self.checkpoint_ns > 0 and timestamp - checkpoint_time >= self.checkpoint_ns
+        )
+
+    def _writeCalibration(self, recording: RecordingWriter) -> None:
+        recording.writeMetadata(
+            {
+                "calibration": {
+                    sensor.getID(): {
+                        "slope": sensor.getSlope(),
+                        "intercept": sensor.getIntercept(),
+                    }
+                    for sensor in self.available_sensors.values()
+                }
+            }
+        )
+
+    def _flushRecording(self) -> None:
+        if len(self.test_times) == 0:
+            return
+        self.flush_seq += 1
+        times, self.test_times = self.test_times, SampleBuffer(dtype=np.int64)
+        self.recording.write(
+            TICKS_STREAM,
+            times.getValues(),
+            [sensor.swapValues().getValues() for sensor in self.tick_sensors.values()],
+        )
+        self.flushed_size += len(times)
+        self.flush_seq += 1
+
+    def _closeRecording(self) -> None:
+        if self.recording is None:
+            return
+        self._flushRecording()
+        for group_id, timeline in self.timelines.items():
+            timeline.flush(self.recording, timelineStream(group_id))
+        self._writeCalibration(self.recording)
+        if self.engine in [EngineTypes.DEADLINE, EngineTypes.HIGH_RATE]:
+            self.recording.writeMetadata(
+                {
+                    "dropouts": {
+                        sensor.getID(): sensor.getDropouts()
+                        for sensor in self.available_sensors.values()
+                    }
+                }
+            )
+        self.recording.close()
+        self.recording = None
+        logger.info(f"Recording saved in {self.recording_path}")
+
+    def testStart(
+        self,
+        interval_ms: int,
+        engine: EngineTypes = EngineTypes.BARRIER,
+        capture_events: bool = False,
+    ) -> None:
+        logger.info(f"Starting test with {engine.value.lower()} engine...")
         if not self.available_sensors:
             logger.warning(
                 "There are no sensors connected! Please check sensor connections first."
             )
             return
         self.test_times.clear()
+        self.tick_clock.start()
+        self.tick_stats.reset(interval_ms * 1000000)
+        self.test_size = 0
+        self.test_first_time = self.test_last_time = 0
+        self.flushed_size = self.flush_seq = 0
+        self.tare_ticks = {}
+        self.stop_reached = False
+        self.stop_ticks = self._getStopTicks(interval_ms, self.stop_size)
+        self.test_finished.clear()
         [sensor.clearValues() for sensor in self.available_sensors.values()]
-        # Connect sensors and check if all of them are available
-        connected_sensors: list[Sensor] = []
-        for sensor in self.available_sensors.values():
-            if not sensor.connect():
-                logger.error(
-                    f"Sensor {sensor.getName()} of id {sensor.getID()} is not connected!!"
-                    + " \n The test has been cancelled. Check connections again."
-                )
-                [sensor.disconnect() for sensor in connected_sensors]
+        self._setupTimelines()
+        self._setupTrigger(interval_ms)
+        if not self.tick_sensors and engine not in [
+            EngineTypes.SAMPLER,
+            EngineTypes.HIGH_RATE,
+        ]:
+            # Every sensor is on a group timeline, only the test ticks are kept
+            engine = EngineTypes.SAMPLER
+        self.engine = engine
+        high_rate = engine == EngineTypes.HIGH_RATE
+        oversampling = self.oversampling != OversamplingTypes.NONE
+        if oversampling and high_rate:
+            logger.warning("Sensors are not oversampled by the high-rate engine.")
+            oversampling = False
+        if (oversampling or high_rate) and capture_events:
+            logger.warning(
+                "Native rate events are not captured while oversampling or at high rate."
+            )
+            capture_events = False
+        if self.trigger_armed and capture_events:
+            logger.warning("Native rate events are not captured with a force trigger.")
+            capture_events = False
+        self.capture_events = capture_events
+        self.session_pool.acquire(list(self.available_sensors.values()))
+        # Oversampled and high-rate sensors run at their fastest data interval
+        for sensor_id, sensor in self.available_sensors.items():
+            sensor_interval_ms = self._getSensorInterval(sensor_id, interval_ms)
+            if oversampling or (high_rate and sensor_id in self.tick_sensors):
+                sensor.setDataInterval(0)
+                continue
+            sensor.setDataInterval(min(sensor_interval_ms, self.data_interval_ms))
+        self.read_traces.clear()
+        if engine == EngineTypes.PROCESS:
+            if self.read_tracing:
+                logger.warning("Sensor reads are not traced by the process engine.")
+            # Sensors are connected by the sampler process, so open handles are released
+            [sensor.disconnect() for sensor in self.tick_sensors.values()]
+            timeline_sensors = [
+                sensor
+                for timeline in self.timelines.values()
+                for sensor in timeline.sensors.values()
+            ]
+            if not self._connectSensors(timeline_sensors):
                 return
-            connected_sensors.append(sensor)
-        # Create sensor threads
+            if not self.process_sampler.start(
+                list(self.tick_sensors.values()),
+                interval_ms,
+                self.process_buffer_s,
+                self.recording_dtype,
+                capture_events,
+                self.capture_drain_s,
+                self.oversampling,
+            ):
+                logger.error("The test has been cancelled. Check connections again.")
+                [sensor.disconnect() for sensor in timeline_sensors]
+                return
+            if oversampling:
+                self._startOversampling(interval_ms, timeline_sensors)
+            # Ticks wait in the shared ring until the collect thread starts
+            self._openRecording(interval_ms, engine)
+            self.test_running = True
+            self._runTareService()
+            self.main_thread = threading.Thread(target=self._collectProcess)
+            self.main_thread.start()
+            self._startTimelines()
+            return
+        # Connect all sensors concurrently and check if all of them are available
+        if not self._connectSensors(list(self.available_sensors.values())):
+            return
+        if self.read_tracing and high_rate:
+            logger.warning("Sensor reads are not traced by the high-rate engine.")
+        elif self.read_tracing:
+            for sensor_id, sensor in self.available_sensors.items():
+                self.read_traces[sensor_id] = ReadTrace()
+                sensor.setReadTrace(self.read_traces[sensor_id])
+        if oversampling:
+            self._startOversampling(interval_ms, list(self.available_sensors.values()))
+        self._openRecording(interval_ms, engine)
+        if self.capture_events:
+            self._startCapture()
         self.test_running = True
+        self._runTareService()
+        self._startTimelines()
+        if high_rate:
+            [sensor.setCapture(True) for sensor in self.tick_sensors.values()]
+            self.main_thread = threading.Thread(
+                target=self._highRateProcess, args=[interval_ms]
+            )
+            self.main_thread.start()
+            return
+        if engine == EngineTypes.SAMPLER:
+            self.main_thread = threading.Thread(
+                target=self._samplerProcess, args=[interval_ms]
+            )
+            self.main_thread.start()
+            return
+        if engine == EngineTypes.DEADLINE:
+            sensors = list(self.tick_sensors.values())
+            with self.deadline_cond:
+                self.deadline_run += 1
+                self.deadline_tick = self.deadline_done = 0
+                self.deadline_values = [(0, None)] * len(sensors)
+            self.threads_executor = ThreadPoolExecutor(max_workers=len(sensors))
+            for index, sensor in enumerate(sensors):
+                self.threads_executor.submit(
+                    self._deadlineRead, self.deadline_run, index, sensor
+                )
+            self.main_thread = threading.Thread(
+                target=self._deadlineProcess, args=[interval_ms]
+            )
+            self.main_thread.start()
+            return
+        # Create sensor threads
+        self.register_stop = False
         self.register_barrier = threading.Barrier(
-            parties=len(self.available_sensors) + 1,
-            action=self._registerTime,
+            parties=len(self.tick_sensors) + 1,
+            action=self._registerBarrierTime,
             timeout=3,
         )
-        self.threads_executor = ThreadPoolExecutor(
-            max_workers=len(self.available_sensors)
-        )
-        for sensor in self.available_sensors.values():
+        self.threads_executor = ThreadPoolExecutor(max_workers=len(self.tick_sensors))
+        for sensor in self.tick_sensors.values():
             self.threads_executor.submit(self._registerData, sensor)
         self.main_thread = threading.Thread(
             target=self._registerProcess, args=[interval_ms]
         )
         self.main_thread.start()
 
+    def _connectSensors(self, sensors: list[Sensor]) -> bool:
+        # Sensors are connected concurrently, and all of them are required
+        if not sensors:
+            return True
+        with ThreadPoolExecutor(max_workers=len(sensors)) as executor:
+            results = list(executor.map(lambda sensor: sensor.connect(), sensors))
+        if all(results):
+            return True
+        for sensor, connected in zip(sensors, results):
+            if connected:
+                sensor.disconnect()
+                continue
+            logger.error(
+                f"Sensor {sensor.getName()} of id {sensor.getID()} is not connected!!"
+                + " \n The test has been cancelled. Check connections again."
+            )
+        return False
+
     def testStop(self) -> None:
+        finish_thread = self.finish_thread
+        if (
+            finish_thread is not None
+            and finish_thread is not threading.current_thread()
+            and finish_thread.is_alive()
+        ):
+            # Already being finished after the auto stop
+            finish_thread.join()
+            return
         if not self.test_running:
             logger.warning(
                 "No test is running but stop request has been called!"
@@ -108,51 +1203,152 @@ class TestManager:
             )
         self.test_running = False
         self.main_thread.join()
+        [thread.join() for thread in self.timeline_threads]
+        if self.trigger_armed:
+            logger.warning("The force trigger was not reached before the test stopped.")
+            self.trigger_armed = False
+        if self.engine == EngineTypes.HIGH_RATE:
+            [sensor.setCapture(False) for sensor in self.tick_sensors.values()]
+        if self.capture_events and self.engine != EngineTypes.PROCESS:
+            self._stopCapture()
+        self._closeRecording()
+        for sensor in self.available_sensors.values():
+            sensor.setReadTrace(None)
+            if sensor.oversampler is not None:
+                sensor.setOversampler(None)
         logger.info(f"Test finished")
-        [sensor.disconnect() for sensor in self.available_sensors.values()]
+        if self.keep_connections and self.engine != EngineTypes.PROCESS:
+            # Sessions stay attached for the next test
+            self.session_pool.release(list(self.available_sensors.values()))
+        else:
+            self._stopTareService()
+            [sensor.disconnect() for sensor in self.available_sensors.values()]
         logger.debug("Recorded values size:")
-        logger.debug(len(self.test_times))
+        logger.debug(
+            [self.test_size] + [timeline.size for timeline in self.timelines.values()]
+        )
         logger.debug(
             [len(sensor.getValues()) for sensor in self.available_sensors.values()]
         )
+        if self.engine in [EngineTypes.DEADLINE, EngineTypes.HIGH_RATE]:
+            dropouts = {
+                name: count for name, count in self.getDropouts().items() if count
+            }
+            if dropouts:
+                logger.warning(f"Sensor values missed during the test: {dropouts}")
+        if self.capture_events:
+            logger.debug("Captured events size:")
+            logger.debug(
+                [
+                    len(sensor.getEvents()[0])
+                    for sensor in self.available_sensors.values()
+                ]
+            )
 
     # Tare methods
 
-    def _tareProcess(
-        self, sensor_manager: SensorManager, last_values: int, waiting_time: float
-    ) -> None:
-        logger.info(
-            f"Starting sensor tare. Reading sensors for {waiting_time:.2f} seconds..."
+    def _startTareService(self) -> None:
+        self.tare_means = {
+            sensor_id: RunningMean(self.getTareWindow())
+            for sensor_id, sensor in self.available_sensors.items()
+            if sensor.getType() in TARE_TYPES
+        }
+        self.tare_ticks = {}
+        self._runTareService()
+
+    def _runTareService(self) -> None:
+        with self.tare_mutex:
+            if not self.tare_means or not (self.test_running or self._tareAttached()):
+                self.tare_stop.set()
+                return
+            if self.tare_thread is not None and self.tare_thread.is_alive():
+                if not self.tare_stop.is_set():
+                    return
+            self.tare_stop.clear()
+            self.tare_thread = threading.Thread(target=self._tareProcess, daemon=True)
+            self.tare_thread.start()
+
+    def _stopTareService(self) -> None:
+        # The tare thread is stopped once its sensors are released. It is not waited
+        # for, as it may be blocked on the read of a stalled driver.
+        with self.tare_mutex:
+            self.tare_stop.set()
+
+    def _tareAttached(self) -> bool:
+        return any(
+            self.available_sensors[sensor_id].connected
+            for sensor_id in self.tare_means
+            if sensor_id in self.available_sensors
         )
-        # Wait to get the required values
-        time.sleep(waiting_time)
+
+    def _tareProcess(self) -> None:
+        while True:
+            wait_s = self.tare_interval_ms / 1000
+            if self.test_running:
+                wait_s = max(wait_s, self.tare_read_s)
+            else:
+                wait_s = max(wait_s, self.tare_idle_s)
+            if self.tare_stop.wait(wait_s):
+                return
+            tare_means = self.tare_means
+            self._resizeTareMeans(tare_means)
+            if self.test_running:
+                self._updateTareValues(tare_means)
+                continue
+            with self.tare_mutex:
+                # Kept sessions closed by the pool leave nothing to read
+                if not self.test_running and not self._tareAttached():
+                    self.tare_stop.set()
+                    return
+            # Without a test, the latest value of each attached sensor is read
+            for sensor_id, running_mean in tare_means.items():
+                sensor = self.available_sensors.get(sensor_id)
+                if sensor is not None:
+                    running_mean.add(sensor.getLatestValue())
+
+    def _resizeTareMeans(self, tare_means: dict[str, RunningMean]) -> None:
+        # The latest values are kept when switching between idle and test windows
+        size = self.getTareWindow()
+        for running_mean in tare_means.values():
+            if running_mean.size != size:
+                running_mean.resize(size)
+
+    def _updateTareValues(self, tare_means: dict[str, RunningMean]) -> None:
+        # Values recorded since the previous update, on the test ticks and timelines
+        ticks = self.tare_ticks
+        providers = [(None, self)] + list(self.timelines.items())
+        for timeline_id, provider in providers:
+            start, times, values = provider.getNewValues(ticks.get(timeline_id, 0))
+            ticks[timeline_id] = start + len(times)
+            for sensor_id, sensor_values in values.items():
+                if sensor_id in tare_means:
+                    tare_means[sensor_id].extend(sensor_values)
+
+    def tareSensors(
+        self, sensor_mngr: SensorManager, tare_amount: int, interval_ms: int
+    ) -> None:
+        # Sensors are tared at once with the running mean of their latest values
+        self.setTareWindow(tare_amount, interval_ms)
         logger.info("Taring sensors...")
         tared_sensors_counter = 0
-        for sensor in self.available_sensors.values():
-            # Only tare loadcells and encoders
-            if sensor.getType() not in [
-                STypes.SENSOR_LOADCELL,
-                STypes.SENSOR_ENCODER,
-            ]:
+        for sensor_id, running_mean in self.tare_means.items():
+            mean = running_mean.getMean()
+            if mean is None:
                 continue
-            # Tare process
+            sensor = self.available_sensors[sensor_id]
             logger.debug(f"Tare sensor {sensor.getName()}")
-            slope = sensor.getSlope()
             intercept = sensor.getIntercept()
-            calib_values = [
-                value * slope + intercept for value in sensor.getValues()[-last_values:]
-            ]
-            new_intercept = float(sensor.getIntercept() - np.mean(calib_values))
+            new_intercept = float(-mean * sensor.getSlope())
             logger.debug(f"From {intercept} to {new_intercept}")
-            sensor_manager.setSensorIntercept(sensor, new_intercept)
+            sensor_mngr.setSensorIntercept(sensor, new_intercept)
             tared_sensors_counter += 1
+        if tared_sensors_counter == 0:
+            logger.warning(
+                "There are no sensor values to tare! Keep sensors connected or start a test."
+            )
+            return
+        # Store the new calibration in the recording, in case the test is interrupted
+        recording = self.recording
+        if recording is not None and recording.isOpen():
+            self._writeCalibration(recording)
         logger.info(f"Tare finished! {tared_sensors_counter} sensors has been tared.")
-
-    def tareSensors(
-        self, sensor_mngr: SensorManager, tare_amount: int, interval_ms: int
-    ) -> None:
-        waiting_time = float(tare_amount * interval_ms / 1000)
-        tare_thread = threading.Thread(
-            target=self._tareProcess, args=[sensor_mngr, tare_amount, waiting_time]
-        )
-        tare_thread.start()
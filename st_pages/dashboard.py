@@ -1,30 +1,151 @@
 import streamlit as st
 import pandas as pd
-import time
+import os
+import json
+from functools import partial
 
 from src.enums.configPaths import ConfigPaths
+from src.handlers.recordingFile import RECORDING_SUFFIX, TICKS_STREAM, finishRecording
+from src.enums.engineTypes import EngineTypes
+from src.enums.oversamplingTypes import OversamplingTypes
+from src.enums.alignmentTypes import AlignmentTypes
 
 from loguru import logger
 
 
+# Rows of the recorded data shown at once
+DATA_PREVIEW_ROWS = 1000
+
+
 @st.fragment(run_every="1s")
 def test_info(container) -> None:
-    times: list = st.session_state.test_mngr.getTestTimes()
+    test_size: int = st.session_state.test_mngr.getTestSize()
     metric_title_amount = "Test data amount"
     metric_title_time = "Test duration"
-    if not times or len(times) < 2:
+    metric_title_tick = "Tick interval"
+    metric_title_overrun = "Max tick overrun"
+    metric_help_tick = (
+        "Mean and standard deviation of the time between recorded values."
+    )
+    metric_help_overrun = "Maximum delay of a recorded value over the data interval."
+    if test_size < 2:
         with container.container():
-            metric_col_1, metric_col_2 = st.columns(2)
+            metric_col_1, metric_col_2, metric_col_3, metric_col_4 = st.columns(4)
             metric_col_1.metric(label=metric_title_time, value="00:00")
             metric_col_2.metric(label=metric_title_amount, value="0")
+            metric_col_3.metric(
+                label=metric_title_tick, value="-", help=metric_help_tick
+            )
+            metric_col_4.metric(
+                label=metric_title_overrun, value="-", help=metric_help_overrun
+            )
         return
-    minutes, seconds = divmod((times[-1] - times[0]) / 1000, 60)
+    minutes, seconds = divmod(st.session_state.test_mngr.getTestDuration(), 60)
+    tick_stats = st.session_state.test_mngr.getTickStats()
     with container.container():
-        metric_col_1, metric_col_2 = st.columns(2)
+        metric_col_1, metric_col_2, metric_col_3, metric_col_4 = st.columns(4)
         metric_col_1.metric(
             label=metric_title_time, value=f"{int(minutes):02}:{int(seconds):02}"
         )
-        metric_col_2.metric(label=metric_title_amount, value=len(times))
+        metric_col_2.metric(label=metric_title_amount, value=test_size)
+        metric_col_3.metric(
+            label=metric_title_tick,
+            value=f"{tick_stats['mean_ms']:.2f} ± {tick_stats['std_ms']:.2f} ms",
+            help=metric_help_tick,
+        )
+        metric_col_4.metric(
+            label=metric_title_overrun,
+            value=f"{tick_stats['max_overrun_ms']:.2f} ms",
+            help=metric_help_overrun,
+        )
+        if st.session_state.test_mngr.isTriggerArmed():
+            st.caption(
+                "Waiting for the force trigger, only the pre-trigger values are kept."
+            )
+
+
+@st.fragment(run_every="0.5s")
+def live_view(container) -> None:
+    # Only the values recorded since the previous refresh are read
+    st.session_state.live_mngr.update(st.session_state.test_mngr)
+    with container.container():
+        live_option = st.selectbox(
+            label="Live figure",
+            key="selectbox_live_figure",
+            options=st.session_state.live_mngr.getOptions(),
+            help="Calibrated sensor values and platform total forces, updated during the test.",
+        )
+        st.plotly_chart(
+            st.session_state.live_mngr.getFigure(live_option),
+            key="plotly_live_figure",
+        )
+
+
+def post_process_test(test_mngr, sensor_mngr, data_mngr, butter_values: tuple) -> None:
+    # Only uses the given managers, so auto stopped tests are processed in the background
+    # Recorded tests are loaded from their file, the memory values are a fallback
+    recording_path = test_mngr.getRecordingPath()
+    if recording_path is None or not data_mngr.loadRecording(recording_path):
+        data_mngr.loadData(
+            test_mngr.getTestTimes(),
+            sensor_mngr.getGroups(only_available=True),
+            test_mngr.getTimelineTimes(),
+        )
+    data_mngr.applyButterFilter(*butter_values)
+
+
+def get_post_process() -> partial:
+    return partial(
+        post_process_test,
+        st.session_state.test_mngr,
+        st.session_state.sensor_mngr,
+        st.session_state.data_mngr,
+        (
+            st.session_state.butter_fs_value,
+            st.session_state.butter_fc_value,
+            st.session_state.butter_order_value,
+        ),
+    )
+
+
+def load_test_data() -> None:
+    get_post_process()()
+
+
+def download_on_request(container, key: str, source: str, read, **kwargs) -> None:
+    # The file is only read when requested, and kept until another source is selected
+    prepared = st.session_state.get(key)
+    if prepared is None or prepared[0] != source:
+        if container.button(
+            label="Prepare download",
+            key=f"btn_prepare_{key}",
+            icon=":material/file_present:",
+            width='stretch',
+            help=kwargs.get("help"),
+        ):
+            st.session_state[key] = (source, read())
+            st.rerun()
+        return
+    container.download_button(
+        key=f"btn_{key}",
+        icon=":material/download:",
+        data=prepared[1],
+        width='stretch',
+        **kwargs,
+    )
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@st.fragment(run_every="0.5s")
+def auto_stop_poll() -> None:
+    # The test manager stops and processes the test, the page only checks it finished
+    if st.session_state.test_mngr.isTestFinished():
+        st.session_state.test_recording = False
+        st.rerun()
 
 
 def control_panel():
@@ -55,6 +176,43 @@ def control_panel():
             icon=":material/offline_bolt:",
         )
 
+    # Tests interrupted by a closed session or a crash
+    unfinished_recordings = st.session_state.unfinished_recordings
+    if unfinished_recordings and not st.session_state.test_recording:
+        recording_path = unfinished_recordings[0]
+        st.warning(
+            f"The test recording **{os.path.basename(recording_path)}** was interrupted."
+            + " Its values until the last checkpoint can be recovered.",
+            icon=":material/history:",
+        )
+        recovery_col_1, recovery_col_2 = st.columns(2)
+        if recovery_col_1.button(
+            label="Recover test",
+            key="btn_recover_recording",
+            type="primary",
+            width='stretch',
+        ):
+            if finishRecording(
+                recording_path, {"recovered": True}
+            ) and st.session_state.data_mngr.loadRecording(recording_path):
+                st.session_state.data_mngr.applyButterFilter(
+                    st.session_state.butter_fs_value,
+                    st.session_state.butter_fc_value,
+                    st.session_state.butter_order_value,
+                )
+            unfinished_recordings.pop(0)
+            st.rerun()
+        if recovery_col_2.button(
+            label="Dismiss",
+            key="btn_dismiss_recording",
+            type="secondary",
+            width='stretch',
+            help="The recording is kept in the recordings directory.",
+        ):
+            finishRecording(recording_path, {"recovered": False})
+            unfinished_recordings.pop(0)
+            st.rerun()
+
     if st.session_state.get("btn_test_start", False):
         st.session_state.test_recording = True
     elif st.session_state.get("btn_test_stop", False):
@@ -80,7 +238,8 @@ def control_panel():
         key="btn_test_tare",
         type="secondary",
         width='stretch',
-        disabled=test_unavailable or not st.session_state.test_recording,
+        disabled=test_unavailable or not st.session_state.test_mngr.getTareReady(),
+        help="Tares load cells and encoders at once with their latest values. Sensors must be kept connected, or a test running.",
     )
 
     # Test information
@@ -106,12 +265,22 @@ def control_panel():
         disabled=not st.session_state.test_toggle_auto_stop
         or st.session_state.test_recording,
     )
+    auto_stop_size = auto_stop_col_2.number_input(
+        label="Or after specified values",
+        min_value=0,
+        max_value=10000000,
+        value=0,
+        step=100,
+        disabled=not st.session_state.test_toggle_auto_stop
+        or st.session_state.test_recording,
+        help="The test stops at the first limit reached. Set to 0 to only use the seconds.",
+    )
 
     if st.session_state.test_recording:
         if st.session_state.test_toggle_auto_stop:
             test_status.info(
                 f"A current test is running! The test will end automatically in **{auto_stop_time} seconds**."
-                + " Do NOT leave this page during the test recording.",
+                + (f" or **{auto_stop_size} values**." if auto_stop_size else "."),
                 icon=":material/motion_photos_auto:",
             )
         else:
@@ -121,22 +290,83 @@ def control_panel():
             )
 
     if btn_test_start:
+        # Prepared downloads of the previous test are released
+        st.session_state.pop("download_read_trace", None)
+        engine = st.session_state.config_mngr.getConfigValue(
+            ConfigPaths.RECORD_ENGINE.value, EngineTypes.BARRIER.name
+        )
+        stream_chunk_size = 0
+        if st.session_state.config_mngr.getConfigValue(
+            ConfigPaths.RECORD_STREAM.value, False
+        ):
+            stream_chunk_size = st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_STREAM_CHUNK.value, 1000
+            )
+        st.session_state.test_mngr.setRecording(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_DIRECTORY.value, "recordings"
+            ),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.TEST_NAME.value, "Test"
+            ),
+            stream_chunk_size,
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_DTYPE.value, "float64"
+            ),
+            st.session_state.config_mngr.config_dict,
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_CHECKPOINT_S.value, 5
+            ),
+        )
+        st.session_state.test_mngr.setDeadline(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_DEADLINE_MS.value, 0
+            )
+        )
+        oversampling = st.session_state.config_mngr.getConfigValue(
+            ConfigPaths.RECORD_OVERSAMPLING.value, OversamplingTypes.NONE.name
+        )
+        st.session_state.test_mngr.setOversampling(
+            OversamplingTypes.__members__.get(oversampling, OversamplingTypes.NONE)
+        )
+        st.session_state.test_mngr.setReadTracing(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_TRACE_READS.value, False
+            )
+        )
+        st.session_state.test_mngr.setTrigger(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_TRIGGER_FORCE_N.value, 0
+            ),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_TRIGGER_PRE_MS.value, 500
+            ),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_TRIGGER_POST_MS.value, 2000
+            ),
+        )
+        # Triggered tests also stop themselves after the post-trigger period
+        auto_stop = st.session_state.test_toggle_auto_stop
+        st.session_state.test_mngr.setAutoStop(
+            auto_stop_time if auto_stop else 0,
+            auto_stop_size if auto_stop else 0,
+            get_post_process(),
+        )
         st.session_state.test_mngr.testStart(
             st.session_state.config_mngr.getConfigValue(
                 ConfigPaths.RECORD_INTERVAL_MS.value, 100
-            )
+            ),
+            EngineTypes.__members__.get(engine, EngineTypes.BARRIER),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_CAPTURE_EVENTS.value, False
+            ),
+        )
+        st.session_state.live_mngr.setup(
+            st.session_state.sensor_mngr.getGroups(only_available=True)
         )
     if btn_test_stop:
         st.session_state.test_mngr.testStop()
-        st.session_state.data_mngr.loadData(
-            st.session_state.test_mngr.getTestTimes(),
-            st.session_state.sensor_mngr.getGroups(only_available=True),
-        )
-        st.session_state.data_mngr.applyButterFilter(
-            st.session_state.butter_fs_value,
-            st.session_state.butter_fc_value,
-            st.session_state.butter_order_value,
-        )
+        load_test_data()
     if btn_test_tare:
         amount = st.session_state.config_mngr.getConfigValue(
             ConfigPaths.RECORD_TARE_AMOUNT.value, 300
@@ -150,17 +380,40 @@ def control_panel():
 
     # Update test duration and data amount
     test_info(test_metrics_container)
+    if st.session_state.test_recording:
+        live_view(st.empty())
 
     # Show/download dataframes
-    dataframes = [pd.DataFrame(), pd.DataFrame(), pd.DataFrame()]
-    if not st.session_state.test_recording:
-        dataframes = [
-            st.session_state.data_mngr.getCalibrateDataframe(),
-            st.session_state.data_mngr.getFilteredDataframe(),
-            st.session_state.data_mngr.getRawDataframe(),
-        ]
-
     st.subheader("Recorded data")
+    # Groups with their own interval are shown separately from the test ticks
+    block_options = st.session_state.data_mngr.getBlockOptions()
+    block = next(iter(block_options), TICKS_STREAM)
+    if len(block_options) > 1:
+        block = st.selectbox(
+            label="Data interval",
+            options=block_options.keys(),
+            format_func=lambda block_id: block_options[block_id],
+            help="Sensor groups recorded at their own interval have their own data.",
+        )
+    data_mngr = st.session_state.data_mngr
+    # Only a window of rows is read and shown, the whole data is read for downloads
+    data_size = 0 if st.session_state.test_recording else data_mngr.getDataSize(block)
+    first_row = 0
+    if data_size > DATA_PREVIEW_ROWS:
+        first_row = st.number_input(
+            label="First row",
+            key=f"number_first_row_{block}",
+            min_value=0,
+            max_value=data_size - 1,
+            step=DATA_PREVIEW_ROWS,
+            help=f"Data is shown by windows of {DATA_PREVIEW_ROWS} rows.",
+        )
+    getters = [
+        data_mngr.getCalibrateDataframe,
+        data_mngr.getFilteredDataframe,
+        data_mngr.getRawDataframe,
+    ]
+
     file_name = st.text_input(
         label="Test name",
         value=st.session_state.config_mngr.getConfigValue(
@@ -174,9 +427,10 @@ def control_panel():
         )
     df_tabs = st.tabs(["Calibrated data", "Filtered data", "Raw data"])
     file_suffixes = ["_CALIBRATED", "_FILTERED", "_RAW"]
-    for i, df in enumerate(dataframes):
+    block_suffix = "" if block == TICKS_STREAM else "_" + block.split(".", 1)[1]
+    for i, get_dataframe in enumerate(getters):
         with df_tabs[i]:
-            if df.empty:
+            if data_size == 0:
                 st.error(
                     "There is no data recorded. Start a test!",
                     icon=":material/report:",
@@ -193,32 +447,149 @@ def control_panel():
                     width='stretch',
                 )
                 continue
-            st.download_button(
+            download_on_request(
+                st,
+                f"download_df_{i}",
+                f"{block}:{data_mngr.data_version}",
+                partial(
+                    data_mngr.getCSV, partial(get_dataframe, block=block), data_size
+                ),
                 label="Download CSV",
-                key=f"btn_download_df_{i}",
-                icon=":material/download:",
-                data=df.to_csv(index=False).encode("utf-8"),
                 mime="text/csv",
-                file_name=f"{file_name+file_suffixes[i]}.csv",
+                file_name=f"{file_name+block_suffix+file_suffixes[i]}.csv",
                 help="Download the following dataframe in CSV format.",
             )
-            st.dataframe(data=df, width='stretch')
+            st.dataframe(
+                data=get_dataframe(first_row, first_row + DATA_PREVIEW_ROWS, block),
+                width='stretch',
+            )
 
-    # If auto stop test is enabled, add stop process to a thread
-    if st.session_state.test_toggle_auto_stop and st.session_state.test_recording:
-        time.sleep(auto_stop_time)
-        st.session_state.test_mngr.testStop()
-        st.session_state.data_mngr.loadData(
-            st.session_state.test_mngr.getTestTimes(),
-            st.session_state.sensor_mngr.getGroups(only_available=True),
+    native_options = data_mngr.getNativeDataOptions()
+    if native_options and not st.session_state.test_recording:
+        with st.expander("Native rate data", icon=":material/timeline:"):
+            native_option = st.selectbox(
+                label="Select sensor",
+                key="selectbox_native_sensor",
+                options=native_options,
+                help="Every event captured at the sensor data rate.",
+            )
+            native_size = data_mngr.getNativeDataSize(native_option)
+            first_event = 0
+            if native_size > DATA_PREVIEW_ROWS:
+                first_event = st.number_input(
+                    label="First row",
+                    key=f"number_first_native_row_{native_option}",
+                    min_value=0,
+                    max_value=native_size - 1,
+                    step=DATA_PREVIEW_ROWS,
+                    help=f"Data is shown by windows of {DATA_PREVIEW_ROWS} rows.",
+                )
+            download_on_request(
+                st,
+                "download_df_native",
+                f"{native_option}:{data_mngr.data_version}",
+                partial(
+                    data_mngr.getCSV,
+                    partial(data_mngr.getNativeDataframe, native_option),
+                    native_size,
+                ),
+                label="Download CSV",
+                mime="text/csv",
+                file_name=f"{file_name}_{native_option}_NATIVE.csv",
+                help="Download the following dataframe in CSV format.",
+            )
+            st.dataframe(
+                data=data_mngr.getNativeDataframe(
+                    native_option, first_event, first_event + DATA_PREVIEW_ROWS
+                ),
+                width='stretch',
+            )
+
+    dropouts = {
+        name: count
+        for name, count in st.session_state.test_mngr.getDropouts().items()
+        if count
+    }
+    if dropouts and not st.session_state.test_recording:
+        st.warning(
+            "Some sensor values were missed during the test. Values not read before the deadline are recorded as missing,"
+            + " and the high-rate capture holds the previous value: "
+            + ", ".join(f"{name} ({count})" for name, count in dropouts.items()),
+            icon=":material/running_with_errors:",
         )
-        st.session_state.data_mngr.applyButterFilter(
-            st.session_state.butter_fs_value,
-            st.session_state.butter_fc_value,
-            st.session_state.butter_order_value,
+
+    read_latencies = st.session_state.test_mngr.getReadLatencies()
+    if read_latencies and not st.session_state.test_recording:
+        with st.expander("Sensor read latency", icon=":material/speed:"):
+            # The trace is only built when requested, it is large for long tests
+            download_on_request(
+                st,
+                "download_read_trace",
+                "read_trace",
+                lambda: json.dumps(st.session_state.test_mngr.getReadTrace()).encode(
+                    "utf-8"
+                ),
+                label="Download trace",
+                mime="application/json",
+                file_name=f"{file_name}_READ_TRACE.json",
+                help="Latest sensor reads in Chrome trace format. Open it in https://ui.perfetto.dev or chrome://tracing.",
+            )
+            st.dataframe(
+                data=pd.DataFrame.from_dict(read_latencies, orient="index"),
+                width='stretch',
+            )
+
+    recording_directory = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_DIRECTORY.value, "recordings"
+    )
+    recording_files = []
+    if os.path.isdir(recording_directory):
+        recording_files = sorted(
+            [
+                file
+                for file in os.listdir(recording_directory)
+                if file.endswith(RECORDING_SUFFIX)
+            ],
+            key=lambda file: os.path.getmtime(os.path.join(recording_directory, file)),
+            reverse=True,
         )
-        st.session_state.test_recording = False
-        st.rerun()
+    if recording_files and not st.session_state.test_recording:
+        with st.expander("Recordings", icon=":material/folder_open:"):
+            recording_file = st.selectbox(
+                label="Select recording",
+                key="selectbox_recording",
+                options=recording_files,
+                help=f"Tests saved in the {recording_directory} directory.",
+            )
+            recording_path = os.path.join(recording_directory, recording_file)
+            recording_col_1, recording_col_2 = st.columns(2)
+            if recording_col_1.button(
+                label="Load recording",
+                key="btn_load_recording",
+                icon=":material/upload:",
+                width='stretch',
+            ):
+                if st.session_state.data_mngr.loadRecording(recording_path):
+                    st.session_state.data_mngr.applyButterFilter(
+                        st.session_state.butter_fs_value,
+                        st.session_state.butter_fc_value,
+                        st.session_state.butter_order_value,
+                    )
+                    st.rerun()
+                st.error("Could not load the recording.", icon=":material/report:")
+            download_on_request(
+                recording_col_2,
+                "download_recording",
+                recording_path,
+                partial(read_file, recording_path),
+                label="Download recording",
+                file_name=recording_file,
+                help="Download the recording file in binary format.",
+            )
+
+    # Auto stopped and triggered tests are finished by the test manager
+    if st.session_state.test_recording:
+        auto_stop_poll()
 
 
 def data_visualization():
@@ -310,6 +681,35 @@ def data_visualization():
                 index=None,
                 placeholder="Choose a platform",
             )
+        alignment_names = AlignmentTypes._member_names_
+        alignment = st.session_state.config_mngr.getConfigValue(
+            ConfigPaths.FILTER_ALIGNMENT.value, AlignmentTypes.NONE.name
+        )
+        config_alignment = settings_col_1.selectbox(
+            label="Time alignment",
+            key="selectbox_filter_alignment",
+            options=alignment_names,
+            index=(
+                alignment_names.index(alignment)
+                if alignment in alignment_names
+                else 0
+            ),
+            format_func=lambda name: AlignmentTypes[name].value,
+            help="Resamples the values of every sensor group to a common time grid, at the shortest data interval."
+            + " IMU orientations are interpolated with SLERP. Own timelines keeps each group at its recorded times.",
+        )
+        if config_alignment != alignment:
+            st.session_state.config_mngr.setConfigValue(
+                ConfigPaths.FILTER_ALIGNMENT.value, config_alignment
+            )
+        alignment_type = AlignmentTypes[config_alignment]
+        if alignment_type != st.session_state.data_mngr.getAlignment():
+            st.session_state.data_mngr.setAlignment(alignment_type)
+            st.session_state.data_mngr.applyButterFilter(
+                st.session_state.butter_fs_value,
+                st.session_state.butter_fc_value,
+                st.session_state.butter_order_value,
+            )
         settings_col_2.subheader("Butterworth filter")
         butter_col_1, butter_col_2 = settings_col_2.columns(2)
         butter_fs = butter_col_1.number_input(
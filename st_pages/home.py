@@ -328,8 +328,8 @@ def configDetails() -> None:
     st.code(code_config_struct, language="yaml")
     # Sensor types
     st.subheader("Sensor types")
-    sensor_tab_loadcell, sensor_tab_encoder, sensor_tab_imu = st.tabs(
-        ["`SENSOR_LOADCELL`", "`SENSOR_ENCODER`", "`SENSOR_IMU`"]
+    sensor_tab_loadcell, sensor_tab_encoder, sensor_tab_imu, sensor_tab_sim = st.tabs(
+        ["`SENSOR_LOADCELL`", "`SENSOR_ENCODER`", "`SENSOR_IMU`", "`SENSOR_SIM`"]
     )
     ## Loadcell sensors
     sensor_loadcell_col_1, sensor_loadcell_col_2 = sensor_tab_loadcell.columns(2)
@@ -510,6 +510,81 @@ def configDetails() -> None:
         hide_index=True,
         width='stretch',
     )
+    ## Simulated sensors
+    sensor_sim_col_1, sensor_sim_col_2 = sensor_tab_sim.columns(2)
+    sensor_sim_col_1.markdown(
+        """
+        #### Section example
+        ```yaml
+        name: Sim_Z_1
+        type: SENSOR_SIM
+        read: true
+        connection:
+          serial: 0
+        simulation:
+          waveform: sine
+          amplitude: 100
+          frequency_hz: 1.0
+          offset: 0
+          noise: 0.5
+          rate_hz: 125
+          latency_ms: 0
+          burst_ms: 0
+        properties: []
+        calibration:
+          slope: 1
+          intercept: 0
+        ```
+        """
+    )
+    sensor_sim_col_2.markdown(
+        """
+        #### Simulated sensors
+        Hardware free sensors, to test configurations with many channels and measure
+        the acquisition throughput without Phidget devices or IMUs.
+        Values are generated at the device rate with the selected waveform:
+        `constant`, `sine`, `square`, `triangle` or `sawtooth`.
+        """
+    )
+    sensor_tab_sim.write("Required keys information:")
+    sensor_tab_sim.dataframe(
+        pd.DataFrame(
+            {
+                "Key": [
+                    "name",
+                    "type",
+                    "read",
+                    "connection.serial",
+                    "simulation",
+                    "properties",
+                    "calibration.slope",
+                    "calibration.intercept",
+                ],
+                "Type": [
+                    "STRING",
+                    "STRING",
+                    "BOOL",
+                    "INT",
+                    "DICT",
+                    "LIST",
+                    "INT",
+                    "INT",
+                ],
+                "Description": [
+                    "Sensor name.",
+                    "Sensor type: SENSOR_SIM.",
+                    "Enable or disable sensor data recording. Can be modified in GUI.",
+                    "Any identifier of the simulated device.",
+                    "(Optional) Waveform, amplitude, frequency_hz, offset, noise (standard deviation), rate_hz (defaults to the data interval), latency_ms of each reading and burst_ms, the period of the bursts delivering the samples.",
+                    "(Could be empty) Configuration section to provide more information.",
+                    "Slope parameter.",
+                    "Intercept parameter.",
+                ],
+            }
+        ),
+        hide_index=True,
+        width='stretch',
+    )
     st.subheader("Sensor group types")
     group_tab_default, group_tab_platform = st.tabs(
         ["`GROUP_DEFAULT`", "`GROUP_PLATFORM`"]
@@ -539,13 +614,14 @@ def configDetails() -> None:
     group_tab_default.dataframe(
         pd.DataFrame(
             {
-                "Key": ["name", "type", "read", "sensor_list"],
-                "Type": ["STRING", "STRING", "BOOL", "LIST"],
+                "Key": ["name", "type", "read", "sensor_list", "data_interval_ms"],
+                "Type": ["STRING", "STRING", "BOOL", "LIST", "INT"],
                 "Description": [
                     "Group name.",
                     "Group type: GROUP_DEFAULT.",
                     "Enable or disable entire group data recording. Can be modified in GUI.",
                     "A string list of sensor IDs, declared in the sensors section.",
+                    "Optional. Record interval of the group sensors, sampled on their own timeline. By default, the test record interval.",
                 ],
             }
         ),
@@ -604,13 +680,14 @@ def configDetails() -> None:
     group_tab_platform.dataframe(
         pd.DataFrame(
             {
-                "Key": ["name", "type", "read", "sensor_list"],
-                "Type": ["STRING", "STRING", "BOOL", "LIST"],
+                "Key": ["name", "type", "read", "sensor_list", "data_interval_ms"],
+                "Type": ["STRING", "STRING", "BOOL", "LIST", "INT"],
                 "Description": [
                     "Group name.",
                     "Group type: GROUP_PLATFORM.",
                     "Enable or disable entire group data recording. Can be modified in GUI.",
                     "A string list of sensor IDs, declared in the sensors section.",
+                    "Optional. Record interval of the group sensors, sampled on their own timeline. By default, the test record interval.",
                 ],
             }
         ),
@@ -4,6 +4,8 @@ import pandas as pd
 from src.enums.sensorTypes import STypes
 from src.handlers.sensorGroup import SensorGroup
 from src.enums.configPaths import ConfigPaths
+from src.enums.engineTypes import EngineTypes
+from src.enums.oversamplingTypes import OversamplingTypes
 
 from loguru import logger
 
@@ -11,8 +13,24 @@ from loguru import logger
 def connectSensors():
     st.session_state.sensor_connection_available = False
     with st.spinner("Connecting sensors..."):
+        st.session_state.test_mngr.setIdleTimeout(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_IDLE_TIMEOUT_S.value, 300
+            )
+        )
+        st.session_state.test_mngr.setTareWindow(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_TARE_AMOUNT.value, 300
+            ),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_INTERVAL_MS.value, 100
+            ),
+        )
         st.session_state.test_mngr.checkConnection(
-            st.session_state.sensor_mngr.getGroups()
+            st.session_state.sensor_mngr.getGroups(),
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_KEEP_CONNECTIONS.value, False
+            ),
         )
     st.session_state.sensor_connection_available = True
 
@@ -83,6 +101,7 @@ def config_settings():
                     len(group.getSensors(sensor_type=STypes.SENSOR_LOADCELL)),
                     len(group.getSensors(sensor_type=STypes.SENSOR_ENCODER)),
                     len(group.getSensors(sensor_type=STypes.SENSOR_IMU)),
+                    len(group.getSensors(sensor_type=STypes.SENSOR_SIM)),
                 ]
             sensors_df = pd.DataFrame(
                 {
@@ -94,6 +113,9 @@ def config_settings():
                         sensor_info[1] for sensor_info in sensors_info.values()
                     ],
                     "IMUs": [sensor_info[2] for sensor_info in sensors_info.values()],
+                    "Simulated": [
+                        sensor_info[3] for sensor_info in sensors_info.values()
+                    ],
                 }
             )
             st.dataframe(sensors_df, width='stretch', hide_index=True)
@@ -110,27 +132,247 @@ def config_settings():
             ConfigPaths.RECORD_TARE_AMOUNT.value, 300
         ),
         step=1,
-        help="Number of values to be taken to tare sensors.",
+        help="Number of latest values averaged to tare sensors. They are read in the background"
+        + " while sensors are kept connected, or taken from the running test.",
     )
     if config_tare:
         st.session_state.config_mngr.setConfigValue(
             ConfigPaths.RECORD_TARE_AMOUNT.value, config_tare
         )
+    # Intervals under 10 ms are only kept up with by the high-rate capture
+    min_interval = 10
+    if (
+        st.session_state.config_mngr.getConfigValue(
+            ConfigPaths.RECORD_ENGINE.value, EngineTypes.BARRIER.name
+        )
+        == EngineTypes.HIGH_RATE.name
+    ):
+        min_interval = 1
     config_interval = config_col_2.number_input(
         label="Record interval (ms)",
         key="number_input_record_freq",
-        min_value=10,
+        min_value=min_interval,
         max_value=1000,
-        value=st.session_state.config_mngr.getConfigValue(
-            ConfigPaths.RECORD_INTERVAL_MS.value, 100
+        value=max(
+            st.session_state.config_mngr.getConfigValue(
+                ConfigPaths.RECORD_INTERVAL_MS.value, 100
+            ),
+            min_interval,
         ),
         step=1,
-        help="Timeframe between registered values in milliseconds.",
+        help="Timeframe between registered values in milliseconds."
+        + " The high-rate capture engine allows intervals down to 1 ms.",
     )
     if config_interval:
         st.session_state.config_mngr.setConfigValue(
             ConfigPaths.RECORD_INTERVAL_MS.value, config_interval
         )
+    engine_names = EngineTypes._member_names_
+    config_engine = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_ENGINE.value, EngineTypes.BARRIER.name
+    )
+    config_engine = config_col_1.selectbox(
+        label="Acquisition engine",
+        key="selectbox_record_engine",
+        options=engine_names,
+        index=(
+            engine_names.index(config_engine) if config_engine in engine_names else 0
+        ),
+        format_func=lambda name: EngineTypes[name].value,
+        help="Thread per sensor synchronizes one thread per sensor on each tick."
+        + " Single thread sampler reads every sensor from one thread, which scales better with many sensors."
+        + " Separate process sampler runs the sensors in another process, so the app work does not delay samples."
+        + " Deadline sampler never waits for a slow sensor: values not read before the deadline are recorded as missing."
+        + " High-rate capture runs the sensors at their fastest data interval and records their native events"
+        + " on each tick, for record intervals down to 1 ms.",
+    )
+    if config_engine:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_ENGINE.value, config_engine
+        )
+    deadline_ms = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_DEADLINE_MS.value, 0
+    )
+    config_deadline = config_col_1.number_input(
+        label="Read deadline (ms)",
+        key="number_input_record_deadline",
+        min_value=0,
+        max_value=10000,
+        value=deadline_ms,
+        step=1,
+        disabled=config_engine != EngineTypes.DEADLINE.name,
+        help="Maximum time each record waits for the sensor values with the deadline sampler."
+        + " Set to 0 to use half of the data interval.",
+    )
+    if config_deadline != deadline_ms:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_DEADLINE_MS.value, config_deadline
+        )
+    stream_to_disk = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_STREAM.value, False
+    )
+    config_stream = config_col_1.toggle(
+        label="Stream recording to disk",
+        key="toggle_record_stream",
+        value=stream_to_disk,
+        help="Writes recorded values to a file in chunks during the test, so memory use does not grow with the test duration.",
+    )
+    if config_stream != stream_to_disk:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_STREAM.value, config_stream
+        )
+    keep_connections = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_KEEP_CONNECTIONS.value, False
+    )
+    config_keep_connections = config_col_1.toggle(
+        label="Keep sensors connected",
+        key="toggle_record_keep_connections",
+        value=keep_connections,
+        help="Sensors stay attached after the connection check and between tests, so tests start immediately."
+        + " Idle connections are closed after the idle timeout.",
+    )
+    if config_keep_connections != keep_connections:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_KEEP_CONNECTIONS.value, config_keep_connections
+        )
+    idle_timeout_s = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_IDLE_TIMEOUT_S.value, 300
+    )
+    config_idle_timeout = config_col_1.number_input(
+        label="Idle connection timeout (s)",
+        key="number_input_record_idle_timeout",
+        min_value=10,
+        max_value=86400,
+        value=idle_timeout_s,
+        step=10,
+        disabled=not config_keep_connections,
+        help="Kept sensor connections are closed after being unused for this time.",
+    )
+    if config_idle_timeout != idle_timeout_s:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_IDLE_TIMEOUT_S.value, config_idle_timeout
+        )
+        st.session_state.test_mngr.setIdleTimeout(config_idle_timeout)
+    capture_events = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_CAPTURE_EVENTS.value, False
+    )
+    config_capture = config_col_2.toggle(
+        label="Capture native rate events",
+        key="toggle_record_capture",
+        value=capture_events,
+        help="Keeps every load cell, encoder and IMU event received between record intervals, with its timestamp.",
+    )
+    if config_capture != capture_events:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_CAPTURE_EVENTS.value, config_capture
+        )
+    oversampling_names = OversamplingTypes._member_names_
+    oversampling = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_OVERSAMPLING.value, OversamplingTypes.NONE.name
+    )
+    config_oversampling = config_col_2.selectbox(
+        label="Oversampling",
+        key="selectbox_record_oversampling",
+        options=oversampling_names,
+        index=(
+            oversampling_names.index(oversampling)
+            if oversampling in oversampling_names
+            else 0
+        ),
+        format_func=lambda name: OversamplingTypes[name].value,
+        help="Latest value records the last value of each sensor on every record interval."
+        + " Bin average and anti-alias FIR capture the sensors at their fastest data interval and reduce"
+        + " the values of each record interval, which lowers the noise and removes the aliasing of vibrations."
+        + " The anti-alias FIR delays the values by two record intervals, noted in the recording metadata."
+        + " IMUs are not oversampled, and native rate events are not captured while oversampling.",
+    )
+    if config_oversampling != oversampling:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_OVERSAMPLING.value, config_oversampling
+        )
+    trace_reads = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_TRACE_READS.value, False
+    )
+    config_trace_reads = config_col_2.toggle(
+        label="Trace sensor reads",
+        key="toggle_record_trace_reads",
+        value=trace_reads,
+        help="Times every sensor read to find slow sensors. Latency percentiles and a Chrome trace / Perfetto file"
+        + " are available after the test. Not available with the separate process sampler.",
+    )
+    if config_trace_reads != trace_reads:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_TRACE_READS.value, config_trace_reads
+        )
+    checkpoint_s = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_CHECKPOINT_S.value, 5
+    )
+    config_checkpoint = config_col_2.number_input(
+        label="Checkpoint interval (s)",
+        key="number_input_record_checkpoint",
+        min_value=0,
+        max_value=600,
+        value=checkpoint_s,
+        step=1,
+        help="Recorded values are saved to disk at least this often, so an interrupted test can be recovered."
+        + " Set to 0 to save them only when the test stops.",
+    )
+    if config_checkpoint != checkpoint_s:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_CHECKPOINT_S.value, config_checkpoint
+        )
+    trigger_force_n = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_TRIGGER_FORCE_N.value, 0
+    )
+    config_trigger_force = config_col_2.number_input(
+        label="Trigger force (N)",
+        key="number_input_record_trigger_force",
+        min_value=0,
+        max_value=100000,
+        value=trigger_force_n,
+        step=10,
+        help="The recording starts when the total vertical force of the platforms rises over this force."
+        + " Set to 0 to record the whole test.",
+    )
+    if config_trigger_force != trigger_force_n:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_TRIGGER_FORCE_N.value, config_trigger_force
+        )
+    trigger_pre_ms = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_TRIGGER_PRE_MS.value, 500
+    )
+    config_trigger_pre = config_col_1.number_input(
+        label="Pre-trigger period (ms)",
+        key="number_input_record_trigger_pre",
+        min_value=0,
+        max_value=60000,
+        value=trigger_pre_ms,
+        step=100,
+        disabled=not config_trigger_force,
+        help="Values recorded before the trigger that are kept.",
+    )
+    if config_trigger_pre != trigger_pre_ms:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_TRIGGER_PRE_MS.value, config_trigger_pre
+        )
+    trigger_post_ms = st.session_state.config_mngr.getConfigValue(
+        ConfigPaths.RECORD_TRIGGER_POST_MS.value, 2000
+    )
+    config_trigger_post = config_col_2.number_input(
+        label="Post-trigger period (ms)",
+        key="number_input_record_trigger_post",
+        min_value=0,
+        max_value=600000,
+        value=trigger_post_ms,
+        step=100,
+        disabled=not config_trigger_force,
+        help="The test stops after this period from the trigger."
+        + " Set to 0 to keep recording until the test is stopped.",
+    )
+    if config_trigger_post != trigger_post_ms:
+        st.session_state.config_mngr.setConfigValue(
+            ConfigPaths.RECORD_TRIGGER_POST_MS.value, config_trigger_post
+        )
 
 
 def sensor_settings():
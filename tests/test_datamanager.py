@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+# Filters and IMU rotations require SciPy
+pytest.importorskip("scipy.signal")
+
+from src.managers.dataManager import DataManager
+from src.handlers.sensor import Sensor
+from src.handlers.sensorGroup import SensorGroup
+from src.handlers.recordingFile import (
+    RecordingWriter,
+    TICKS_STREAM,
+    timelineStream,
+)
+from src.enums.alignmentTypes import AlignmentTypes
+from src.enums.sensorParams import SParams
+from src.enums.sensorStatus import SStatus
+from src.enums.sensorTypes import SGTypes
+
+
+# General mocks, builders and fixtures
+
+
+class DriverMock:
+    def __init__(self, serial: int, channel: int) -> None:
+        pass
+
+
+def buildSensor(
+    id: str,
+    values: list,
+    slope: float = 1,
+    intercept: float = 0,
+    type: str = "SENSOR_LOADCELL",
+):
+    sensor = Sensor()
+    sensor.setup(
+        id,
+        {
+            SParams.NAME.value: id,
+            SParams.TYPE.value: type,
+            SParams.READ.value: True,
+            SParams.CONNECTION_SECTION.value: {
+                SParams.SERIAL.value: 0,
+                SParams.CHANNEL.value: 0,
+            },
+            SParams.CALIBRATION_SECTION.value: {
+                SParams.SLOPE.value: slope,
+                SParams.INTERCEPT.value: intercept,
+            },
+        },
+        DriverMock,
+    )
+    sensor.status = SStatus.AVAILABLE
+    [sensor.addValue(value) for value in values]
+    return sensor
+
+
+def buildGroup(id: str, sensors: list[Sensor], interval_ms: float = None):
+    group = SensorGroup(id, id, SGTypes.GROUP_DEFAULT)
+    group.setRead(True)
+    group.setInterval(interval_ms)
+    [group.addSensor(sensor) for sensor in sensors]
+    return group
+
+
+def buildTimes(size: int, interval_ms: float, start_ns: int = 0) -> np.ndarray:
+    return start_ns + np.arange(size, dtype=np.int64) * round(interval_ms * 1e6)
+
+
+def buildTimelines(values_a: np.ndarray = None) -> tuple[np.ndarray, list, dict]:
+    """
+    Group a on the 10 ms ticks from 0 ms, and group b on its own 5 ms timeline from
+    2 ms. Values are their times in ms.
+    """
+    times_a = buildTimes(10, 10)
+    times_b = buildTimes(20, 5, 2_000_000)
+    if values_a is None:
+        values_a = times_a / 1e6
+    groups = [
+        buildGroup("a", [buildSensor("a", values_a)]),
+        buildGroup("b", [buildSensor("b", times_b / 1e6)], 5),
+    ]
+    return times_a, groups, {"b": times_b}
+
+
+def getColumn(data_mngr: DataManager, column: str) -> np.ndarray:
+    return data_mngr.getCalibrateDataframe()[column].astype(float).to_numpy()
+
+
+@pytest.fixture
+def imu_quaternions() -> np.ndarray:
+    """
+    IMU values of rotations of 0 and 90 degrees about the z axis
+    """
+    values = np.zeros((2, 10))
+    values[:, 2] = np.sin(np.radians([0, 45]))
+    values[:, 3] = np.cos(np.radians([0, 45]))
+    return values
+
+
+# Tests
+
+
+def test_filter_dropouts() -> None:
+    """
+    Dropouts stay missing after the filter, without spreading to the other values
+    """
+    values = np.sin(np.linspace(0, 4 * np.pi, 100))
+    values[[10, 11, 40, 70, 99]] = np.nan
+    data_mngr = DataManager()
+    data_mngr.loadData(
+        buildTimes(100, 10), [buildGroup("g", [buildSensor("s", values)])]
+    )
+    data_mngr.applyButterFilter(100, 5, 4)
+    filtered = data_mngr.getFilteredDataframe()["s"].astype(float).to_numpy()
+    assert np.isnan(filtered).sum() == 5
+    assert np.isnan(filtered[[10, 11, 40, 70, 99]]).all()
+    valid = ~np.isnan(values)
+    assert np.abs(filtered[valid] - values[valid]).max() < 0.1
+
+
+def test_own_timelines() -> None:
+    data_mngr = DataManager()
+    data_mngr.loadData(*buildTimelines())
+    assert list(data_mngr.getBlockOptions()) == [TICKS_STREAM, timelineStream("b")]
+    assert data_mngr.getDataSize() == 10
+    df = data_mngr.getCalibrateDataframe(block=timelineStream("b"))
+    assert df["timestamp"].tolist() == (buildTimes(20, 5, 2_000_000) / 1e6).tolist()
+
+
+@pytest.mark.parametrize(
+    "mode, expected_a",
+    [
+        (AlignmentTypes.LINEAR, lambda grid: grid),
+        (AlignmentTypes.NEAREST, lambda grid: np.floor(grid / 10 + 0.5) * 10),
+        (AlignmentTypes.ZOH, lambda grid: np.floor(grid / 10) * 10),
+    ],
+)
+def test_align_timelines(mode: AlignmentTypes, expected_a) -> None:
+    """
+    Both groups are resampled to a 5 ms grid over the time range of both
+    """
+    data_mngr = DataManager()
+    data_mngr.loadData(*buildTimelines())
+    data_mngr.setAlignment(mode)
+    assert list(data_mngr.getBlockOptions()) == [TICKS_STREAM]
+    grid = np.arange(2, 91, 5)
+    df = data_mngr.getCalibrateDataframe()
+    assert df["timestamp"].tolist() == grid.tolist()
+    assert getColumn(data_mngr, "a") == pytest.approx(expected_a(grid))
+    assert getColumn(data_mngr, "b") == pytest.approx(grid)
+    data_mngr.setAlignment(AlignmentTypes.NONE)
+    assert len(data_mngr.getBlockOptions()) == 2
+
+
+def test_align_dropouts() -> None:
+    """
+    Dropouts stay missing on the grid times that use them
+    """
+    values_a = buildTimes(10, 10) / 1e6
+    values_a[4] = np.nan
+    data_mngr = DataManager()
+    data_mngr.loadData(*buildTimelines(values_a))
+    grid = np.arange(2, 91, 5)
+    data_mngr.setAlignment(AlignmentTypes.ZOH)
+    missing = np.isnan(getColumn(data_mngr, "a"))
+    assert grid[missing].tolist() == [42, 47]
+    data_mngr.setAlignment(AlignmentTypes.LINEAR)
+    missing = np.isnan(getColumn(data_mngr, "a"))
+    assert grid[missing].tolist() == [32, 37, 42, 47]
+    assert not np.isnan(getColumn(data_mngr, "b")).any()
+    data_mngr.applyButterFilter(200, 20, 2)
+    filtered = data_mngr.getFilteredDataframe()["a"].astype(float).to_numpy()
+    assert np.isnan(filtered).tolist() == missing.tolist()
+
+
+def test_align_imu_slerp(imu_quaternions: np.ndarray) -> None:
+    """
+    IMU orientations are interpolated along the rotation, as unit quaternions
+    """
+    data_mngr = DataManager()
+    imu = buildSensor("imu", imu_quaternions, type="SENSOR_IMU")
+    data_mngr.loadData(buildTimes(2, 10), [buildGroup("g", [imu])])
+    data_mngr.setAlignment(AlignmentTypes.LINEAR, 5)
+    qz = getColumn(data_mngr, "imu_qz")
+    qw = getColumn(data_mngr, "imu_qw")
+    assert np.degrees(2 * np.arctan2(qz, qw)) == pytest.approx([0, 45, 90])
+    assert qz**2 + qw**2 == pytest.approx(1)
+
+
+def test_load_recording(tmp_path) -> None:
+    """
+    A recording is loaded back with the values of the sensors in memory
+    """
+    times_a, groups, timeline_times = buildTimelines()
+    groups[0].getSensors()["a"].params[SParams.CALIBRATION_SECTION.value] = {
+        SParams.SLOPE.value: 2,
+        SParams.INTERCEPT.value: 1,
+    }
+    path = str(tmp_path / "test.fpr")
+    sensor_a, sensor_b = [group.getSensors()[group.getID()] for group in groups]
+    writer = RecordingWriter()
+    writer.open(
+        path,
+        {
+            TICKS_STREAM: [sensor_a.getInfo()],
+            timelineStream("b"): [sensor_b.getInfo()],
+        },
+        metadata={"groups": [group.getInfo() for group in groups]},
+    )
+    # Values are written in several blocks, as flushed during a test
+    for start in [0, 4]:
+        writer.write(
+            TICKS_STREAM,
+            times_a[start : start + 4 + 2 * start],
+            [sensor_a.getValues()[start : start + 4 + 2 * start]],
+        )
+    writer.write(timelineStream("b"), timeline_times["b"], [sensor_b.getValues()])
+    writer.close()
+    memory_mngr = DataManager()
+    memory_mngr.loadData(times_a, groups, timeline_times)
+    data_mngr = DataManager()
+    assert data_mngr.loadRecording(path)
+    assert data_mngr.getBlockOptions() == memory_mngr.getBlockOptions()
+    for block in data_mngr.getBlockOptions():
+        for get in ["getRawDataframe", "getCalibrateDataframe"]:
+            df = getattr(data_mngr, get)(block=block)
+            assert df.equals(getattr(memory_mngr, get)(block=block))
+    assert getColumn(data_mngr, "a") == pytest.approx(times_a / 1e6 * 2 + 1)
+
+
+def test_load_recording_invalid(tmp_path) -> None:
+    path = tmp_path / "invalid.fpr"
+    path.write_bytes(b"0" * 64)
+    assert not DataManager().loadRecording(str(path))
+
+
+def test_csv_chunks() -> None:
+    """
+    CSV files built by chunks of rows match the CSV of the whole dataframe
+    """
+    data_mngr = DataManager()
+    data_mngr.loadData(*buildTimelines())
+    size = data_mngr.getDataSize()
+    csv = data_mngr.getCSV(data_mngr.getCalibrateDataframe, size, chunk_size=3)
+    assert csv == data_mngr.getCalibrateDataframe().to_csv(index=False).encode()
+    df = data_mngr.getCalibrateDataframe(4, 7)
+    assert df["timestamp"].tolist() == [40, 50, 60]
+    assert len(data_mngr.getCalibrateDataframe(8, 20)) == 2
+
+
+def test_native_data() -> None:
+    """
+    Captured events are calibrated, and read by row ranges
+    """
+    sensor = buildSensor("s", [0.0], slope=2, intercept=1)
+    sensor.addEvents(buildTimes(5, 1), np.arange(5.0))
+    data_mngr = DataManager()
+    data_mngr.loadData(buildTimes(1, 10), [buildGroup("g", [sensor])])
+    assert list(data_mngr.getNativeDataOptions()) == ["s"]
+    assert data_mngr.getNativeDataSize("s") == 5
+    df = data_mngr.getNativeDataframe("s", 1, 3)
+    assert df["timestamp"].tolist() == [1, 2]
+    assert df["s"].astype(float).tolist() == [3, 5]
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.eventBuffer import EventBuffer, gridTimestamp
+import threading
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def event_buffer() -> EventBuffer:
+    return EventBuffer()
+
+
+# Tests
+
+
+def test_event_buffer_drain(event_buffer: EventBuffer) -> None:
+    event_buffer.push(10, 1.5)
+    event_buffer.push(20, 2.5)
+    timestamps, values = event_buffer.drain()
+    assert timestamps.tolist() == [10, 20]
+    assert values[:, 0].tolist() == [1.5, 2.5]
+    assert len(event_buffer) == 0
+
+
+def test_event_buffer_drain_empty(event_buffer: EventBuffer) -> None:
+    timestamps, values = event_buffer.drain()
+    assert timestamps.shape == (0,)
+    assert values.shape == (0, 1)
+
+
+def test_event_buffer_drain_rows() -> None:
+    event_buffer = EventBuffer(width=3)
+    event_buffer.push(10, [1, 2, 3])
+    timestamps, values = event_buffer.drain()
+    assert values.shape == (1, 3)
+
+
+def test_event_buffer_concurrent_push(event_buffer: EventBuffer) -> None:
+    """
+    No event is lost when draining while another thread pushes events
+    """
+
+    def pushEvents():
+        [event_buffer.push(i, i) for i in range(10000)]
+
+    thread = threading.Thread(target=pushEvents)
+    thread.start()
+    drained = 0
+    while thread.is_alive():
+        drained += len(event_buffer.drain()[0])
+    thread.join()
+    drained += len(event_buffer.drain()[0])
+    assert drained == 10000
+
+
+def test_grid_timestamp_burst() -> None:
+    """
+    Events of a burst keep the interval grid, and are never later than their arrival
+    """
+    stamps = [gridTimestamp(None, 100, 8, 16)]
+    for now in [110, 124, 124, 124, 126]:
+        stamps.append(gridTimestamp(stamps[-1], now, 8, 16))
+    assert stamps == [100, 108, 116, 124, 124, 126]
+
+
+def test_grid_timestamp_lost_event() -> None:
+    """
+    The grid is resynced to the arrival once lost events leave it behind the tolerance
+    """
+    stamps = [gridTimestamp(None, 0, 8, 16)]
+    # Events every 8 with a lost one at 16, and then every other event lost
+    for now in [8, 24, 32, 48, 64, 72]:
+        stamps.append(gridTimestamp(stamps[-1], now, 8, 16))
+    assert stamps == [0, 8, 16, 24, 32, 64, 72]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from src.managers.liveManager import LiveManager
+from src.handlers.sensorGroup import SensorGroup
+from src.handlers.sensor import Sensor
+from src.enums.sensorStatus import SStatus
+from src.enums.sensorTypes import SGTypes
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+class DriverMock:
+    def __init__(self, serial: int, channel: int) -> None:
+        pass
+
+
+class ValuesProviderMock:
+    def __init__(self) -> None:
+        self.times = np.arange(0, 10**12, 10**7, dtype=np.int64)
+        self.size = 0
+
+    def record(self, amount: int) -> None:
+        self.size += amount
+
+    def getNewValues(self, start: int) -> tuple[int, np.ndarray, dict]:
+        values = np.ones(self.size - start)
+        return start, self.times[start : self.size], {"z1": values, "z2": values}
+
+
+def buildSensor(id: str, name: str) -> Sensor:
+    sensor = Sensor()
+    sensor.setup(
+        id,
+        {
+            "name": name,
+            "type": "SENSOR_LOADCELL",
+            "read": True,
+            "connection": {"serial": 0, "channel": 0},
+            "calibration": {"slope": 2, "intercept": 1},
+        },
+        DriverMock,
+    )
+    sensor.status = SStatus.AVAILABLE
+    return sensor
+
+
+@pytest.fixture
+def live_manager() -> LiveManager:
+    group = SensorGroup("platform", "Platform", SGTypes.GROUP_PLATFORM)
+    group.addSensor(buildSensor("z1", "P_Z_1"))
+    group.addSensor(buildSensor("z2", "P_Z_2"))
+    live_manager = LiveManager()
+    live_manager.setup([group])
+    return live_manager
+
+
+# Tests
+
+
+def test_live_options(live_manager: LiveManager) -> None:
+    assert live_manager.getOptions() == ["Platform_TOTAL_FZ", "P_Z_1", "P_Z_2"]
+
+
+def test_live_update(live_manager: LiveManager) -> None:
+    values_provider = ValuesProviderMock()
+    values_provider.record(10)
+    live_manager.update(values_provider)
+    assert live_manager.getSize() == 10
+    assert np.concatenate(live_manager.traces["P_Z_1"]).tolist() == [3] * 10
+    assert np.concatenate(live_manager.traces["Platform_TOTAL_FZ"]).tolist() == [6] * 10
+    assert np.concatenate(live_manager.times)[-1] == 0.09
+
+
+def test_live_decimation(live_manager: LiveManager) -> None:
+    """
+    Each refresh adds a fixed amount of points, and old points leave the window
+    """
+    values_provider = ValuesProviderMock()
+    for _ in range(40):
+        values_provider.record(1000)
+        live_manager.update(values_provider)
+        assert len(live_manager.times[-1]) == live_manager.refresh_points
+    assert live_manager.getSize() == 40000
+    assert live_manager.window_size == live_manager.window_points
+    assert len(live_manager.traces["P_Z_1"]) == len(live_manager.times)
+    assert np.concatenate(live_manager.times)[-1] == 399.99
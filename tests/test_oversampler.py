@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+
+from src.handlers.oversampler import Oversampler
+from src.enums.oversamplingTypes import OversamplingTypes
+
+
+# General mocks, builders and fixtures
+
+
+def buildBins(
+    values: np.ndarray, bin_size: int, period_ns: int = 1000000
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    times = np.arange(len(values), dtype=np.int64) * period_ns
+    return [
+        (times[first : first + bin_size], values[first : first + bin_size])
+        for first in range(0, len(values), bin_size)
+    ]
+
+
+# Tests
+
+
+def test_oversampler_empty_bin() -> None:
+    oversampler = Oversampler(OversamplingTypes.MEAN, 10)
+    assert oversampler.reduce(np.empty(0, dtype=np.int64), np.empty((0, 1))) is None
+
+
+def test_oversampler_mean() -> None:
+    oversampler = Oversampler(OversamplingTypes.MEAN, 10)
+    assert oversampler.reduce(np.arange(4), np.array([[1], [2], [3], [6]])) == 3
+
+
+def test_oversampler_latest() -> None:
+    oversampler = Oversampler(OversamplingTypes.NONE, 10)
+    assert oversampler.reduce(np.arange(3), np.array([[1], [2], [5]])) == 5
+
+
+def test_oversampler_width() -> None:
+    oversampler = Oversampler(OversamplingTypes.MEAN, 10, width=2)
+    value = oversampler.reduce(np.arange(2), np.array([[1, 10], [3, 20]]))
+    assert value.tolist() == [2, 15]
+
+
+def test_oversampler_fir_constant() -> None:
+    pytest.importorskip("scipy.signal")
+    oversampler = Oversampler(OversamplingTypes.FIR, 10)
+    for times, values in buildBins(np.full((100, 1), 4.0), 10):
+        assert oversampler.reduce(times, values) == pytest.approx(4)
+    assert len(oversampler.taps) == 41
+
+
+def test_oversampler_fir_anti_alias() -> None:
+    """
+    A vibration above the record Nyquist frequency is removed instead of aliased
+    """
+    pytest.importorskip("scipy.signal")
+    times = np.arange(5000) / 1000
+    vibration = np.sin(2 * np.pi * 230 * times).reshape(-1, 1)
+    reduced = {}
+    for mode in OversamplingTypes:
+        oversampler = Oversampler(mode, 10)
+        reduced[mode] = np.array(
+            [oversampler.reduce(*batch) for batch in buildBins(vibration, 10)]
+        )[10:]
+    assert np.std(reduced[OversamplingTypes.NONE]) > 0.5
+    assert np.std(reduced[OversamplingTypes.FIR]) < 0.01
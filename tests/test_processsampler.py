@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+import time
+import yaml
+import numpy as np
+
+from src.managers.sensorManager import SensorManager
+from src.handlers.processSampler import ProcessSampler
+
+
+# General mocks, builders and fixtures
+
+SENSORS_YAML = """
+sim_1:
+  name: Simulated 1
+  type: SENSOR_SIM
+  read: true
+  connection:
+    serial: 1
+  simulation:
+    waveform: constant
+    amplitude: 2
+    offset: 5
+    rate_hz: 1000
+"""
+
+
+# Tests
+
+
+def test_sampler_simulated_params() -> None:
+    """
+    Simulated drivers are recreated in the sampler process with their params
+    """
+    sensor_mngr = SensorManager()
+    sensor_mngr.config_sensors = yaml.safe_load(SENSORS_YAML)
+    sensor = sensor_mngr.loadSensor("sim_1")
+    sampler = ProcessSampler()
+    assert sampler.start([sensor], interval_ms=5)
+    times = np.empty(0)
+    deadline = time.perf_counter() + 10
+    while len(times) < 10 and time.perf_counter() < deadline:
+        time.sleep(0.05)
+        new_times, new_values, lost = sampler.readTicks()
+        times = np.concatenate([times, new_times])
+        values = new_values[:, sampler.getColumns("sim_1")]
+        assert (values == 7).all()
+    sampler.stop()
+    sampler.close()
+    assert len(times) >= 10
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import json
+import pytest
+import numpy as np
+
+from src.handlers.readTrace import (
+    ReadTrace,
+    getBuckets,
+    getBucketValues,
+    getChromeTrace,
+    exportChromeTrace,
+)
+
+
+# Tests
+
+
+def test_buckets_exact_small_values() -> None:
+    values = np.arange(128)
+    assert getBuckets(values).tolist() == values.tolist()
+    assert getBucketValues(getBuckets(values)).tolist() == values.tolist()
+
+
+def test_buckets_relative_error() -> None:
+    """
+    Bucket values are at most 1/64 lower than the recorded values
+    """
+    values = np.unique(np.geomspace(128, 10**12, 5000).astype(np.int64))
+    lowest = getBucketValues(getBuckets(values))
+    assert np.all(lowest <= values)
+    assert np.all((values - lowest) / values < 1 / 64)
+
+
+def test_buckets_monotonic() -> None:
+    values = np.arange(0, 10**6, 7)
+    assert np.all(np.diff(getBuckets(values)) >= 0)
+
+
+def test_read_trace_summary() -> None:
+    trace = ReadTrace(capacity=1024, fold_size=256)
+    for i in range(1000):
+        trace.add(i * 1000, 1000000 if i < 990 else 5000000)
+    summary = trace.getSummary()
+    assert summary["reads"] == 1000
+    assert summary["p50_ms"] == pytest.approx(1, rel=0.02)
+    assert summary["p999_ms"] == pytest.approx(5, rel=0.02)
+    assert summary["max_ms"] == 5
+
+
+def test_read_trace_ring() -> None:
+    """
+    Only the latest reads are kept for traces, every read is in the histogram
+    """
+    trace = ReadTrace(capacity=100, fold_size=64)
+    assert trace.capacity == 128
+    for i in range(300):
+        trace.add(i, 10)
+    starts, durations = trace.getReads()
+    assert starts.tolist() == list(range(172, 300))
+    assert trace.getSummary()["reads"] == 300
+
+
+def test_chrome_trace(tmp_path) -> None:
+    trace = ReadTrace()
+    trace.add(2000, 500)
+    trace.add(12000, 1500)
+    path = tmp_path / "trace.json"
+    exportChromeTrace({"Sensor": trace}, 1000, path)
+    with open(path) as file:
+        content = json.load(file)
+    assert content == getChromeTrace({"Sensor": trace}, 1000)
+    events = content["traceEvents"]
+    assert events[0]["args"]["name"] == "Sensor"
+    assert [(event["ts"], event["dur"]) for event in events[1:]] == [
+        (1, 0.5),
+        (11, 1.5),
+    ]
+    assert content["otherData"]["Sensor"]["reads"] == 2
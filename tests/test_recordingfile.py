@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.recordingFile import (
+    RecordingWriter,
+    RecordingReader,
+    TICKS_STREAM,
+    eventsStream,
+    findUnfinishedRecordings,
+    finishRecording,
+    BLOCK_HEADER,
+)
+import numpy as np
+import pytest
+import os
+import json
+
+
+# General mocks, builders and fixtures
+
+
+def buildStreams() -> dict[str, list[dict]]:
+    loadcell = {"id": "lc", "name": "LoadCell", "type": "SENSOR_LOADCELL", "width": 1}
+    imu = {"id": "imu", "name": "IMU", "type": "SENSOR_IMU", "width": 10}
+    return {TICKS_STREAM: [loadcell, imu], eventsStream("lc"): [loadcell]}
+
+
+@pytest.fixture
+def recording_path(tmp_path) -> str:
+    """
+    Recording with two ticks blocks of 3 and 2 rows and one events block
+    """
+    path = str(tmp_path / "test.fpr")
+    writer = RecordingWriter()
+    assert writer.open(path, buildStreams())
+    writer.write(
+        TICKS_STREAM, np.arange(3), [np.arange(3.0), np.ones((3, 10)) * [range(10)]]
+    )
+    writer.write(eventsStream("lc"), np.array([5, 6]), [np.array([0.5, 0.6])])
+    writer.write(
+        TICKS_STREAM, np.arange(3, 5), [np.arange(3.0, 5.0), np.zeros((2, 10))]
+    )
+    writer.close()
+    return path
+
+
+# Tests
+
+
+def test_recording_streams(recording_path: str) -> None:
+    reader = RecordingReader(recording_path)
+    assert reader.getStreams() == [TICKS_STREAM, eventsStream("lc")]
+    assert reader.getSize(TICKS_STREAM) == 5
+
+
+def test_recording_read_times(recording_path: str) -> None:
+    reader = RecordingReader(recording_path)
+    assert reader.getTimes(TICKS_STREAM).tolist() == [0, 1, 2, 3, 4]
+    assert reader.getTimes(eventsStream("lc")).tolist() == [5, 6]
+
+
+def test_recording_read_channels(recording_path: str) -> None:
+    reader = RecordingReader(recording_path)
+    assert reader.getChannel(TICKS_STREAM, "lc").tolist() == [0, 1, 2, 3, 4]
+    imu_values = reader.getChannel(TICKS_STREAM, "imu")
+    assert imu_values.shape == (5, 10)
+    assert imu_values[0].tolist() == list(range(10))
+    assert reader.getChannel(eventsStream("lc"), "lc").tolist() == [0.5, 0.6]
+
+
+def test_recording_incomplete_block(recording_path: str) -> None:
+    """
+    An interrupted block at the end of the file is ignored
+    """
+    finished_size = BLOCK_HEADER.size + len(json.dumps({"finished": True}))
+    with open(recording_path, "r+b") as file:
+        file.seek(0, 2)
+        file.truncate(file.tell() - finished_size - 8)
+    reader = RecordingReader(recording_path)
+    assert reader.getTimes(TICKS_STREAM).tolist() == [0, 1, 2]
+    assert not reader.isFinished()
+
+
+def test_recording_dtype(tmp_path) -> None:
+    path = str(tmp_path / "test.fpr")
+    writer = RecordingWriter()
+    writer.open(path, buildStreams(), "float32")
+    writer.write(TICKS_STREAM, np.arange(2), [np.arange(2.0), np.zeros((2, 10))])
+    writer.close()
+    values = RecordingReader(path).getChannel(TICKS_STREAM, "lc")
+    assert values.dtype == np.float32
+    assert values.tolist() == [0, 1]
+
+
+def test_recording_invalid_file(tmp_path) -> None:
+    path = tmp_path / "invalid.fpr"
+    path.write_bytes(b"0" * 64)
+    with pytest.raises(ValueError):
+        RecordingReader(str(path))
+
+
+def test_recording_read_range(recording_path: str) -> None:
+    """
+    Rows are selected by time across block boundaries
+    """
+    reader = RecordingReader(recording_path)
+    start, stop = reader.getRange(TICKS_STREAM, 1, 4)
+    assert (start, stop) == (1, 4)
+    assert reader.getTimes(TICKS_STREAM, start, stop).tolist() == [1, 2, 3]
+    assert reader.getChannel(TICKS_STREAM, "lc", start, stop).tolist() == [1, 2, 3]
+    assert reader.getRange(TICKS_STREAM, 10) == (5, 5)
+
+
+def test_recording_metadata(tmp_path) -> None:
+    path = str(tmp_path / "test.fpr")
+    writer = RecordingWriter()
+    writer.open(path, buildStreams(), metadata={"interval_ms": 10, "groups": []})
+    writer.write(TICKS_STREAM, np.arange(2), [np.arange(2.0), np.zeros((2, 10))])
+    writer.writeMetadata({"calibration": {"lc": {"intercept": -1.0}}})
+    writer.writeMetadata({"dropouts": {"lc": 3}})
+    writer.close()
+    reader = RecordingReader(path)
+    assert reader.getIntervalMs() == 10
+    assert reader.getMetadata()["dropouts"] == {"lc": 3}
+    assert reader.getChannels(TICKS_STREAM)[0]["intercept"] == -1.0
+    assert "intercept" not in reader.getChannels(TICKS_STREAM)[1]
+    assert reader.getSize(TICKS_STREAM) == 2
+
+
+def test_recording_finished(recording_path: str) -> None:
+    reader = RecordingReader(recording_path)
+    assert reader.isFinished()
+    assert findUnfinishedRecordings(str(os.path.dirname(recording_path))) == []
+
+
+def test_recording_recovery(tmp_path) -> None:
+    """
+    An interrupted recording is found, and finishing it keeps its complete blocks
+    """
+    path = str(tmp_path / "test.fpr")
+    writer = RecordingWriter()
+    writer.open(path, buildStreams())
+    writer.write(TICKS_STREAM, np.arange(2), [np.arange(2.0), np.zeros((2, 10))])
+    # Still being written by this process
+    assert findUnfinishedRecordings(str(tmp_path)) == []
+    writer.blocks_queue.put(None)
+    writer.write_thread.join()
+    writer.file.write(b"incomplete")
+    writer.file.close()
+    RecordingWriter.open_paths.discard(path)
+    assert findUnfinishedRecordings(str(tmp_path)) == [path]
+    assert finishRecording(path, {"recovered": True})
+    assert findUnfinishedRecordings(str(tmp_path)) == []
+    reader = RecordingReader(path)
+    assert reader.getEnd() == os.path.getsize(path)
+    assert reader.getTimes(TICKS_STREAM).tolist() == [0, 1]
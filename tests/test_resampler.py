@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.resampler import getCommonGrid, resample, slerp
+from src.enums.alignmentTypes import AlignmentTypes
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+def zRotations(degrees: list[float]) -> np.ndarray:
+    """
+    Quaternions (x, y, z, w) of rotations about the z axis
+    """
+    half = np.radians(degrees) / 2
+    return np.stack(
+        [np.zeros_like(half), np.zeros_like(half), np.sin(half), np.cos(half)], axis=1
+    )
+
+
+@pytest.fixture
+def stream() -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stream of 4 values of 2 columns at irregular times
+    """
+    times = np.array([0, 10, 30, 40], dtype=np.int64)
+    values = np.array([[0.0, 0.0], [1.0, 10.0], [3.0, 30.0], [4.0, 40.0]])
+    return times, values
+
+
+# Tests
+
+
+def test_common_grid() -> None:
+    """
+    The grid only covers the time range of every stream
+    """
+    grid = getCommonGrid([np.arange(0, 100), np.arange(25, 200)], 10)
+    assert grid.tolist() == [25, 35, 45, 55, 65, 75, 85, 95]
+    assert len(getCommonGrid([np.arange(0, 10), np.arange(20, 30)], 10)) == 0
+
+
+def test_resample_linear(stream) -> None:
+    grid = np.array([0, 5, 20, 35, 40])
+    result = resample(*stream, grid, AlignmentTypes.LINEAR)
+    assert result[:, 0].tolist() == [0, 0.5, 2, 3.5, 4]
+    assert result[:, 1].tolist() == [0, 5, 20, 35, 40]
+
+
+def test_resample_nearest(stream) -> None:
+    grid = np.array([4, 6, 19, 21, 40])
+    result = resample(*stream, grid, AlignmentTypes.NEAREST)
+    assert result[:, 0].tolist() == [0, 1, 1, 3, 4]
+
+
+def test_resample_zoh(stream) -> None:
+    grid = np.array([0, 9, 10, 29, 40])
+    result = resample(*stream, grid, AlignmentTypes.ZOH)
+    assert result[:, 0].tolist() == [0, 0, 1, 1, 4]
+
+
+def test_resample_single_value() -> None:
+    result = resample(
+        np.array([5]), np.array([2.0]), np.array([5, 5]), AlignmentTypes.LINEAR
+    )
+    assert result.tolist() == [2, 2]
+
+
+def test_slerp() -> None:
+    """
+    Halfway between two rotations about the same axis is half the rotation
+    """
+    times = np.array([0, 100], dtype=np.int64)
+    rotations = zRotations([0, 90])
+    result = slerp(times, rotations, np.array([0, 50, 100]))
+    angles = np.degrees(2 * np.arctan2(result[:, 2], result[:, 3]))
+    assert angles == pytest.approx([0, 45, 90])
+    assert np.linalg.norm(result, axis=1) == pytest.approx(1)
+
+
+def test_slerp_shortest_path() -> None:
+    """
+    Opposite quaternions are the same rotation
+    """
+    times = np.array([0, 100], dtype=np.int64)
+    rotation = zRotations([30])[0]
+    result = slerp(times, np.array([rotation, -rotation]), np.array([50]))
+    assert np.abs(np.sum(result[0] * rotation)) == pytest.approx(1)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.runningMean import RunningMean
+import numpy as np
+import pytest
+
+
+# Tests
+
+
+def test_running_mean_empty() -> None:
+    running_mean = RunningMean(size=4)
+    assert running_mean.getMean() is None
+    assert running_mean.getCount() == 0
+
+
+def test_running_mean_window() -> None:
+    """
+    Only the latest values are averaged
+    """
+    running_mean = RunningMean(size=4)
+    for value in range(10):
+        running_mean.add(value)
+    assert running_mean.getCount() == 4
+    assert running_mean.getMean() == pytest.approx(7.5)
+    assert running_mean.getValues().tolist() == [6, 7, 8, 9]
+
+
+def test_running_mean_missing_values() -> None:
+    running_mean = RunningMean(size=4)
+    running_mean.add(None)
+    running_mean.add(np.nan)
+    running_mean.extend(np.array([1.0, np.nan, 3.0]))
+    assert running_mean.getCount() == 2
+    assert running_mean.getMean() == pytest.approx(2)
+
+
+def test_running_mean_extend() -> None:
+    """
+    Extending matches adding each value, across ring wraps
+    """
+    values = np.random.default_rng(0).normal(size=1000)
+    added = RunningMean(size=64)
+    extended = RunningMean(size=64)
+    for value in values:
+        added.add(value)
+    for chunk in np.array_split(values, 37):
+        extended.extend(chunk)
+        assert extended.getMean() == pytest.approx(
+            np.mean(extended.getValues()), abs=1e-12
+        )
+    assert extended.getValues().tolist() == added.getValues().tolist()
+    assert extended.getMean() == pytest.approx(np.mean(values[-64:]))
+
+
+def test_running_mean_resize() -> None:
+    running_mean = RunningMean(size=8)
+    running_mean.extend(np.arange(8.0))
+    running_mean.resize(3)
+    assert running_mean.getValues().tolist() == [5, 6, 7]
+    assert running_mean.getMean() == pytest.approx(6)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.sampleBuffer import SampleBuffer
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def buffer_single() -> SampleBuffer:
+    return SampleBuffer(chunk_size=4)
+
+
+@pytest.fixture
+def buffer_multiple() -> SampleBuffer:
+    return SampleBuffer(width=3, chunk_size=4)
+
+
+# Tests
+
+
+def test_buffer_append_values(buffer_single: SampleBuffer) -> None:
+    buffer_single.append(1.5)
+    buffer_single.append(2.5)
+    assert len(buffer_single) == 2
+    assert buffer_single.getValues().tolist() == [1.5, 2.5]
+
+
+def test_buffer_append_rows(buffer_multiple: SampleBuffer) -> None:
+    buffer_multiple.append([1, 2, 3])
+    buffer_multiple.append([4, 5, 6])
+    assert buffer_multiple.getValues().shape == (2, 3)
+    assert buffer_multiple.getValues()[:, 1].tolist() == [2, 5]
+
+
+def test_buffer_grow_keeps_values(buffer_single: SampleBuffer) -> None:
+    [buffer_single.append(i) for i in range(10)]
+    assert buffer_single.getValues().tolist() == list(range(10))
+    assert len(buffer_single.data) % buffer_single.chunk_size == 0
+
+
+def test_buffer_values_are_views(buffer_single: SampleBuffer) -> None:
+    buffer_single.append(1)
+    assert np.shares_memory(buffer_single.getValues(), buffer_single.data)
+
+
+def test_buffer_extend_values(buffer_multiple: SampleBuffer) -> None:
+    buffer_multiple.append([0, 0, 0])
+    buffer_multiple.extend(np.ones((9, 3)))
+    assert len(buffer_multiple) == 10
+    assert buffer_multiple.getValues()[1:].sum() == 27
+
+
+def test_buffer_invalid_values(buffer_multiple: SampleBuffer) -> None:
+    buffer_multiple.append([])
+    buffer_multiple.append(None)
+    assert len(buffer_multiple) == 2
+    assert np.isnan(buffer_multiple.getValues()).all()
+
+
+def test_buffer_dtype() -> None:
+    buffer = SampleBuffer(dtype=np.float32)
+    buffer.append(1)
+    assert buffer.getValues().dtype == np.float32
+    assert buffer.getNBytes() == 4
+
+
+def test_buffer_clear(buffer_single: SampleBuffer) -> None:
+    [buffer_single.append(i) for i in range(10)]
+    buffer_single.clear()
+    assert len(buffer_single) == 0
+    assert buffer_single.getValues().tolist() == []
+
+
+def test_buffer_discard(buffer_multiple: SampleBuffer) -> None:
+    """
+    Only the newest rows are kept, and the buffer keeps growing after them
+    """
+    buffer_multiple.extend(np.arange(30).reshape(10, 3))
+    buffer_multiple.discard(7)
+    assert buffer_multiple.getValues().tolist() == [
+        [21, 22, 23],
+        [24, 25, 26],
+        [27, 28, 29],
+    ]
+    buffer_multiple.append([1, 2, 3])
+    assert len(buffer_multiple) == 4
+    buffer_multiple.discard(10)
+    assert len(buffer_multiple) == 0
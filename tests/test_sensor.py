@@ -1,9 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from src.handlers.sensor import Sensor, Driver
+from src.handlers.readTrace import ReadTrace
+from src.handlers.tickClock import TickClock
+from src.handlers.oversampler import Oversampler
+from src.enums.oversamplingTypes import OversamplingTypes
 from src.enums.sensorStatus import SStatus
 from src.enums.sensorParams import SParams
 from src.enums.sensorTypes import STypes
+import numpy as np
 import pytest
 
 
@@ -14,7 +19,7 @@ class AvailableDriverMock:
     def __init__(self, serial: int, channel: int) -> None:
         pass
 
-    def connect(self, check: bool = False):
+    def connect(self, wait_ms: int = 2000, interval_ms: int = 8):
         return True
 
     def disconnect(self):
@@ -28,7 +33,7 @@ class UnavailableDriverMock:
     def __init__(self, serial: int, channel: int) -> None:
         pass
 
-    def connect(self, check: bool = False):
+    def connect(self, wait_ms: int = 2000, interval_ms: int = 8):
         return False
 
 
@@ -144,7 +149,7 @@ def test_available_sensor_register_values(sensor_av: Sensor) -> None:
     sensor_av.connect()
     sensor_av.registerValue()
     sensor_av.registerValue()
-    assert sensor_av.getValues() == [10, 10]
+    assert sensor_av.getValues().tolist() == [10, 10]
 
 
 def test_unavailable_sensor_register_values(sensor_unav: Sensor) -> None:
@@ -152,7 +157,7 @@ def test_unavailable_sensor_register_values(sensor_unav: Sensor) -> None:
     sensor_unav.connect()
     sensor_unav.registerValue()
     sensor_unav.registerValue()
-    assert sensor_unav.getValues() == []
+    assert sensor_unav.getValues().tolist() == []
 
 
 def test_clear_registered_values(sensor_av: Sensor) -> None:
@@ -161,7 +166,7 @@ def test_clear_registered_values(sensor_av: Sensor) -> None:
     sensor_av.registerValue()
     sensor_av.registerValue()
     sensor_av.clearValues()
-    assert sensor_av.getValues() == []
+    assert sensor_av.getValues().tolist() == []
 
 
 def test_sensor_modify_read_status(sensor_av: Sensor) -> None:
@@ -177,3 +182,214 @@ def test_sensor_modify_slope_param(sensor_av: Sensor) -> None:
 def test_sensor_modify_intercept_param(sensor_av: Sensor) -> None:
     sensor_av.setIntercept(intercept=-2.5)
     assert sensor_av.getIntercept() == -2.5
+
+
+class MissingValueDriverMock(AvailableDriverMock):
+    def getValue(self):
+        return None
+
+
+def test_sensor_register_values_dtype() -> None:
+    sensor = Sensor(dtype=np.float32)
+    setupSensor(sensor, "test_id", True, AvailableDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    sensor.registerValue()
+    assert sensor.getValues().dtype == np.float32
+
+
+def test_sensor_register_missing_values() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, MissingValueDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    sensor.registerValue()
+    assert np.isnan(sensor.getValues()).all()
+
+
+class CaptureDriverMock(AvailableDriverMock):
+    def __init__(self, serial: int, channel: int) -> None:
+        self.capture = False
+
+    def setCapture(self, capture: bool) -> None:
+        self.capture = capture
+
+    def readBatch(self):
+        return np.array([1, 2]), np.array([[5.0], [6.0]])
+
+
+def test_sensor_read_batch_clock() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CaptureDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    clock = TickClock()
+    clock.start()
+    timestamps, _ = sensor.readBatch(clock)
+    assert timestamps.tolist() == [clock.fromCounter(1), clock.fromCounter(2)]
+
+
+def test_sensor_capture_unsupported(sensor_av: Sensor) -> None:
+    assert sensor_av.setCapture(True) == False
+
+
+def test_sensor_register_events() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CaptureDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    assert sensor.setCapture(True) == True
+    sensor.registerEvents()
+    sensor.registerEvents()
+    timestamps, values = sensor.getEvents()
+    assert timestamps.tolist() == [1, 2, 1, 2]
+    assert values.tolist() == [5, 6, 5, 6]
+    sensor.clearValues()
+    assert len(sensor.getEvents()[0]) == 0
+
+
+def test_sensor_read_batch_fallback(sensor_av: Sensor) -> None:
+    """
+    Drivers without readBatch return their current value as a single row batch
+    """
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    timestamps, values = sensor_av.readBatch()
+    assert timestamps.dtype == np.int64 and len(timestamps) == 1
+    assert values.tolist() == [[10]]
+
+
+def test_sensor_read_batch_missing_value() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, MissingValueDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    assert np.isnan(sensor.readBatch()[1]).all()
+
+
+def test_sensor_read_batch_not_available(sensor_unav: Sensor) -> None:
+    sensor_unav.checkConnection()
+    timestamps, values = sensor_unav.readBatch()
+    assert len(timestamps) == 0 and values.shape == (0, 1)
+
+
+def test_sensor_read_trace(sensor_av: Sensor) -> None:
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    sensor_av.setReadTrace(ReadTrace())
+    sensor_av.registerValue()
+    sensor_av.registerValue()
+    assert len(sensor_av.read_trace) == 2
+    sensor_av.setReadTrace(None)
+    sensor_av.registerValue()
+    assert len(sensor_av.getValues()) == 3
+
+
+def test_sensor_swap_values(sensor_av: Sensor) -> None:
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    sensor_av.registerValue()
+    values = sensor_av.swapValues()
+    sensor_av.registerValue()
+    assert values.getValues().tolist() == [10]
+    assert sensor_av.getValues().tolist() == [10]
+
+
+def test_sensor_keep_connection_open() -> None:
+    """
+    A handle kept open by the connection check is reused by the next connect
+    """
+
+    class CountingDriverMock(AvailableDriverMock):
+        connections = 0
+
+        def connect(self, wait_ms: int = 2000, interval_ms: int = 8):
+            CountingDriverMock.connections += 1
+            return True
+
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CountingDriverMock)
+    assert sensor.checkConnection(keep_open=True)
+    assert sensor.connect()
+    assert CountingDriverMock.connections == 1
+    sensor.disconnect()
+    assert sensor.connect()
+    assert CountingDriverMock.connections == 2
+
+
+def test_sensor_dropouts(sensor_av: Sensor) -> None:
+    """
+    Dropouts keep the timeline aligned with NaN values
+    """
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    sensor_av.addValue(sensor_av.readValue())
+    sensor_av.addDropout()
+    assert sensor_av.getValues()[0] == 10
+    assert np.isnan(sensor_av.getValues()[1])
+    assert sensor_av.getDropouts() == 1
+    sensor_av.addDropouts(3)
+    assert sensor_av.getDropouts() == 4
+    sensor_av.clearValues()
+    assert sensor_av.getDropouts() == 0
+
+
+def test_sensor_data_interval() -> None:
+    """
+    The data interval is set on connection, and open handles reconnect to apply it
+    """
+
+    class IntervalDriverMock(AvailableDriverMock):
+        intervals = []
+
+        def connect(self, wait_ms: int = 2000, interval_ms: int = 8):
+            IntervalDriverMock.intervals.append(interval_ms)
+            return True
+
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, IntervalDriverMock)
+    assert sensor.checkConnection(keep_open=True)
+    sensor.setDataInterval(8)
+    assert sensor.connected
+    sensor.setDataInterval(0)
+    assert not sensor.connected
+    assert sensor.connect()
+    assert IntervalDriverMock.intervals == [8, 0]
+
+
+def test_sensor_oversampler() -> None:
+    sensor = Sensor()
+    setupSensor(sensor, "test_id", True, CaptureDriverMock)
+    sensor.checkConnection()
+    sensor.connect()
+    assert sensor.setOversampler(Oversampler(OversamplingTypes.MEAN, 10))
+    assert sensor.driver.capture == True
+    sensor.registerValue()
+    assert sensor.setOversampler(None)
+    assert sensor.driver.capture == False
+    sensor.registerValue()
+    assert sensor.getValues().tolist() == [5.5, 10]
+
+
+def test_sensor_oversampler_imu() -> None:
+    """
+    IMU quaternions are not oversampled
+    """
+    sensor = Sensor()
+    params = buildSensorParamsDict()
+    params[SParams.TYPE.value] = "SENSOR_IMU"
+    sensor.setup("test_id", params, CaptureDriverMock)
+    assert sensor.canCapture()
+    assert not sensor.setOversampler(Oversampler(OversamplingTypes.MEAN, 10))
+    assert sensor.oversampler is None
+
+
+def test_sensor_oversampler_unsupported(sensor_av: Sensor) -> None:
+    """
+    Drivers without capture keep reading their latest value
+    """
+    sensor_av.checkConnection()
+    sensor_av.connect()
+    assert not sensor_av.setOversampler(Oversampler(OversamplingTypes.MEAN, 10))
+    sensor_av.registerValue()
+    assert sensor_av.getValues().tolist() == [10]
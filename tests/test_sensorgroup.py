@@ -30,7 +30,7 @@ class SensorMock:
     def disconnect(self) -> None:
         pass
 
-    def checkConnection(self) -> bool:
+    def checkConnection(self, keep_open: bool = False) -> bool:
         self.connection_checked = True
         return self.status == SStatus.AVAILABLE
 
@@ -240,3 +240,14 @@ def test_group_clear_values(sensor_group_filled: SensorGroup) -> None:
 def test_group_modify_read_status(sensor_group_filled: SensorGroup) -> None:
     sensor_group_filled.setRead(False)
     assert sensor_group_filled.getRead() == False
+
+
+def test_group_interval(sensor_group_single: SensorGroup) -> None:
+    """
+    Groups use the test interval unless they set their own one
+    """
+    assert sensor_group_single.getInterval() is None
+    assert sensor_group_single.getInfo()["interval_ms"] is None
+    sensor_group_single.setInterval(2)
+    assert sensor_group_single.getInterval() == 2
+    assert sensor_group_single.getInfo()["interval_ms"] == 2
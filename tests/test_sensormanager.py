@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import subprocess
+import yaml
+import pytest
+
+from src.managers.sensorManager import SensorManager
+from src.enums.sensorTypes import STypes
+
+
+# General mocks, builders and fixtures
+
+SENSORS_YAML = """
+sim_1:
+  name: Simulated 1
+  type: SENSOR_SIM
+  read: true
+  connection:
+    serial: 1
+  calibration:
+    slope: 2
+    intercept: 0
+  simulation:
+    waveform: constant
+    amplitude: 2
+    offset: 1
+    rate_hz: 1000
+sim_2:
+  name: Simulated 2
+  type: SENSOR_SIM
+  read: true
+  connection:
+    serial: 2
+  simulation:
+    waveform: unknown
+sim_3:
+  name: Simulated 3
+  type: SENSOR_SIM
+  read: true
+  connection:
+    channel: 0
+"""
+
+
+@pytest.fixture
+def sensor_mngr() -> SensorManager:
+    sensor_mngr = SensorManager()
+    sensor_mngr.config_sensors = yaml.safe_load(SENSORS_YAML)
+    return sensor_mngr
+
+
+# Tests
+
+
+def test_load_simulated_sensor(sensor_mngr: SensorManager) -> None:
+    """
+    Simulated sensors are built from their YAML simulation params
+    """
+    sensor = sensor_mngr.loadSensor("sim_1")
+    assert sensor.getType() == STypes.SENSOR_SIM
+    assert sensor.getName() == "Simulated 1"
+    assert sensor.getSlope() == 2
+    assert sensor.driver.amplitude == 2 and sensor.driver.offset == 1
+    assert sensor.driver.rate_hz == 1000
+    assert sensor.checkConnection() == True
+    sensor.connect(check=True)
+    assert sensor.readValue() == 3
+    sensor.disconnect()
+
+
+def test_load_simulated_sensor_invalid(sensor_mngr: SensorManager) -> None:
+    assert sensor_mngr.loadSensor("sim_2") is None
+    assert sensor_mngr.loadSensor("sim_3") is None
+
+
+def test_drivers_imported_on_use() -> None:
+    """
+    Simulated sensors do not import the hardware drivers, checked in a new interpreter
+    """
+    code = (
+        "import sys; from src.handlers import drivers; drivers.SimulatedSensor;"
+        + " print(any(name in sys.modules for name in"
+        + " ['src.handlers.drivers.taoboticsIMU', 'src.handlers.drivers.phidgetLoadCell']))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.sessionPool import SessionPool
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+class SensorMock:
+    def __init__(self, healthy: bool = True) -> None:
+        self.connected = True
+        self.healthy = healthy
+
+    def isHealthy(self) -> bool:
+        return self.connected and self.healthy
+
+    def disconnect(self) -> None:
+        self.connected = False
+
+    def getName(self) -> str:
+        return "Sensor"
+
+
+@pytest.fixture
+def session_pool():
+    session_pool = SessionPool(idle_timeout_s=60, check_interval_s=60)
+    yield session_pool
+    session_pool.close()
+
+
+# Tests
+
+
+def test_session_pool_reuse(session_pool: SessionPool) -> None:
+    sensor = SensorMock()
+    session_pool.release([sensor])
+    assert session_pool.getSize() == 1
+    session_pool.acquire([sensor])
+    assert session_pool.getSize() == 0
+    assert sensor.connected
+
+
+def test_session_pool_unhealthy(session_pool: SessionPool) -> None:
+    """
+    Unhealthy sessions are closed when acquired, so the sensor reconnects
+    """
+    sensor = SensorMock(healthy=False)
+    session_pool.release([sensor])
+    session_pool.acquire([sensor])
+    assert not sensor.connected
+
+
+def test_session_pool_idle_timeout(session_pool: SessionPool) -> None:
+    sensors = [SensorMock(), SensorMock()]
+    session_pool.release(sensors)
+    session_pool.checkSessions()
+    assert session_pool.getSize() == 2
+    session_pool.setIdleTimeout(0)
+    session_pool.checkSessions()
+    assert session_pool.getSize() == 0
+    assert not any(sensor.connected for sensor in sensors)
+
+
+def test_session_pool_disconnected(session_pool: SessionPool) -> None:
+    sensor = SensorMock()
+    sensor.connected = False
+    session_pool.release([sensor])
+    assert session_pool.getSize() == 0
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.sharedRingBuffer import SharedRingBuffer
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def ring_buffer():
+    ring_buffer = SharedRingBuffer(width=2, capacity=4)
+    yield ring_buffer
+    ring_buffer.close()
+
+
+def writeRows(ring_buffer: SharedRingBuffer, timestamps: range) -> None:
+    for timestamp in timestamps:
+        ring_buffer.getRow()[:] = [timestamp, -timestamp]
+        ring_buffer.commit(timestamp)
+
+
+# Tests
+
+
+def test_ring_buffer_read(ring_buffer: SharedRingBuffer) -> None:
+    writeRows(ring_buffer, range(3))
+    times, values, lost = ring_buffer.read()
+    assert times.tolist() == [0, 1, 2]
+    assert values[:, 1].tolist() == [0, -1, -2]
+    assert lost == 0
+    # Only new rows are read
+    writeRows(ring_buffer, range(3, 5))
+    assert ring_buffer.read()[0].tolist() == [3, 4]
+    assert len(ring_buffer.read()[0]) == 0
+
+
+def test_ring_buffer_lost_rows(ring_buffer: SharedRingBuffer) -> None:
+    """
+    Rows overwritten before being read are reported as lost
+    """
+    writeRows(ring_buffer, range(6))
+    times, values, lost = ring_buffer.read()
+    assert times.tolist() == [2, 3, 4, 5]
+    assert lost == 2
+
+
+def test_ring_buffer_attach(ring_buffer: SharedRingBuffer) -> None:
+    reader = SharedRingBuffer(2, 4, np.float64, ring_buffer.getName())
+    writeRows(ring_buffer, range(2))
+    times, values, lost = reader.read()
+    assert times.tolist() == [0, 1]
+    assert values[:, 0].tolist() == [0, 1]
+    reader.close()
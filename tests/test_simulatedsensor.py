@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import time
+import pytest
+import numpy as np
+
+from src.handlers.drivers.simulatedSensor import SimulatedSensor
+
+
+# General mocks, builders and fixtures
+
+
+@pytest.fixture
+def sim() -> SimulatedSensor:
+    driver = SimulatedSensor(0, waveform="constant", amplitude=2, offset=1)
+    driver.connect(interval_ms=1)
+    return driver
+
+
+# Tests
+
+
+def test_simulated_not_connected() -> None:
+    driver = SimulatedSensor(0)
+    assert driver.isAttached() == False
+    assert driver.getValue() is None
+
+
+def test_simulated_value(sim: SimulatedSensor) -> None:
+    assert sim.isAttached() == True
+    assert sim.getValue() == 3
+
+
+def test_simulated_waveforms() -> None:
+    """
+    Waveform values at a quarter of the period
+    """
+    expected = {"sine": 1, "square": 1, "triangle": 0, "sawtooth": -0.5}
+    for waveform, value in expected.items():
+        driver = SimulatedSensor(0, waveform=waveform, frequency_hz=1, rate_hz=4)
+        driver.connect()
+        assert driver._getValues(np.array([1]))[0] == pytest.approx(value)
+
+
+def test_simulated_noise() -> None:
+    driver = SimulatedSensor(0, waveform="constant", amplitude=0, noise=1)
+    driver.connect()
+    values = driver._getValues(np.arange(10000))
+    assert np.std(values) == pytest.approx(1, abs=0.05)
+
+
+def test_simulated_read_batch(sim: SimulatedSensor) -> None:
+    """
+    Batches return every device sample since the previous call, without repeats
+    """
+    assert len(sim.readBatch()[0]) == 0
+    sim.setCapture(True)
+    time.sleep(0.02)
+    first_times, first_values = sim.readBatch()
+    time.sleep(0.02)
+    times, values = sim.readBatch()
+    assert len(first_times) >= 10 and len(times) >= 10
+    assert values.shape == (len(times), 1) and (values == 3).all()
+    all_times = np.concatenate([first_times, times])
+    assert (np.diff(all_times) == 1_000_000).all()
+
+
+def test_simulated_burst() -> None:
+    """
+    Samples are only delivered in whole bursts
+    """
+    driver = SimulatedSensor(0, rate_hz=1000, burst_ms=10)
+    driver.connect()
+    driver.setCapture(True)
+    time.sleep(0.035)
+    times, _ = driver.readBatch()
+    assert len(times) >= 20 and len(times) % 10 == 0
+    assert (times[-1] - driver.start_time) % 10_000_000 == 0
+
+
+def test_simulated_latency() -> None:
+    driver = SimulatedSensor(0, latency_ms=20)
+    driver.connect()
+    start = time.perf_counter()
+    driver.getValue()
+    assert time.perf_counter() - start >= 0.02
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import pytest
+import numpy as np
+
+from src.managers.testManager import TestManager
+from src.handlers.sensor import Sensor
+from src.handlers.sensorGroup import SensorGroup
+from src.enums.sensorParams import SParams
+from src.enums.sensorTypes import SGTypes
+from src.enums.engineTypes import EngineTypes
+
+
+# General mocks, builders and fixtures
+
+
+class StubDriver:
+    def __init__(self, serial: int, channel: int) -> None:
+        self.reads = 0
+
+    def connect(self, wait_ms: int = 2000, interval_ms: int = 8) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def getValue(self):
+        self.reads += 1
+        return 1.0
+
+
+class CountDriver(StubDriver):
+    # Values are the amount of reads
+    def getValue(self):
+        self.reads += 1
+        return float(self.reads)
+
+
+class BlockedDriver(StubDriver):
+    # Reads never return until the driver is released
+    release = threading.Event()
+
+    def getValue(self):
+        self.release.wait()
+        return 1.0
+
+
+class StepDriver(StubDriver):
+    # Force rising over the trigger from the read given by step
+    step = 150
+
+    def getValue(self):
+        self.reads += 1
+        return 100.0 if self.reads > self.step else 0.0
+
+
+def buildGroup(amount: int = 2, driver=StubDriver) -> SensorGroup:
+    group = SensorGroup("group_id", "Group", SGTypes.GROUP_DEFAULT)
+    group.setRead(True)
+    for i in range(amount):
+        group.addSensor(buildSensor(f"sensor_{i}", i, driver))
+    return group
+
+
+def buildSensor(id: str, channel: int, driver=StubDriver) -> Sensor:
+    sensor = Sensor()
+    sensor.setup(
+        id,
+        {
+            SParams.NAME.value: id,
+            SParams.TYPE.value: "SENSOR_LOADCELL",
+            SParams.READ.value: True,
+            SParams.CONNECTION_SECTION.value: {
+                SParams.SERIAL.value: 0,
+                SParams.CHANNEL.value: channel,
+            },
+            SParams.CALIBRATION_SECTION.value: {
+                SParams.SLOPE.value: 1,
+                SParams.INTERCEPT.value: 0,
+            },
+        },
+        driver,
+    )
+    return sensor
+
+
+@pytest.fixture
+def test_mngr():
+    test_mngr = TestManager()
+    yield test_mngr
+    if test_mngr.test_running:
+        test_mngr.testStop()
+    test_mngr._stopTareService()
+    test_mngr.session_pool.close()
+
+
+# Tests
+
+
+def test_tare_service_kept_connections(test_mngr: TestManager) -> None:
+    """
+    Kept sessions are polled for the tare until the pool closes them
+    """
+    test_mngr.checkConnection([buildGroup()], keep_open=True)
+    assert test_mngr.tare_thread.is_alive()
+    time.sleep(0.25)
+    assert test_mngr.getTareReady()
+    test_mngr.session_pool.close()
+    test_mngr.tare_thread.join(1)
+    assert not test_mngr.tare_thread.is_alive()
+
+
+def test_tare_service_released(test_mngr: TestManager) -> None:
+    test_mngr.checkConnection([buildGroup()], keep_open=True)
+    test_mngr.checkConnection([buildGroup()])
+    test_mngr.tare_thread.join(1)
+    assert not test_mngr.tare_thread.is_alive()
+
+
+def test_tare_service_idle_period(test_mngr: TestManager) -> None:
+    """
+    Idle sensors are not polled faster than the idle floor, whatever the interval
+    """
+    test_mngr.setTareWindow(300, 1)
+    group = buildGroup(amount=1)
+    test_mngr.checkConnection([group], keep_open=True)
+    time.sleep(0.5)
+    assert group.getSensors()["sensor_0"].driver.reads <= 0.5 / test_mngr.tare_idle_s
+
+
+def test_tare_service_idle_window(test_mngr: TestManager) -> None:
+    """
+    The idle tare window spans the tare time, with fewer values than a test
+    """
+    test_mngr.tare_idle_s = 0.02
+    # 20 values every 10 ms are 200 ms, which are 10 idle reads
+    test_mngr.setTareWindow(20, 10)
+    group = buildGroup(amount=1, driver=CountDriver)
+    test_mngr.checkConnection([group], keep_open=True)
+    assert test_mngr.getTareWindow() == 10
+    time.sleep(0.5)
+    running_mean = test_mngr.tare_means["sensor_0"]
+    assert running_mean.size == 10
+    assert running_mean.getCount() == 10
+    # Only the latest reads are averaged
+    reads = group.getSensors()["sensor_0"].driver.reads
+    assert running_mean.getMean() >= reads - 10
+
+
+def test_deadline_blocked_driver(test_mngr: TestManager) -> None:
+    """
+    A blocked driver records missing values, while the ticks keep their interval
+    """
+    group = buildGroup()
+    group.addSensor(buildSensor("blocked", 2, BlockedDriver))
+    test_mngr.checkConnection([group])
+    test_mngr.setAutoStop(size=40)
+    try:
+        test_mngr.testStart(5, EngineTypes.DEADLINE)
+        assert test_mngr.test_finished.wait(2)
+    finally:
+        BlockedDriver.release.set()
+    assert test_mngr.getTestSize() == 40
+    assert np.diff(test_mngr.getTestTimes()).max() < 100e6
+    sensors = group.getSensors()
+    assert np.isnan(sensors["blocked"].getValues()).all()
+    assert sensors["blocked"].getDropouts() == 40
+    values = sensors["sensor_0"].getValues()
+    assert np.count_nonzero(values == 1) > 20
+    assert np.count_nonzero(np.isnan(values)) == sensors["sensor_0"].getDropouts()
+
+
+@pytest.mark.parametrize(
+    "engine", [EngineTypes.BARRIER, EngineTypes.SAMPLER, EngineTypes.DEADLINE]
+)
+@pytest.mark.parametrize("size, duration_s", [(250, 0), (0, 0.2)])
+def test_auto_stop_ticks(
+    test_mngr: TestManager, engine: EngineTypes, size: int, duration_s: float
+) -> None:
+    """
+    Tests stop at the exact amount of ticks, given by their size or duration
+    """
+    group = buildGroup()
+    test_mngr.checkConnection([group])
+    test_mngr.setAutoStop(duration_s=duration_s, size=size)
+    test_mngr.testStart(2, engine)
+    assert test_mngr.test_finished.wait(5)
+    expected = size or 100
+    assert test_mngr.getTestSize() == expected
+    assert len(test_mngr.getTestTimes()) == expected
+    for sensor in group.getSensors().values():
+        assert len(sensor.getValues()) == expected
+
+
+@pytest.mark.parametrize(
+    "engine", [EngineTypes.BARRIER, EngineTypes.SAMPLER, EngineTypes.DEADLINE]
+)
+def test_trigger_ticks(test_mngr: TestManager, engine: EngineTypes) -> None:
+    """
+    The pre-trigger ticks are kept before the trigger tick, and the test stops after
+    the post-trigger ones
+    """
+    platform = SensorGroup("platform_id", "Platform", SGTypes.GROUP_PLATFORM)
+    platform.setRead(True)
+    platform.addSensor(buildSensor("Z_1", 0, StepDriver))
+    test_mngr.checkConnection([platform])
+    test_mngr.setTrigger(force_n=50, pre_ms=100, post_ms=200)
+    # Late deadline reads are missing values, not below the trigger force
+    test_mngr.setDeadline(50)
+    test_mngr.testStart(2, engine)
+    assert test_mngr.test_finished.wait(5)
+    assert test_mngr.getTestSize() == 151
+    sensor = platform.getSensors()["Z_1"]
+    values = sensor.getValues()
+    assert len(values) == 151
+    valid = ~np.isnan(values)
+    assert np.count_nonzero(~valid) == sensor.getDropouts()
+    assert not (values[:50] == 100).any() and values[50] == 100
+    assert (values[50:][valid[50:]] == 100).all()
+    assert test_mngr.trigger_time == test_mngr.getTestTimes()[50]
+
+
+def test_high_rate_hold_events(test_mngr: TestManager) -> None:
+    """
+    Ticks without a new event hold the previous value and count as dropouts
+    """
+    sensor = buildSensor("sensor_0", 0)
+    pending = (np.array([np.iinfo(np.int64).min]), np.full((1, 1), np.nan))
+    # The device skips the samples of every other tick
+    times = np.array([10, 20, 30, 40, 50])
+    values, pending = test_mngr._holdEvents(
+        sensor, times, pending, np.array([5, 25, 45]), np.array([[1.0], [2.0], [3.0]])
+    )
+    assert values.reshape(-1).tolist() == [1, 1, 2, 2, 3]
+    assert sensor.getDropouts() == 2
+    # No new events: the last one is held on every tick
+    values, pending = test_mngr._holdEvents(
+        sensor,
+        np.array([60, 70]),
+        pending,
+        np.empty(0, dtype=np.int64),
+        np.empty((0, 1)),
+    )
+    assert values.reshape(-1).tolist() == [3, 3]
+    assert sensor.getDropouts() == 4
+    # Before the first event, ticks are missing values
+    values, _ = test_mngr._holdEvents(
+        sensor,
+        np.array([10]),
+        (np.array([np.iinfo(np.int64).min]), np.full((1, 1), np.nan)),
+        np.array([15]),
+        np.array([[1.0]]),
+    )
+    assert np.isnan(values).all()
+    assert sensor.getDropouts() == 5
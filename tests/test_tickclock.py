@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import time
+import pytest
+import numpy as np
+
+from src.handlers.tickClock import TickClock, TickStats
+
+
+# Tests
+
+
+def test_tick_clock_epoch() -> None:
+    clock = TickClock()
+    clock.start()
+    assert abs(clock.now() - time.time_ns()) < 10**8
+
+
+def test_tick_clock_monotonic() -> None:
+    clock = TickClock()
+    times = [clock.now() for _ in range(1000)]
+    assert np.all(np.diff(times) >= 0)
+
+
+def test_tick_clock_from_counter() -> None:
+    """
+    Perf counter times, as drivers stamp their events, map onto the clock timeline
+    """
+    clock = TickClock()
+    clock.start()
+    assert abs(clock.fromCounter(time.perf_counter_ns()) - clock.now()) < 10**6
+
+
+def test_tick_stats_add() -> None:
+    stats = TickStats(interval_ns=10**7)
+    for timestamp in [0, 10**7, 2 * 10**7, 4 * 10**7]:
+        stats.add(timestamp)
+    result = stats.getStats()
+    ticks = np.array([10, 10, 20])
+    assert result["ticks"] == 3
+    assert result["mean_ms"] == pytest.approx(ticks.mean())
+    assert result["std_ms"] == pytest.approx(ticks.std())
+    assert result["max_overrun_ms"] == pytest.approx(10)
+
+
+def test_tick_stats_extend() -> None:
+    """
+    Batches of ticks give the same statistics as adding them one by one
+    """
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.integers(9 * 10**6, 12 * 10**6, 1000))
+    added = TickStats(interval_ns=10**7)
+    [added.add(int(timestamp)) for timestamp in timestamps]
+    extended = TickStats(interval_ns=10**7)
+    [extended.extend(batch) for batch in np.array_split(timestamps, 7)]
+    for key, value in added.getStats().items():
+        assert extended.getStats()[key] == pytest.approx(value)
+
+
+def test_tick_stats_empty() -> None:
+    stats = TickStats(interval_ns=10**7)
+    stats.add(0)
+    assert stats.getStats() == {
+        "ticks": 0,
+        "mean_ms": 0,
+        "std_ms": 0,
+        "max_overrun_ms": 0,
+    }
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from src.handlers.timeline import Timeline
+from src.handlers.sampleBuffer import SampleBuffer
+from src.handlers.recordingFile import RecordingWriter, RecordingReader, timelineStream
+import numpy as np
+import pytest
+
+
+# General mocks, builders and fixtures
+
+
+class SensorMock:
+    def __init__(self, value: float) -> None:
+        self.value = value
+        self.values = SampleBuffer()
+
+    def registerValue(self) -> None:
+        self.values.append(self.value)
+        self.value += 1
+
+    def swapValues(self) -> SampleBuffer:
+        values, self.values = self.values, SampleBuffer()
+        return values
+
+
+@pytest.fixture
+def timeline() -> Timeline:
+    return Timeline("group_id", 2, {"s1": SensorMock(0), "s2": SensorMock(10)})
+
+
+# Tests
+
+
+def test_timeline_register(timeline: Timeline) -> None:
+    for i in range(5):
+        timeline.register(1000 + i * 2000000)
+    assert timeline.size == 5
+    assert timeline.checkpoint_time == 1000
+    assert timeline.getTimes().tolist() == [1000 + i * 2000000 for i in range(5)]
+    assert timeline.sensors["s2"].values.getValues().tolist() == [10, 11, 12, 13, 14]
+    assert timeline.tick_stats.getStats()["mean_ms"] == pytest.approx(2)
+
+
+def test_timeline_new_values(timeline: Timeline) -> None:
+    for i in range(4):
+        timeline.register(i)
+    start, times, values = timeline.getNewValues(1)
+    assert start == 1
+    assert times.tolist() == [1, 2, 3]
+    assert values["s1"].tolist() == [1, 2, 3]
+
+
+def test_timeline_flush(tmp_path, timeline: Timeline) -> None:
+    """
+    Flushed ticks are written to the timeline stream and skipped by new values
+    """
+    stream = timelineStream(timeline.id)
+    path = str(tmp_path / "timeline.fpr")
+    channels = [{"id": "s1", "width": 1}, {"id": "s2", "width": 1}]
+    recording = RecordingWriter()
+    recording.open(path, {stream: channels})
+    for i in range(3):
+        timeline.register(i)
+    timeline.flush(recording, stream)
+    timeline.register(3)
+    start, times, values = timeline.getNewValues(0)
+    assert (start, times.tolist(), values["s2"].tolist()) == (3, [3], [13])
+    recording.close()
+    reader = RecordingReader(path)
+    assert reader.getTimes(stream).tolist() == [0, 1, 2]
+    assert reader.getChannel(stream, "s2").tolist() == [10, 11, 12]
+    reader.close()